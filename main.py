@@ -1,6 +1,15 @@
+import argparse
 import asyncio
 import os
-from src.nodes.graph import LangGraphManager  # LangGraphManager가 있는 파일 경로
+from datetime import datetime
+from pathlib import Path
+
+from src.core.config import settings
+from src.core.daemon import StockHelperDaemon
+from src.core.scheduler import parse_schedules
+
+# LangGraph/LangChain 및 스크래퍼 모듈은 무거우므로 실제 실행 시점에 import
+# (python main.py --help 등은 바로 응답)
 
 
 def check_api_keys():
@@ -15,74 +24,240 @@ def check_api_keys():
     return missing_keys
 
 
-async def run_langgraph_initialization():
-    """LangGraph를 초기화하고 실행하는 함수"""
+def create_initial_state() -> dict:
+    """초기 상태 설정 (새로운 구조에 맞춰 업데이트)"""
+    return {
+        "collected_data": "",
+        "analyzed_data": "",
+        "final_analyzed_data": "",
+        "proposed_data": "",
+        "stock_list_domestic": {},
+        "stock_list_worldwide": {},
+        "symbol_reports": {},
+        "email_sent": False,
+        "email_sent_time": ""
+    }
+
+
+def new_run_id() -> str:
+    """체크포인트 키로 사용할 실행 ID 생성"""
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+async def prepare_resume(compiled_graph, config: dict) -> bool:
+    """
+    저장된 체크포인트를 확인하고 마지막으로 완료된 노드 다음부터 재개할 수 있도록 준비합니다.
+
+    Returns:
+        bool: 재개할 단계가 있으면 True
+    """
+    snapshot = await compiled_graph.aget_state(config)
+    if not snapshot.values:
+        print(f"❌ 실행 ID '{config['configurable']['thread_id']}'의 체크포인트를 찾을 수 없습니다.")
+        return False
+
+    if snapshot.next:
+        # 중간에 실패/중단된 실행 → 완료된 노드는 건너뛰고 남은 노드부터 실행
+        print(f"🔁 체크포인트에서 재개합니다. 남은 단계: {', '.join(snapshot.next)}")
+        return True
+
+    if not snapshot.values.get("email_sent"):
+        # 끝까지 실행됐지만 이메일 전송만 실패한 경우 → final_analyzer 직후부터 다시 실행
+        print("🔁 이메일 전송이 완료되지 않아 email_sender 단계부터 다시 실행합니다.")
+        await compiled_graph.aupdate_state(config, None, as_node="final_analyzer")
+        return True
+
+    print("✅ 이미 완료된 실행입니다. 재개할 단계가 없습니다.")
+    return False
+
+
+def check_settings():
+    """API 키와 이메일 설정을 확인하고 경고를 출력"""
+    # API 키 확인
+    missing_keys = check_api_keys()
+    if missing_keys:
+        print(f"⚠️  다음 API 키들이 설정되지 않았습니다: {', '.join(missing_keys)}")
+        print("API 키 없이 테스트 모드로 실행합니다...")
+        print("실제 LLM 호출은 실패할 수 있지만, LangGraph 구조는 테스트할 수 있습니다.")
+
+    # 이메일 설정 확인
+    email_keys = ['SENDER_EMAIL', 'SENDER_PASSWORD', 'RECIPIENT_EMAIL']
+    missing_email_keys = [key for key in email_keys if not os.getenv(key)]
+    if missing_email_keys:
+        print(f"⚠️  이메일 설정이 완료되지 않았습니다: {', '.join(missing_email_keys)}")
+        print("이메일 전송 기능은 비활성화됩니다.")
+
+
+def open_checkpointer():
+    """그래프 실행 체크포인트 저장소(SQLite)를 엽니다. async with로 사용"""
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    checkpoint_path = Path(settings.CHECKPOINT_DB_PATH)
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    return AsyncSqliteSaver.from_conn_string(str(checkpoint_path))
+
+
+async def execute_graph(compiled_graph, run_id: str, resume: bool = False) -> dict | None:
+    """
+    컴파일된 그래프를 한 번 실행하고 최종 State를 반환합니다.
+    State는 노드가 끝날 때마다 체크포인트에 run_id 단위로 저장되며,
+    resume=True이면 해당 run_id의 마지막 완료 노드 다음부터 이어서 실행합니다.
+    """
+    config = {"configurable": {"thread_id": run_id}}
+
+    if resume:
+        if not await prepare_resume(compiled_graph, config):
+            return None
+        # 입력을 None으로 주면 체크포인트의 State에서 이어서 실행
+        graph_input = None
+    else:
+        graph_input = create_initial_state()
+
+    print("=== LangGraph 실행 시작 ===")
+
+    # 컴파일된 그래프를 이벤트 루프 위에서 비동기로 실행 (노드가 끝날 때마다 진행 상황 출력)
+    async for chunk in compiled_graph.astream(graph_input, config, stream_mode="updates"):
+        for node_name in chunk:
+            print(f"✔ {node_name} 완료")
+
+    # 최종 상태는 체크포인트에서 읽음 (재개한 경우에도 전체 State를 얻기 위해)
+    result = (await compiled_graph.aget_state(config)).values
+    print("=== LangGraph 실행 완료 ===")
+    return result
+
+
+def print_result(result: dict):
+    """실행 결과 출력"""
+    print("\n=== 최종 분석 결과 ===")
+    print(result.get('final_analyzed_data', '분석 결과가 없습니다.'))
+    
+    print("\n=== 추천 종목 정보 ===")
+    proposed_data = result.get('proposed_data', '추천 종목 정보가 없습니다.')
+    print(proposed_data)
+    
+    print("\n=== 이메일 전송 상태 ===")
+    email_sent = result.get('email_sent', False)
+    email_sent_time = result.get('email_sent_time', '알 수 없음')
+    if email_sent:
+        print(f"✅ 이메일 전송 성공: {email_sent_time}")
+    else:
+        print(f"❌ 이메일 전송 실패: {email_sent_time}")
+
+
+async def run_langgraph_initialization(run_id: str | None = None, resume: bool = False):
+    """
+    LangGraph를 초기화하고 한 번 실행하는 함수
+    resume=True이면 run_id의 체크포인트에서 이어서 실행합니다.
+    """
     try:
         print("=== LangGraph 초기화 시작 ===")
+        check_settings()
 
-        # API 키 확인
-        missing_keys = check_api_keys()
-        if missing_keys:
-            print(f"⚠️  다음 API 키들이 설정되지 않았습니다: {', '.join(missing_keys)}")
-            print("API 키 없이 테스트 모드로 실행합니다...")
-            print("실제 LLM 호출은 실패할 수 있지만, LangGraph 구조는 테스트할 수 있습니다.")
+        run_id = run_id or new_run_id()
 
-        # 이메일 설정 확인
-        email_keys = ['SENDER_EMAIL', 'SENDER_PASSWORD', 'RECIPIENT_EMAIL']
-        missing_email_keys = [key for key in email_keys if not os.getenv(key)]
-        if missing_email_keys:
-            print(f"⚠️  이메일 설정이 완료되지 않았습니다: {', '.join(missing_email_keys)}")
-            print("이메일 전송 기능은 비활성화됩니다.")
+        from src.nodes.graph import LangGraphManager  # LangGraphManager가 있는 파일 경로
 
-        # LangGraphManager 인스턴스 생성
-        graph_manager = LangGraphManager()
+        async with open_checkpointer() as checkpointer:
+            # LangGraphManager 인스턴스 생성
+            graph_manager = LangGraphManager()
 
-        # 그래프 초기화 및 컴파일
-        compiled_graph = graph_manager.initialize_graph()
+            # 그래프 초기화 및 컴파일 (체크포인트 저장소 연결)
+            compiled_graph = graph_manager.initialize_graph(checkpointer=checkpointer)
 
-        print("LangGraph 초기화 및 컴파일 완료.")
+            print("LangGraph 초기화 및 컴파일 완료.")
+            print(f"실행 ID: {run_id} (실패 시 `python main.py --resume {run_id}`로 재개)")
 
-        # 초기 상태 설정 (새로운 구조에 맞춰 업데이트)
-        initial_state = {
-            "collected_data": "",
-            "analyzed_data": "",
-            "scraped_data": "",
-            "stock_data": "",
-            "final_analyzed_data": "",
-            "proposed_data": "",
-            "stock_list_domestic": [],
-            "stock_list_worldwide": [],
-            "email_sent": False,
-            "email_sent_time": ""
-        }
-
-        print("=== LangGraph 실행 시작 ===")
-        
-        # 컴파일된 그래프 실행
-        result = compiled_graph.invoke(initial_state)
-        
-        print("=== LangGraph 실행 완료 ===")
-        print("\n=== 최종 분석 결과 ===")
-        print(result.get('final_analyzed_data', '분석 결과가 없습니다.'))
-        
-        print("\n=== 추천 종목 정보 ===")
-        proposed_data = result.get('proposed_data', '추천 종목 정보가 없습니다.')
-        print(proposed_data)
-        
-        print("\n=== 이메일 전송 상태 ===")
-        email_sent = result.get('email_sent', False)
-        email_sent_time = result.get('email_sent_time', '알 수 없음')
-        if email_sent:
-            print(f"✅ 이메일 전송 성공: {email_sent_time}")
-        else:
-            print(f"❌ 이메일 전송 실패: {email_sent_time}")
+            result = await execute_graph(compiled_graph, run_id, resume=resume)
+
+        if result is not None:
+            print_result(result)
 
     except Exception as e:
         print(f"LangGraph 초기화 중 오류 발생: {e}")
         import traceback
         traceback.print_exc()
 
+    finally:
+        from src.service.http_client import aclose_async_client, get_metrics
+        for host, metrics in get_metrics().items():
+            print(f"🌐 {host}: 요청 {metrics['requests']}회, 오류 {metrics['errors']}회, "
+                  f"재시도 {metrics['retries']}회, 평균 {metrics['avg_ms']}ms")
+        from src.service.stock_scrapers.quote_cache import quote_cache
+        cache_stats = quote_cache.stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            print(f"💾 시세 캐시: 적중 {cache_stats['hits']}회 (디스크 {cache_stats['disk_hits']}회), "
+                  f"미스 {cache_stats['misses']}회")
+        await aclose_async_client()
+
+
+async def run_daemon():
+    """
+    상주 모드: 그래프와 체크포인트 저장소를 한 번만 준비해 두고 스케줄에 맞춰 반복 실행합니다.
+    """
+    print("=== LangGraph 데몬 모드 시작 ===")
+    check_settings()
+
+    schedules = parse_schedules(settings.DAEMON_SCHEDULES)
+
+    from src.nodes.graph import LangGraphManager
+
+    async with open_checkpointer() as checkpointer:
+        compiled_graph = LangGraphManager().initialize_graph(checkpointer=checkpointer)
+        print("LangGraph 초기화 및 컴파일 완료.")
+
+        async def run_graph(run_id: str):
+            result = await execute_graph(compiled_graph, run_id)
+            if result is not None:
+                print_result(result)
+            return result
+
+        daemon = StockHelperDaemon(
+            schedules,
+            run_graph,
+            status_host=settings.DAEMON_STATUS_HOST,
+            status_port=settings.DAEMON_STATUS_PORT,
+        )
+        try:
+            await daemon.serve_forever()
+        finally:
+            from src.service.http_client import aclose_async_client
+            await aclose_async_client()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI 기반 주식 시장 분석 도구")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="체크포인트에 저장된 실행을 마지막으로 완료된 노드 다음부터 재개합니다.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="상주 모드로 실행하여 DAEMON_SCHEDULES 스케줄에 맞춰 반복 실행합니다.",
+    )
+    parser.add_argument(
+        "--screener",
+        nargs="?",
+        const="",
+        metavar="FILTERS",
+        help="관심 종목 대신 KOSPI·KOSDAQ 전 종목을 스크리닝해 상위 종목을 분석합니다. "
+             "조건식(예: \"per<15;pbr<1.5;등락률>0\")을 주면 SCREENER_FILTERS 대신 사용합니다.",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    asyncio.run(run_langgraph_initialization())
-    print("\n=== LangGraph 초기화 프로세스 종료 ===")
\ No newline at end of file
+    args = parse_args()
+    if args.screener is not None:
+        settings.SCREENER_ENABLED = True
+        if args.screener:
+            settings.SCREENER_FILTERS = args.screener
+    if args.daemon:
+        try:
+            asyncio.run(run_daemon())
+        except KeyboardInterrupt:
+            print("\n=== LangGraph 데몬 종료 ===")
+    else:
+        asyncio.run(run_langgraph_initialization(run_id=args.resume, resume=bool(args.resume)))
+        print("\n=== LangGraph 초기화 프로세스 종료 ===")
@@ -1,7 +1,23 @@
+from pathlib import Path
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, model_validator
 import json # json 임포트는 필요 없지만, 기존 코드에 있었으니 일단 남겨둡니다.
 
+# 프로젝트 루트 디렉토리
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# DATA_DIR 아래에 두는 로컬 저장소 파일 (설정 이름: DATA_DIR 기준 상대 경로)
+# 환경변수로 경로를 따로 지정하지 않으면 DATA_DIR을 바꿀 때 함께 옮겨집니다.
+DATA_FILES = {
+    "KIS_TOKEN_CACHE_PATH": "kis_token.json",
+    "QUOTE_CACHE_DB_PATH": "quote_cache.sqlite",
+    "NEWS_SEEN_DB_PATH": "news_seen.sqlite",
+    "HISTORY_DIR": "history",
+    "SYMBOL_MASTER_PATH": "symbol_master.tsv",
+    "CHECKPOINT_DB_PATH": "checkpoints.sqlite",
+}
+
 class Settings(BaseSettings):
     """애플리케이션 설정"""
 
@@ -13,9 +29,118 @@ class Settings(BaseSettings):
     KOR_INVESTMENT_APP_KEY: str = Field(default="")
     KOR_INVESTMENT_APP_SECRET: str = Field(default="")
 
+    # 한국투자증권 접근 토큰 캐시 파일 (여러 프로세스가 발급받은 토큰을 함께 사용)
+    KIS_TOKEN_CACHE_PATH: str = Field(default="")
+
+    # 공용 HTTP 클라이언트 (타임아웃 초, 재시도 횟수, 백오프 기준 초, 최대 커넥션 수)
+    HTTP_TIMEOUT: float = Field(default=10)
+    HTTP_CONNECT_TIMEOUT: float = Field(default=5)
+    HTTP_RETRIES: int = Field(default=2)
+    HTTP_BACKOFF: float = Field(default=0.5)
+    HTTP_MAX_CONNECTIONS: int = Field(default=20)
+
+    # 소스(호스트)별 서킷 브레이커 (연속 실패 횟수를 넘으면 차단 시간(초) 동안 호출하지 않고 바로 실패)
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(default=3)
+    CIRCUIT_RESET_TIMEOUT: float = Field(default=60)
+
+    # Selenium 스크래핑 (작업 하나의 지연 예산(초), 페이지 로드 타임아웃(초), 페이지 로드 재시도 횟수)
+    SCRAPE_BUDGET: float = Field(default=30)
+    SCRAPE_PAGE_TIMEOUT: float = Field(default=15)
+    SCRAPE_RETRIES: int = Field(default=1)
+    # 무한 스크롤에서 새 항목이 붙기를 기다리는 최대 시간(초, 항목이 붙으면 바로 다음 단계로)
+    SCROLL_WAIT_TIMEOUT: float = Field(default=3)
+
+    # Selenium 브라우저 풀 (동시에 띄울 최대 브라우저 수, 브라우저 하나로 열 최대 페이지 수,
+    # 브라우저 하나의 최대 메모리(MB, psutil 설치 시 확인), 브라우저를 빌릴 때까지 기다릴 최대 시간(초))
+    BROWSER_POOL_SIZE: int = Field(default=4)
+    BROWSER_MAX_PAGES: int = Field(default=50)
+    BROWSER_MAX_RSS_MB: float = Field(default=1024)
+    BROWSER_ACQUIRE_TIMEOUT: float = Field(default=60)
+
+    # 시세 API 초당 요청 한도 (한국투자증권 실전투자 REST 한도는 초당 20건 → 여유를 두고 설정)
+    KIS_REQUESTS_PER_SECOND: float = Field(default=18)
+    YAHOO_REQUESTS_PER_SECOND: float = Field(default=5)
+
+    # 국내 관심 종목 현재가를 멀티종목 시세 API(30종목/요청)로 일괄 조회할지 여부
+    # 멀티종목 응답에는 PER/PBR/52주 고저가·투자자 순매수·경고 구분 등 상세 항목이 없어 최종 분석 품질이 떨어지므로
+    # 기본값은 false(종목별 현재가 API로 전체 항목 조회), 가격·등락률만 필요할 때 true로 요청 수를 줄임
+    KIS_MULTI_QUOTE: bool = Field(default=False)
+
+    # 현재가 캐시 (정규장 중 유효기간(초), 메모리 보관 종목 수, SQLite 파일 - 비우면 메모리에만 보관)
+    QUOTE_CACHE_ENABLED: bool = Field(default=True)
+    QUOTE_CACHE_TTL_OPEN: int = Field(default=60)
+    QUOTE_CACHE_MAX_ENTRIES: int = Field(default=2048)
+    QUOTE_CACHE_DB_PATH: str = Field(default="")
+
+    # 한국투자증권 실시간 체결가(WebSocket) 수신 (데몬 모드에서 국내 관심 종목을 구독)
+    # 체결 유효시간(초)보다 오래된 체결은 쓰지 않고 REST로 조회, 구독 한도는 세션당 종목 수
+    KIS_REALTIME_ENABLED: bool = Field(default=False)
+    KIS_WS_URL: str = Field(default="ws://ops.koreainvestment.com:21000/tryitout/H0STCNT0")
+    KIS_WS_TICK_MAX_AGE: float = Field(default=120)
+    KIS_WS_MAX_SUBSCRIPTIONS: int = Field(default=40)
+
+    # 증분 뉴스 수집 (이미 수집한 기사에 닿으면 수집을 멈추고 새 기사만 분석에 전달)
+    # 수집 기록 SQLite 파일(비우면 메모리에만 보관), 기사 키 보관 기간(일)
+    NEWS_INCREMENTAL: bool = Field(default=True)
+    NEWS_SEEN_DB_PATH: str = Field(default="")
+    NEWS_SEEN_RETENTION_DAYS: float = Field(default=30)
+
+    # 과거 시세(일봉) 로컬 저장소 (처음 수집 시 받을 기간(일), 이후에는 마지막 저장일 이후만 조회)
+    HISTORY_ENABLED: bool = Field(default=True)
+    HISTORY_DIR: str = Field(default="")
+    HISTORY_LOOKBACK_DAYS: int = Field(default=400)
+
+    # 종목 마스터 (한국투자증권 종목 마스터 파일로 만든 종목코드·종목명·시장 인덱스, 갱신 주기(초))
+    SYMBOL_MASTER_ENABLED: bool = Field(default=True)
+    SYMBOL_MASTER_PATH: str = Field(default="")
+    SYMBOL_MASTER_MAX_AGE: int = Field(default=86400)
+
+    # 국내 전 종목 스크리너 (켜면 관심 종목 대신 KOSPI·KOSDAQ 전 종목에서 조건을 통과한 상위 N개를 분석)
+    # 조건식은 ;로 구분 (예: per>0;per<15;pbr<1.5;등락률>0), 최소 거래대금(원) 미만은 상세 조회 전에 제외
+    SCREENER_ENABLED: bool = Field(default=False)
+    SCREENER_FILTERS: str = Field(default="per>0;per<20;pbr<2;등락률>0")
+    SCREENER_TOP_N: int = Field(default=10)
+    SCREENER_SORT_BY: str = Field(default="trade_value")
+    SCREENER_SORT_ASCENDING: bool = Field(default=False)
+    SCREENER_MIN_TRADE_VALUE: float = Field(default=1_000_000_000)
+    SCREENER_EXCLUDE_FLAGGED: bool = Field(default=True)
+
+    # 종목별 서브그래프(시세/뉴스/요약)를 동시에 실행할 최대 개수
+    SYMBOL_CONCURRENCY: int = Field(default=4)
+
+    # 로컬 저장소 디렉토리 (경로를 따로 지정하지 않은 토큰·캐시·일봉·체크포인트 파일이 모두 이 아래에 저장됨)
+    DATA_DIR: str = Field(default=str(PROJECT_ROOT / "data"))
+
+    # 그래프 실행 체크포인트를 저장할 SQLite 파일
+    CHECKPOINT_DB_PATH: str = Field(default="")
+
+    # 데몬 모드 실행 스케줄 ("이름|타임존|크론식"을 ;로 구분)
+    DAEMON_SCHEDULES: str = Field(
+        default="KRX 장전|Asia/Seoul|0 8 * * 1-5;NYSE 장전|America/New_York|0 8 * * 1-5"
+    )
+
+    # 데몬 실행 상태 조회용 HTTP 서버 주소
+    DAEMON_STATUS_HOST: str = Field(default="127.0.0.1")
+    DAEMON_STATUS_PORT: int = Field(default=8765)
+
     # .env 파일 로드를 위한 설정 (필요시)
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @model_validator(mode="after")
+    def _resolve_data_files(self) -> "Settings":
+        """경로를 따로 지정하지 않은 로컬 저장소 파일을 DATA_DIR 아래로 정합니다."""
+        for name, relative in DATA_FILES.items():
+            if name not in self.model_fields_set:
+                setattr(self, name, str(Path(self.DATA_DIR) / relative))
+        return self
+
 
 # 설정 인스턴스 생성
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+
+def data_path(*parts: str) -> Path:
+    """DATA_DIR 아래의 경로를 반환합니다. 상위 디렉토리가 없으면 생성합니다."""
+    path = Path(settings.DATA_DIR).joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,209 @@
+"""
+상주(데몬) 모드
+프로세스를 띄워 둔 채로 크론 스케줄에 맞춰 그래프를 실행합니다.
+LLM 클라이언트, 컴파일된 그래프, ChromeDriver 경로, 한국투자증권 토큰을 실행 사이에 재사용하고,
+실행 상태는 HTTP(JSON)로 조회할 수 있습니다.
+"""
+import asyncio
+import json
+import os
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Optional
+
+from src.core.config import settings
+from src.core.scheduler import CronSchedule
+
+# 최근 실행 이력 보관 개수
+RUN_HISTORY_SIZE = 20
+
+# 그래프 실행에 사용되어 미리 생성해 둘 LLM 클라이언트
+WARM_MODELS = ("gpt_fouro_mini", "perplexity_sonar_small")
+
+
+class StockHelperDaemon:
+    def __init__(
+        self,
+        schedules: list[CronSchedule],
+        run_graph: Callable[[str], Awaitable[Optional[dict]]],
+        status_host: str = "127.0.0.1",
+        status_port: int = 8765,
+    ):
+        """
+        Args:
+            schedules: 실행 스케줄 리스트
+            run_graph: run_id를 받아 그래프를 한 번 실행하고 최종 State를 반환하는 코루틴 함수
+            status_host: 상태 조회 HTTP 서버 주소
+            status_port: 상태 조회 HTTP 서버 포트 (0이면 비활성화)
+        """
+        self.schedules = schedules
+        self.run_graph = run_graph
+        self.status_host = status_host
+        self.status_port = status_port
+
+        self._lock = threading.Lock()
+        self._started_at = datetime.now().astimezone()
+        self._next_runs: dict[str, datetime] = {}
+        self._current_run: Optional[dict] = None
+        self._history: deque = deque(maxlen=RUN_HISTORY_SIZE)
+        self._status_server: Optional[ThreadingHTTPServer] = None
+
+    def warm_up(self):
+        """실행 사이에 재사용할 리소스를 미리 준비합니다. (블로킹 - 스레드에서 호출)"""
+        print("🔥 상주 리소스 준비 중...")
+
+        # LLM 클라이언트 (지연 생성되는 클라이언트를 미리 만들어 두고 프로세스가 살아 있는 동안 재사용)
+        from src.nodes.models import get_model
+        for model_name in WARM_MODELS:
+            try:
+                get_model(model_name)
+            except Exception as e:
+                print(f"  ⚠️  {model_name} 클라이언트 생성 실패: {e}")
+        print("  ✓ LLM 클라이언트 준비 완료")
+
+        # ChromeDriver 경로 (설치/버전 확인을 한 번만 수행)와 브라우저 풀 (Chrome을 미리 띄워 두고 실행마다 재사용)
+        from src.service.browser import browser_pool, get_chromedriver_path
+        get_chromedriver_path()
+        print(f"  ✓ ChromeDriver 준비 완료 (브라우저 {browser_pool.warm()}개 대기 중)")
+
+        # 종목 마스터 (하루 지난 파일이면 다시 내려받아 메모리에 올려 둠)
+        from src.service.stock_scrapers.symbol_master import symbol_master
+        if symbol_master.ensure_loaded():
+            print("  ✓ 종목 마스터 준비 완료")
+
+        # 한국투자증권 토큰 (메모리에 캐시되어 실행마다 재사용)
+        if os.getenv("KOR_INVESTMENT_APP_KEY") and os.getenv("KOR_INVESTMENT_APP_SECRET"):
+            from src.service.stock_scrapers.get_token import get_access_token
+            if get_access_token():
+                print("  ✓ 한국투자증권 토큰 준비 완료")
+
+        # 실시간 체결가 (국내 관심 종목 구독, 끊기면 백그라운드에서 재접속)
+        if settings.KIS_REALTIME_ENABLED:
+            from src.service.stock_scrapers.get_stock import load_stock_list
+            from src.service.stock_scrapers.realtime import realtime_feed
+
+            stocks_domestic, _ = load_stock_list()
+            realtime_feed.start(stocks_domestic)
+            print(f"  ✓ 실시간 체결가 수신 시작 ({len(stocks_domestic)}종목)")
+
+    def status(self) -> dict:
+        """현재 데몬 상태 (상태 조회 HTTP 응답 본문)"""
+        from src.service.browser import browser_pool
+        from src.service.http_client import get_metrics as get_http_metrics
+        from src.service.resilience import breaker_stats
+        from src.service.stock_scrapers.quote_cache import quote_cache
+
+        with self._lock:
+            return {
+                "started_at": self._started_at.isoformat(),
+                "running": self._current_run is not None,
+                "current_run": dict(self._current_run) if self._current_run else None,
+                "schedules": [
+                    {
+                        "name": schedule.name,
+                        "timezone": schedule.timezone,
+                        "cron": schedule.expression,
+                        "next_run": self._next_runs[schedule.name].isoformat() if schedule.name in self._next_runs else None,
+                    }
+                    for schedule in self.schedules
+                ],
+                "history": list(self._history),
+                "http": get_http_metrics(),
+                "circuits": breaker_stats(),
+                "browsers": browser_pool.stats(),
+                "quote_cache": quote_cache.stats(),
+                "realtime": self._realtime_stats(),
+            }
+
+    @staticmethod
+    def _realtime_stats() -> Optional[dict]:
+        if not settings.KIS_REALTIME_ENABLED:
+            return None
+        from src.service.stock_scrapers.realtime import realtime_feed
+        return realtime_feed.stats()
+
+    def _start_status_server(self):
+        if not self.status_port:
+            return
+
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/status"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.status(), ensure_ascii=False, indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 요청마다 콘솔에 로그를 남기지 않음
+                pass
+
+        self._status_server = ThreadingHTTPServer((self.status_host, self.status_port), StatusHandler)
+        threading.Thread(target=self._status_server.serve_forever, name="daemon-status", daemon=True).start()
+        print(f"📡 상태 조회: http://{self.status_host}:{self.status_port}/status")
+
+    async def _run_once(self, schedule: CronSchedule):
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-daemon"
+        run_info = {
+            "run_id": run_id,
+            "schedule": schedule.name,
+            "started_at": datetime.now().astimezone().isoformat(),
+        }
+        with self._lock:
+            self._current_run = run_info
+
+        print(f"\n⏰ [{schedule.name}] 스케줄 실행 시작 (실행 ID: {run_id})")
+        try:
+            result = await self.run_graph(run_id) or {}
+            run_info["status"] = "success"
+            run_info["email_sent"] = bool(result.get("email_sent"))
+        except Exception as e:
+            traceback.print_exc()
+            run_info["status"] = "error"
+            run_info["error"] = str(e)
+        finally:
+            run_info["finished_at"] = datetime.now().astimezone().isoformat()
+            with self._lock:
+                self._current_run = None
+                self._history.appendleft(run_info)
+
+        print(f"⏰ [{schedule.name}] 스케줄 실행 종료: {run_info['status']}")
+
+    async def serve_forever(self):
+        """스케줄에 맞춰 그래프를 반복 실행합니다. (취소될 때까지 반환하지 않음)"""
+        if not self.schedules:
+            raise ValueError("데몬 스케줄이 비어 있습니다. DAEMON_SCHEDULES를 확인해주세요.")
+
+        await asyncio.to_thread(self.warm_up)
+        self._start_status_server()
+
+        try:
+            while True:
+                now = datetime.now().astimezone()
+                with self._lock:
+                    for schedule in self.schedules:
+                        self._next_runs[schedule.name] = schedule.next_run(now)
+                    schedule = min(self.schedules, key=lambda s: self._next_runs[s.name])
+                    due = self._next_runs[schedule.name]
+
+                print(f"💤 다음 실행: [{schedule.name}] {due.isoformat()}")
+                await asyncio.sleep(max(0.0, (due - datetime.now().astimezone()).total_seconds()))
+
+                # 다음 실행 시각은 실행이 끝난 시점 기준으로 다시 계산하므로,
+                # 실행이 길어져 지나간 스케줄 시각은 따라잡지 않고 건너뜀
+                await self._run_once(schedule)
+        finally:
+            if self._status_server:
+                self._status_server.shutdown()
+            if settings.KIS_REALTIME_ENABLED:
+                from src.service.stock_scrapers.realtime import realtime_feed
+                realtime_feed.stop()
@@ -0,0 +1,47 @@
+"""
+거래소 정규장 시간
+시세 캐시 유효기간 등 장중/장외에 따라 동작이 달라지는 곳에서 사용합니다. (공휴일은 고려하지 않음)
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+
+@dataclass(frozen=True)
+class MarketSession:
+    """거래소 정규장 (월~금)"""
+    name: str
+    timezone: str
+    open: time
+    close: time
+
+    @property
+    def tz(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
+
+    def is_open(self, now: datetime, grace: timedelta = timedelta()) -> bool:
+        """now가 정규장 시간(마감 후 grace까지 포함) 안인지 확인합니다."""
+        local = now.astimezone(self.tz)
+        if local.weekday() >= 5:
+            return False
+        opened = local.replace(hour=self.open.hour, minute=self.open.minute, second=0, microsecond=0)
+        closed = local.replace(hour=self.close.hour, minute=self.close.minute, second=0, microsecond=0) + grace
+        return opened <= local < closed
+
+    def next_open(self, now: datetime) -> datetime:
+        """now 이후 가장 가까운 정규장 시작 시각"""
+        local = now.astimezone(self.tz)
+        day = local.replace(hour=self.open.hour, minute=self.open.minute, second=0, microsecond=0)
+        while day <= local or day.weekday() >= 5:
+            day += timedelta(days=1)
+        return day
+
+
+KRX = MarketSession("KRX", "Asia/Seoul", time(9, 0), time(15, 30))
+NYSE = MarketSession("NYSE", "America/New_York", time(9, 30), time(16, 0))
+
+# 종목 구분("domestic"/"worldwide")별 정규장
+MARKET_SESSIONS = {
+    "domestic": KRX,
+    "worldwide": NYSE,
+}
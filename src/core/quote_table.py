@@ -0,0 +1,84 @@
+"""
+여러 종목의 현재가를 열 단위로 담는 표 (struct-of-arrays)
+시장 전체 스캔처럼 종목 수가 많을 때 Quote 객체 목록 대신 항목별 NumPy 배열로 보관해
+필터·정렬을 종목마다 반복하지 않고 배열 연산 한 번으로 처리합니다.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.core.records import Quote
+
+# 숫자 항목 (float64 배열, 값이 없으면 NaN)
+NUMERIC_COLUMNS = (
+    "price", "change_rate", "volume", "trade_value", "turnover", "market_cap", "per", "pbr",
+    "high_250d", "low_250d", "high_52w", "low_52w", "foreign_net_buy", "program_net_buy", "prev_close",
+)
+# Quote에서 정수로 다루는 숫자 항목 (Quote로 되돌릴 때 int로 변환)
+INTEGER_COLUMNS = frozenset({"volume", "trade_value", "market_cap", "foreign_net_buy", "program_net_buy"})
+# 문자열 항목 (object 배열, 값이 없으면 None)
+TEXT_COLUMNS = (
+    "market", "caution", "warning_code", "managed", "liquidation", "sector", "market_name", "currency", "exchange",
+)
+
+
+class QuoteTable:
+    """종목코드 배열과 항목별 배열로 이루어진 현재가 표 (행 순서는 모든 배열이 같음)"""
+
+    __slots__ = ("codes", "columns", "_index")
+
+    def __init__(self, codes: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.codes = codes
+        self.columns = columns
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Optional[Quote]]) -> "QuoteTable":
+        """Quote 목록으로 표를 만듭니다. (None은 건너뜀)"""
+        quotes = [quote for quote in quotes if quote is not None]
+        columns = {
+            name: np.array([getattr(quote, name) for quote in quotes], dtype="f8")  # None → NaN
+            for name in NUMERIC_COLUMNS
+        }
+        for name in TEXT_COLUMNS:
+            columns[name] = np.array([getattr(quote, name) for quote in quotes], dtype=object)
+        return cls(np.array([quote.code for quote in quotes], dtype=object), columns)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """항목 이름으로 열 배열을 반환합니다."""
+        return self.columns[name]
+
+    def index_of(self, code: str) -> Optional[int]:
+        """종목코드의 행 번호 (없으면 None)"""
+        if self._index is None:
+            self._index = {code: row for row, code in enumerate(self.codes)}
+        return self._index.get(code)
+
+    def take(self, rows) -> "QuoteTable":
+        """행 번호 배열 또는 불리언 마스크로 고른 행만 담은 새 표"""
+        rows = np.asarray(rows)
+        return QuoteTable(self.codes[rows], {name: column[rows] for name, column in self.columns.items()})
+
+    def top(self, name: str, n: int, descending: bool = True) -> "QuoteTable":
+        """name 항목 기준 상위 n개 행 (NaN은 맨 뒤)"""
+        values = self.columns[name]
+        keys = np.where(np.isnan(values), -np.inf if descending else np.inf, values)
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        return self.take(order[:n])
+
+    def quote(self, row: int) -> Quote:
+        """행 하나를 Quote로 되돌립니다."""
+        values = {}
+        for name in NUMERIC_COLUMNS:
+            value = self.columns[name][row]
+            if not np.isnan(value):
+                values[name] = int(value) if name in INTEGER_COLUMNS else float(value)
+        for name in TEXT_COLUMNS:
+            values[name] = self.columns[name][row]
+        return Quote(code=self.codes[row], **values)
+
+    def to_quotes(self) -> List[Quote]:
+        return [self.quote(row) for row in range(len(self))]
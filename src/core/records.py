@@ -0,0 +1,190 @@
+"""
+그래프 state에 담기는 종목 데이터 레코드
+노드 사이에서는 객체 그대로 전달하고, LLM 프롬프트를 만들 때만 한 번 직렬화합니다.
+"""
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional
+
+# Quote 속성 ↔ 출력용 한글 라벨 (라벨 순서가 출력 순서)
+QUOTE_LABELS = (
+    ("price", "현재가"),
+    ("change_rate", "등락률"),
+    ("volume", "거래량"),
+    ("trade_value", "거래대금"),
+    ("turnover", "거래량회전율"),
+    ("market_cap", "시가총액"),
+    ("per", "PER"),
+    ("pbr", "PBR"),
+    ("high_250d", "250일최고가"),
+    ("low_250d", "250일최저가"),
+    ("high_52w", "52주최고가"),
+    ("low_52w", "52주최저가"),
+    ("foreign_net_buy", "외국인순매수수량"),
+    ("program_net_buy", "프로그램매매순매수수량"),
+    ("caution", "투자유의여부"),
+    ("warning_code", "시장경고코드"),
+    ("managed", "관리종목여부"),
+    ("liquidation", "정리매매여부"),
+    ("sector", "업종명"),
+    ("market_name", "시장구분"),
+    ("currency", "통화"),
+    ("exchange", "거래소"),
+    ("prev_close", "이전종가"),
+)
+
+
+@dataclass(slots=True)
+class Quote:
+    """
+    종목 1개의 현재가 정보 (제공되지 않은 항목은 None)
+    시세 API 응답을 바로 이 형태로 파싱하고, 한글 라벨은 출력할 때(to_fields)만 붙입니다.
+    """
+    code: str
+    market: str  # "domestic" 또는 "worldwide"
+    price: Optional[float] = None
+    change_rate: Optional[float] = None
+    volume: Optional[int] = None
+    trade_value: Optional[int] = None
+    turnover: Optional[float] = None
+    market_cap: Optional[int] = None
+    per: Optional[float] = None
+    pbr: Optional[float] = None
+    high_250d: Optional[float] = None
+    low_250d: Optional[float] = None
+    high_52w: Optional[float] = None
+    low_52w: Optional[float] = None
+    foreign_net_buy: Optional[int] = None
+    program_net_buy: Optional[int] = None
+    caution: Optional[str] = None
+    warning_code: Optional[str] = None
+    managed: Optional[str] = None
+    liquidation: Optional[str] = None
+    sector: Optional[str] = None
+    market_name: Optional[str] = None
+    currency: Optional[str] = None
+    exchange: Optional[str] = None
+    prev_close: Optional[float] = None
+    # 상세 항목 없이 가격 위주로만 채운 현재가 (멀티종목 시세, Yahoo spark, 실시간 체결)
+    partial: bool = False
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "Quote":
+        """to_dict로 만든 딕셔너리로 Quote를 생성합니다. (알 수 없는 키는 무시)"""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in values.items() if key in known})
+
+    def to_dict(self) -> dict:
+        """값이 있는 항목만 {속성 이름: 값} 딕셔너리로 변환합니다. (캐시 저장용)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+    def to_fields(self) -> dict:
+        """값이 있는 항목만 {한글 라벨: 값} 딕셔너리로 변환합니다. (프롬프트/메일 출력용)"""
+        values = {}
+        for attr, label in QUOTE_LABELS:
+            value = getattr(self, attr)
+            if value is not None:
+                values[label] = value
+        return values
+
+
+# Indicators 속성 ↔ 출력용 한글 라벨 (라벨 순서가 출력 순서)
+INDICATOR_LABELS = (
+    ("bars", "일봉수"),
+    ("sma_5", "5일이동평균"),
+    ("sma_20", "20일이동평균"),
+    ("sma_60", "60일이동평균"),
+    ("sma_120", "120일이동평균"),
+    ("ema_20", "20일지수이동평균"),
+    ("rsi_14", "RSI(14)"),
+    ("macd", "MACD"),
+    ("macd_signal", "MACD시그널"),
+    ("macd_hist", "MACD히스토그램"),
+    ("bb_upper", "볼린저상단"),
+    ("bb_lower", "볼린저하단"),
+    ("bb_percent_b", "볼린저%B"),
+    ("atr_14", "ATR(14)"),
+    ("atr_pct", "ATR비율(%)"),
+    ("volume_z_20", "거래량Z점수(20일)"),
+)
+
+
+@dataclass(slots=True)
+class Indicators:
+    """과거 일봉으로 계산한 기술적 지표 (최신 봉 기준, 계산할 수 없는 항목은 None)"""
+    bars: int = 0
+    sma_5: Optional[float] = None
+    sma_20: Optional[float] = None
+    sma_60: Optional[float] = None
+    sma_120: Optional[float] = None
+    ema_20: Optional[float] = None
+    rsi_14: Optional[float] = None
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_hist: Optional[float] = None
+    bb_upper: Optional[float] = None
+    bb_lower: Optional[float] = None
+    bb_percent_b: Optional[float] = None
+    atr_14: Optional[float] = None
+    atr_pct: Optional[float] = None
+    volume_z_20: Optional[float] = None
+
+    @classmethod
+    def from_values(cls, values: dict) -> "Indicators":
+        """지표 계산 결과 {지표 이름: 값} 딕셔너리로 Indicators를 생성합니다."""
+        known = {f.name for f in fields(cls)}
+        kwargs = {key: value for key, value in values.items() if key in known}
+        kwargs["bars"] = int(kwargs.get("bars") or 0)
+        return cls(**kwargs)
+
+    def to_fields(self) -> dict:
+        """값이 있는 항목만 {한글 라벨: 값} 딕셔너리로 변환합니다. (프롬프트/메일 출력용, 유효숫자 위주로 반올림)"""
+        values = {}
+        for attr, label in INDICATOR_LABELS:
+            value = getattr(self, attr)
+            if isinstance(value, float):
+                value = round(value, 2) if abs(value) >= 1 else float(f"{value:.4g}")
+            if value is not None:
+                values[label] = value
+        return values
+
+
+@dataclass(slots=True)
+class NewsArticle:
+    """종목 뉴스 기사 1건"""
+    title: str
+    content: str = ""
+    link: str = ""
+    source: str = ""
+
+    @classmethod
+    def from_dict(cls, article: dict) -> "NewsArticle":
+        """뉴스 스크래퍼가 반환하는 딕셔너리로 NewsArticle을 생성합니다."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in article.items() if key in known})
+
+    def to_dict(self) -> dict:
+        """비어 있지 않은 항목만 딕셔너리로 변환합니다. (프롬프트 출력용)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name)}
+
+
+@dataclass(slots=True)
+class SymbolReport:
+    """종목별 서브그래프의 처리 결과"""
+    code: str
+    name: str
+    market: str  # "domestic" 또는 "worldwide"
+    quote: Optional[Quote] = None
+    news: list[NewsArticle] = field(default_factory=list)
+    indicators: Optional[Indicators] = None
+    digest: str = ""
+
+    @property
+    def key(self) -> str:
+        """종목코드(종목명) 형태의 표시용 키"""
+        return f"{self.code}({self.name})"
+
+
+def to_compact_json(data: Any) -> str:
+    """LLM 프롬프트에 넣을 데이터를 공백 없는 JSON 문자열로 직렬화합니다."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
@@ -0,0 +1,102 @@
+"""
+크론 형식(분 시 일 월 요일)의 실행 스케줄 계산
+데몬 모드에서 장 시작 전(KRX, NYSE 등) 정해진 시각에 그래프를 실행하기 위해 사용합니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# (최솟값, 최댓값) - 분, 시, 일, 월, 요일(0=일요일, 7도 일요일로 허용)
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(expr: str, low: int, high: int) -> set[int]:
+    """크론 필드 하나("*", "*/15", "1-5", "0,30" 등)를 허용 값 집합으로 변환합니다."""
+    values = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"잘못된 크론 간격: {expr}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"크론 값 범위 오류: {expr} (허용 범위 {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@dataclass
+class CronSchedule:
+    """이름과 타임존을 가진 크론 스케줄"""
+    name: str
+    timezone: str
+    expression: str
+
+    def __post_init__(self):
+        fields = self.expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"크론 식은 5개 필드(분 시 일 월 요일)여야 합니다: {self.expression}")
+
+        self._tz = ZoneInfo(self.timezone)
+        self._minutes, self._hours, self._days, self._months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+        )
+        # 크론 요일(0=일요일)을 파이썬 요일(0=월요일)로 변환
+        self._weekdays = {(day - 1) % 7 for day in weekdays}
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = fields[4] != "*"
+
+    def _matches_day(self, day: datetime) -> bool:
+        if day.month not in self._months:
+            return False
+        day_ok = day.day in self._days
+        weekday_ok = day.weekday() in self._weekdays
+        # 표준 크론 규칙: 일/요일이 모두 지정되면 둘 중 하나만 맞아도 실행
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_run(self, after: datetime) -> datetime:
+        """after 이후(초과) 가장 가까운 실행 시각을 스케줄 타임존 기준으로 반환합니다."""
+        local = after.astimezone(self._tz)
+        day = local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # 최대 1년(윤년 포함) 안에서 탐색
+        for _ in range(367):
+            if self._matches_day(day):
+                for hour in sorted(self._hours):
+                    for minute in sorted(self._minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate > local:
+                            return candidate
+            day = (day + timedelta(days=1)).replace(hour=0, minute=0)
+
+        raise ValueError(f"1년 안에 실행 시각이 없는 크론 식입니다: {self.expression}")
+
+
+def parse_schedules(spec: str) -> list[CronSchedule]:
+    """
+    "이름|타임존|크론식;이름|타임존|크론식" 형식의 문자열을 스케줄 리스트로 변환합니다.
+    예: "KRX 장전|Asia/Seoul|0 8 * * 1-5;NYSE 장전|America/New_York|0 8 * * 1-5"
+    """
+    schedules = []
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [part.strip() for part in entry.split("|")]
+        if len(parts) != 3:
+            raise ValueError(f"스케줄 형식 오류 (이름|타임존|크론식): {entry}")
+        schedules.append(CronSchedule(name=parts[0], timezone=parts[1], expression=parts[2]))
+    return schedules
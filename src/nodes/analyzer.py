@@ -1,58 +1,53 @@
 import os
-from src.nodes.models import gpt_fouro_mini as llm
-from src.nodes.types import State
+from src.core.records import to_compact_json
+from src.nodes.models import get_model
+from src.nodes.types import State, SymbolState
 from src.prompts.analyzer_prompt import analyzer_prompt
 from src.prompts.final_analyzer_prompt import final_analyzer_prompt
+from src.prompts.stock_digest_prompt import stock_digest_prompt
 
-def analyzer(state: State):
+async def analyzer(state: State):
     try:
         # ✅ result status 확인해서 success가 아니면 실행하지 않음
         if state["collected_data"] == "":
             print("수집된 데이터가 없음 → analyzer 건너뜀")
-            return state
+            return {}
 
         collected_data = state["collected_data"]
 
         # API 키가 없으면 모의 응답 반환
         if not os.getenv('OPENAI_API_KEY'):
             print("⚠️  OpenAI API 키가 설정되지 않아 모의 분석 결과를 반환합니다.")
-            return state
+            return {}
 
         prompt_template = analyzer_prompt(collected_data)
         # print(prompt_template)
-        respondent_llm = prompt_template | llm
+        respondent_llm = prompt_template | get_model("gpt_fouro_mini")
 
         # 빈 딕셔너리를 입력으로 제공 (입력 변수가 없으므로)
-        response = respondent_llm.invoke({})
+        response = await respondent_llm.ainvoke({})
 
         # ChatOpenAI returns AIMessage, so we need to extract the content. use just result when using another model
         analyzed_data = response.content if hasattr(response, 'content') else str(response)
 
-        if not analyzed_data:
-            state["analyzed_data"] = ""
-            return state
-
-        state["analyzed_data"] = analyzed_data
-
-        return state
+        # 병렬 브랜치와 병합되므로 변경된 키만 반환
+        return {"analyzed_data": analyzed_data or ""}
     
     except Exception as e:
         print(f"Error in analyzer: {str(e)}")
         # 오류 발생 시에도 모의 분석 결과 반환
         mock_analysis = "API 호출 실패로 인한 모의 분석 결과입니다."
-        state["analyzed_data"] = mock_analysis
-        return state
+        return {"analyzed_data": mock_analysis}
 
-def final_analyzer(state: State):
+async def final_analyzer(state: State):
     try:
-        # ✅ 수집된 데이터와 분석된 데이터가 없으면 실행하지 않음
-        if state.get("scraped_data") == "" or state.get("analyzed_data") == "":
-            print("수집된 데이터 또는 분석된 데이터가 없음 → final_analyzer 건너뜀")
-            return state
+        # ✅ 분석된 데이터가 없으면 실행하지 않음
+        if state.get("analyzed_data") == "":
+            print("분석된 데이터가 없음 → final_analyzer 건너뜀")
+            return {}
 
-        scraped_data = state["scraped_data"]
         analyzed_data = state["analyzed_data"]
-        stock_data = state["stock_data"]
+        symbol_reports = state.get("symbol_reports") or {}
 
         # API 키가 없으면 모의 응답 반환
         if not os.getenv('OPENAI_API_KEY'):
@@ -72,32 +67,61 @@ def final_analyzer(state: State):
             - 정기적인 포트폴리오 리밸런싱
             - 뉴스 모니터링 지속
             """
-            state["final_analyzed_data"] = mock_final_analysis.strip()
-            return state
+            return {"final_analyzed_data": mock_final_analysis.strip()}
         
-        prompt_template = final_analyzer_prompt(analyzed_data, scraped_data, stock_data)
-        respondent_llm = prompt_template | llm
+        prompt_template = final_analyzer_prompt(analyzed_data=analyzed_data, symbol_reports=symbol_reports)
+        respondent_llm = prompt_template | get_model("gpt_fouro_mini")
 
         # 빈 딕셔너리를 입력으로 제공 (입력 변수가 없으므로)
-        response = respondent_llm.invoke({})
+        response = await respondent_llm.ainvoke({})
 
         # ChatOpenAI returns AIMessage, so we need to extract the content
         final_analyzed_data = response.content if hasattr(response, 'content') else str(response)
 
         if not final_analyzed_data:
-            state["final_analyzed_data"] = ""
-            return state
-
-        state["final_analyzed_data"] = final_analyzed_data
+            return {"final_analyzed_data": ""}
 
         print("=== 최종 분석 완료 ===")
         print(f"분석 결과 길이: {len(final_analyzed_data)} 문자")
 
-        return state
+        return {"final_analyzed_data": final_analyzed_data}
     
     except Exception as e:
         print(f"Error in final_analyzer: {str(e)}")
         # 오류 발생 시에도 모의 분석 결과 반환
         mock_final_analysis = "최종 분석 중 오류가 발생하여 모의 분석 결과를 반환합니다."
-        state["final_analyzed_data"] = mock_final_analysis
-        return state
+        return {"final_analyzed_data": mock_final_analysis}
+
+async def stock_digest(state: SymbolState):
+    """
+    종목 1개의 현재가 정보와 뉴스를 LLM으로 요약하는 노드 (종목별 서브그래프의 마지막 단계)
+    """
+    stock_label = f"{state['code']}({state['name']})"
+    quote = state.get("quote")
+    news = state.get("news") or []
+
+    if not quote and not news:
+        print(f"{stock_label}: 수집된 데이터가 없음 → stock_digest 건너뜀")
+        return {"digest": ""}
+
+    # API 키가 없으면 요약 없이 원본 데이터만 전달
+    if not os.getenv('OPENAI_API_KEY'):
+        return {"digest": ""}
+
+    try:
+        prompt_template = stock_digest_prompt(
+            stock_label,
+            to_compact_json(quote.to_fields() if quote else {}),
+            to_compact_json([article.to_dict() for article in news])
+        )
+        respondent_llm = prompt_template | get_model("gpt_fouro_mini")
+
+        # 빈 딕셔너리를 입력으로 제공 (입력 변수가 없으므로)
+        response = await respondent_llm.ainvoke({})
+
+        digest = response.content if hasattr(response, 'content') else str(response)
+        return {"digest": digest or ""}
+
+    except Exception as e:
+        print(f"Error in stock_digest ({stock_label}): {str(e)}")
+        return {"digest": ""}
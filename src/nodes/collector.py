@@ -3,12 +3,12 @@ import re
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
-from src.nodes.models import perplexity_sonar_small
+from src.nodes.models import get_model
 
 from src.nodes.types import State
 from src.prompts.collector_prompt import collector_prompt
 
-def collector(state: State):
+async def collector(state: State):
     try:
         print("#" * 80)
 
@@ -17,18 +17,16 @@ def collector(state: State):
 
         # 빈 딕셔너리를 입력으로 제공 (입력 변수가 없으므로)
         output_parser = StrOutputParser()
-        chain = prompt | perplexity_sonar_small | output_parser
-        response = chain.invoke({})
+        chain = prompt | get_model("perplexity_sonar_small") | output_parser
+        response = await chain.ainvoke({})
 
         # ChatOpenAI returns AIMessage, so we need to extract the content
         result = response.content if hasattr(response, 'content') else str(response)
 
         print(f"collector: {result}")
 
-        state["collected_data"] = result.strip()
-        return state
+        return {"collected_data": result.strip()}
 
     except Exception as e:
         print(f"Error in collector: {str(e)}")
-        state["collected_data"] = ""
-        return state
\ No newline at end of file
+        return {"collected_data": ""}
\ No newline at end of file
@@ -1,39 +1,51 @@
 from langgraph.graph import END, StateGraph, START
 
-from src.nodes.news_scraper import news_scraper
-from src.nodes.stock_scraper import stock_scraper
+from src.nodes.symbol_graph import dispatch_symbols, symbol_aggregator, symbol_worker, watchlist_loader
 from src.nodes.types import State
 from src.nodes.collector import collector
 from src.nodes.analyzer import analyzer, final_analyzer
 from src.nodes.email_sender import email_sender
+from src.nodes.news_scraper import news_recorder
 from src.nodes.proposer import proposer
 
 class LangGraphManager:
     def __init__(self):
         self.graph = None
 
-    def initialize_graph(self):
-
+    def initialize_graph(self, checkpointer=None):
+        """
+        그래프를 구성하고 컴파일합니다.
+        checkpointer를 넘기면 노드가 끝날 때마다 State가 저장되어 중단된 실행을 이어서 재개할 수 있습니다.
+        """
         graph = StateGraph(State)
 
         graph.add_node("collector", collector)
         graph.add_node("analyzer", analyzer)
-        graph.add_node("news_scraper", news_scraper)
-        graph.add_node("stock_scraper", stock_scraper)
+        graph.add_node("watchlist_loader", watchlist_loader)
+        graph.add_node("symbol_worker", symbol_worker)
+        graph.add_node("symbol_aggregator", symbol_aggregator)
         graph.add_node("final_analyzer", final_analyzer)
         graph.add_node("proposer", proposer)
         graph.add_node("email_sender", email_sender)
+        graph.add_node("news_recorder", news_recorder)
 
-        graph.set_entry_point("collector")
-
+        # 서로 의존하지 않는 브랜치는 START에서 동시에 시작
+        # (collector → analyzer / watchlist_loader → 종목별 symbol_worker / proposer)
         graph.add_edge(START, "collector")
         graph.add_edge("collector", "analyzer")
-        graph.add_edge("analyzer", "news_scraper")
-        graph.add_edge("news_scraper", "stock_scraper")
-        graph.add_edge("stock_scraper", "final_analyzer")
-        graph.add_edge("final_analyzer", "proposer")
-        graph.add_edge("proposer", "email_sender")
-        graph.add_edge("email_sender", END)
-
-        self.graph = graph.compile()
+        graph.add_edge(START, "watchlist_loader")
+        graph.add_edge(START, "proposer")
+
+        # 관심 종목마다 symbol_worker(시세/뉴스/요약 서브그래프)를 동적으로 생성하고 결과를 모음
+        graph.add_conditional_edges("watchlist_loader", dispatch_symbols, ["symbol_worker", "symbol_aggregator"])
+        graph.add_edge("symbol_worker", "symbol_aggregator")
+
+        # 모든 브랜치가 끝나면 final_analyzer에서 합류
+        graph.add_edge(["analyzer", "symbol_aggregator", "proposer"], "final_analyzer")
+        graph.add_edge("final_analyzer", "email_sender")
+        # 보고서가 전송된 뒤에만 뉴스 수집 기록을 남김
+        graph.add_edge("email_sender", "news_recorder")
+        graph.add_edge("news_recorder", END)
+
+        self.graph = graph.compile(checkpointer=checkpointer)
         return self.graph
\ No newline at end of file
@@ -0,0 +1,31 @@
+import asyncio
+
+from src.core.config import settings
+from src.nodes.types import SymbolState
+
+
+async def history_loader(state: SymbolState):
+    """
+    종목 1개의 과거 시세(일봉)를 로컬 저장소에 최신으로 갱신
+    저장된 봉이 있으면 마지막 저장일 이후 구간만 조회합니다.
+    """
+    if not settings.HISTORY_ENABLED:
+        return {}
+
+    stock_code = state["code"]
+    stock_name = state["name"]
+
+    try:
+        # NumPy/저장소 모듈은 노드가 실제로 실행될 때 import
+        from src.service.history.fetcher import history_summary, update_history
+
+        # 파일 입출력과 동기 HTTP 호출이 섞여 있으므로 스레드에서 실행
+        bars = await asyncio.to_thread(update_history, stock_code, state["market"])
+    except Exception as e:
+        print(f"  ✗ {stock_code}({stock_name}) 과거 시세 갱신 실패: {str(e)}")
+        return {"history_bars": 0}
+
+    summary = history_summary(bars)
+    if summary["bars"]:
+        print(f"  ✓ {stock_code}({stock_name}) 과거 시세: {summary['bars']}봉 ({summary['from']} ~ {summary['to']})")
+    return {"history_bars": summary["bars"]}
@@ -1,26 +1,57 @@
-import os
+"""
+LLM 클라이언트 레지스트리
+클라이언트는 import 시점이 아니라 처음 사용할 때 생성되고, 이후에는 같은 인스턴스를 재사용합니다.
+LangChain 제공자 패키지(OpenAI/Perplexity/Gemini)도 해당 모델을 처음 만들 때 import 합니다.
+"""
+from functools import lru_cache
 
 from dotenv import load_dotenv
-import json
 
 load_dotenv()
 
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_perplexity import ChatPerplexity
-
-gpt_fouro_mini = ChatOpenAI(model="gpt-4o-mini", temperature=0, top_p=1)
-gpt_fouro = ChatOpenAI(model="gpt-4o", temperature=0, top_p=1)
-
-# Perplexity 모델들 (명시적으로 키 전달)
-perplexity_sonar_small = ChatPerplexity(
-    model="sonar-pro",
-    temperature=0
-)
-perplexity_sonar_large = ChatPerplexity(
-    model="llama-3.1-sonar-large-128k-online",
-    temperature=0
-)
-# Gemini 모델들
-gemini_pro = ChatGoogleGenerativeAI(model="gemini-pro", temperature=0, top_p=1)
-gemini_pro_vision = ChatGoogleGenerativeAI(model="gemini-pro-vision", temperature=0, top_p=1)
\ No newline at end of file
+# 모델 이름 → (제공자, 생성 인자)
+MODEL_REGISTRY = {
+    "gpt_fouro_mini": ("openai", {"model": "gpt-4o-mini", "temperature": 0, "top_p": 1}),
+    "gpt_fouro": ("openai", {"model": "gpt-4o", "temperature": 0, "top_p": 1}),
+    # Perplexity 모델들
+    "perplexity_sonar_small": ("perplexity", {"model": "sonar-pro", "temperature": 0}),
+    # llama-3.1-sonar-large-128k-online은 지원 종료되어 후속 모델로 대체
+    "perplexity_sonar_large": ("perplexity", {"model": "sonar-reasoning-pro", "temperature": 0}),
+    # Gemini 모델들
+    "gemini_pro": ("google", {"model": "gemini-pro", "temperature": 0, "top_p": 1}),
+    "gemini_pro_vision": ("google", {"model": "gemini-pro-vision", "temperature": 0, "top_p": 1}),
+}
+
+
+def _create_model(provider: str, kwargs: dict):
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(**kwargs)
+    if provider == "perplexity":
+        from langchain_perplexity import ChatPerplexity
+        return ChatPerplexity(**kwargs)
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(**kwargs)
+    raise ValueError(f"알 수 없는 모델 제공자: {provider}")
+
+
+@lru_cache(maxsize=None)
+def get_model(name: str):
+    """
+    이름에 해당하는 LLM 클라이언트를 반환합니다. (최초 호출 시 생성 후 재사용)
+
+    Args:
+        name: MODEL_REGISTRY의 모델 이름 (예: "gpt_fouro_mini")
+    """
+    if name not in MODEL_REGISTRY:
+        raise KeyError(f"등록되지 않은 모델입니다: {name}")
+    provider, kwargs = MODEL_REGISTRY[name]
+    return _create_model(provider, kwargs)
+
+
+def __getattr__(name: str):
+    # 기존 코드 호환: `from src.nodes.models import gpt_fouro_mini` 형태도 지연 생성으로 동작
+    if name in MODEL_REGISTRY:
+        return get_model(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,104 +1,92 @@
-from datetime import datetime
-import json
+import asyncio
 
-from src.service.stock_scrapers.get_stock import load_stock_list
-from src.service.news_scrapers.naver_scraper import scrape_stock_domestic_news
-from src.nodes.types import State
-from src.service.news_scrapers.yahoo_scraper import scrape_stock_worldwide_news
+from src.core.config import settings
+from src.nodes.types import NewsArticle, State, SymbolState
 
+# 종목당 최대 수집 뉴스 개수
+MAX_NEWS_PER_STOCK = 10
 
-def news_scraper(state: State):
+
+async def news_scraper(state: SymbolState):
     """
-    주식 리스트를 로드하고 각 종목에 대해 뉴스를 수집하여 state에 저장
+    종목 1개의 뉴스를 수집하여 서브그래프 state에 저장
+    국내 종목은 네이버 증권 뉴스 API(HTTP), 해외 종목은 Yahoo Finance에서 수집
+    네이버 뉴스 API 형식이 바뀌어 파싱할 수 없으면 네이버 모바일 페이지를 브라우저로 열어 수집합니다.
+    NEWS_INCREMENTAL이면 이전 실행에서 수집한 기사에 닿는 즉시 멈추고 새 기사만 넘깁니다.
+    (수집 기록은 이메일 전송까지 성공한 뒤 news_recorder에서 남김)
     """
-    print("=== 뉴스 데이터 수집 시작 ===")
-    
-    # 주식 리스트 로드 (국내, 해외 분리)
-    stocks_domestic, stocks_worldwide = load_stock_list()
-    
-    if not stocks_domestic and not stocks_worldwide:
-        print("주식 리스트가 비어있습니다. 환경변수 STOCK_LIST_DOMESTIC, STOCK_LIST_WORLDWIDE를 확인해주세요.")
-        state["scraped_data"] = "주식 리스트가 비어있습니다."
-        return state
-    
-    # state에 주식 리스트 저장
-    state["stock_list_domestic"] = list(stocks_domestic.keys())
-    state["stock_list_worldwide"] = list(stocks_worldwide.keys())
+    stock_code = state["code"]
+    stock_name = state["name"]
+    print(f"[{stock_code}({stock_name})] 뉴스 수집 중...")
 
-    total_stocks = len(stocks_domestic) + len(stocks_worldwide)
-    print(f"수집 대상 종목: {total_stocks}개 (국내: {len(stocks_domestic)}개, 해외: {len(stocks_worldwide)}개)")
+    known = None
+    if settings.NEWS_INCREMENTAL:
+        from src.service.news_scrapers.seen_store import news_seen_store
+        known = news_seen_store.known(stock_code)
 
-    # 국내 주식 뉴스 수집
-    if stocks_domestic:
-        print(f"\n=== 국내 주식 뉴스 수집 ===")
-        for code, name in stocks_domestic.items():
-            print(f"  - {code}({name})")
+    try:
+        # Selenium 스크래핑은 블로킹이므로 스레드에서 실행
+        # (Selenium을 불러오는 스크래퍼 모듈은 필요할 때만 실행 시점에 import)
+        if state["market"] == "domestic":
+            from src.service.news_scrapers.naver_news_api import NewsApiShapeError, afetch_naver_stock_news
 
-        collected_domestic_news = scrape_stock_domestic_news(
-            stock_info=stocks_domestic,
-            keyword="",  # 모든 뉴스 수집
-            max_count_per_stock=10
-        )
-    else:
-        collected_domestic_news = {}
+            try:
+                news_list = await afetch_naver_stock_news(
+                    stock_code,
+                    keyword="",  # 모든 뉴스 수집
+                    max_count=MAX_NEWS_PER_STOCK,
+                    known=known
+                )
+            except NewsApiShapeError as e:
+                print(f"  ⚠️  {stock_code}({stock_name}) 네이버 뉴스 API 형식 변경, 브라우저로 수집합니다: {str(e)}")
+                from src.service.news_scrapers.naver_scraper import scrape_naver_stock_news_filtered
+                news_list = await asyncio.to_thread(
+                    scrape_naver_stock_news_filtered,
+                    stock_code=stock_code,
+                    keyword="",
+                    max_count=MAX_NEWS_PER_STOCK,
+                    known=known
+                )
+        else:
+            from src.service.news_scrapers.yahoo_scraper import scrape_yahoo_stock_news_filtered
 
-    # 해외 주식 뉴스 수집
-    if stocks_worldwide:
-        print(f"\n=== 해외 주식 뉴스 수집 ===")
-        for code, name in stocks_worldwide.items():
-            print(f"  - {code}({name})")
+            # Yahoo Finance URL은 종목명이 아닌 심볼(티커)을 사용
+            news_list = await asyncio.to_thread(
+                scrape_yahoo_stock_news_filtered,
+                stock_name=stock_code,
+                keyword="",  # 모든 뉴스 수집
+                max_count=MAX_NEWS_PER_STOCK,
+                known=known
+            )
+    except Exception as e:
+        print(f"  ✗ {stock_code}({stock_name}) 뉴스 수집 실패: {str(e)}")
+        return {"news": []}
 
-        collected_worldwide_news = scrape_stock_worldwide_news(
-            stock_info=stocks_worldwide,
-            keyword="",  # 모든 뉴스 수집
-            max_count_per_stock=10
-        )
+    articles = [NewsArticle.from_dict(article) for article in news_list]
+    if known:
+        print(f"  ✓ {stock_code}({stock_name}) 새 뉴스 {len(articles)}개 수집 완료 (이전 수집 기사 이후)")
     else:
-        collected_worldwide_news = {}
-    
-    # 국내와 해외 뉴스 합치기
-    all_collected_news = {}
-    all_collected_news.update(collected_domestic_news)
-    all_collected_news.update(collected_worldwide_news)
-    
-    # 수집 결과를 JSON 형태로 state에 저장
-    scraped_data = {
-        "timestamp": datetime.now().isoformat(),
-        "total_stocks": total_stocks,
-        "domestic_stocks": len(stocks_domestic),
-        "worldwide_stocks": len(stocks_worldwide),
-        "collected_news": all_collected_news,
-        "domestic_news": collected_domestic_news,
-        "worldwide_news": collected_worldwide_news,
-        "summary": {
-            "total_news": sum(len(news) for news in all_collected_news.values()),
-            "domestic_news_count": sum(len(news) for news in collected_domestic_news.values()),
-            "worldwide_news_count": sum(len(news) for news in collected_worldwide_news.values()),
-            "stocks_with_news": len([news for news in all_collected_news.values() if news]),
-            "domestic_stocks_with_news": len([news for news in collected_domestic_news.values() if news]),
-            "worldwide_stocks_with_news": len([news for news in collected_worldwide_news.values() if news])
-        }
-    }
-    
-    # 한글 인코딩 문제 해결을 위한 JSON 저장
-    try:
-        json_str = json.dumps(scraped_data, ensure_ascii=False, indent=2, default=str)
-        # 디버깅을 위한 출력
-        print(f"JSON 저장 테스트 - 키 확인:")
-        for key in all_collected_news.keys():
-            print(f"  키: {repr(key)}")
-        state["scraped_data"] = json_str
-    except Exception as e:
-        print(f"JSON 저장 중 오류: {e}")
-        # 대안: 문자열로 저장
-        state["scraped_data"] = str(scraped_data)
-    
-    print(f"\n=== 주식 데이터 수집 완료 ===")
-    print(f"총 {total_stocks}개 종목에서 {scraped_data['summary']['total_news']}개 뉴스 수집")
-    print(f"  - 국내: {scraped_data['summary']['domestic_news_count']}개 뉴스")
-    print(f"  - 해외: {scraped_data['summary']['worldwide_news_count']}개 뉴스")
-    print(f"뉴스가 있는 종목: {scraped_data['summary']['stocks_with_news']}개")
-    print(f"  - 국내: {scraped_data['summary']['domestic_stocks_with_news']}개 종목")
-    print(f"  - 해외: {scraped_data['summary']['worldwide_stocks_with_news']}개 종목")
-    
-    return state
+        print(f"  ✓ {stock_code}({stock_name}) {len(articles)}개 뉴스 수집 완료")
+    return {"news": articles}
+
+
+async def news_recorder(state: State):
+    """
+    이메일 전송에 성공한 경우에만 이번 보고서에 담긴 종목별 기사를 수집 기록에 남기는 노드
+    최종 분석이나 이메일 전송이 실패하면 기록하지 않으므로, 다음 실행에서 같은 기사를 다시 수집해 보고서에 담습니다.
+    """
+    if not settings.NEWS_INCREMENTAL:
+        return {}
+    if not state.get("email_sent"):
+        print("이메일 전송에 성공하지 않음 → 뉴스 수집 기록 건너뜀 (다음 실행에서 다시 수집)")
+        return {}
+
+    from src.service.news_scrapers.seen_store import news_seen_store
+
+    symbol_reports = state.get("symbol_reports") or {}
+    for report in symbol_reports.values():
+        news_seen_store.mark(report.code, [article.to_dict() for article in report.news])
+
+    recorded = sum(len(report.news) for report in symbol_reports.values())
+    print(f"📝 뉴스 수집 기록 완료: {len(symbol_reports)}개 종목, 기사 {recorded}개")
+    return {}
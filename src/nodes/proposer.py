@@ -1,21 +1,33 @@
+import asyncio
+
 from src.nodes.types import State
-from src.service.propose_scrapers.yuanta_propose import yuanta_scraper
-from src.service.propose_scrapers.samsung_propose import samsung_scraper
-from src.service.propose_scrapers.thinkpool_propose import thinkpool_scraper
-from src.service.propose_scrapers.worldnews_propose import worldnews_scraper
 from src.prompts.proposer_prompt import proposer_prompt
-from src.nodes.models import gpt_fouro_mini as llm
+from src.nodes.models import get_model
+
+async def propose_scraper(state: State):
+    # Selenium/BeautifulSoup을 불러오는 스크래퍼 모듈은 노드가 실제로 실행될 때 import
+    from src.service.propose_scrapers.yuanta_propose import yuanta_scraper
+    from src.service.propose_scrapers.samsung_propose import samsung_scraper
+    from src.service.propose_scrapers.thinkpool_propose import thinkpool_scraper
+    from src.service.propose_scrapers.worldnews_propose import worldnews_scraper
 
-def propose_scraper(state: State):
     try:
         print("🎯 추천 종목 및 뉴스 스크래핑을 시작합니다...")
 
         domestic_recommendations = []  # 국내 추천 종목
         overseas_recommendations = []  # 해외 추천 종목
 
-        # 1. 유안타증권 추천 종목 스크래핑 (국내)
-        print("📈 유안타증권 추천 종목 수집 중...")
-        yuanta_stocks = yuanta_scraper.scrape_recommended_stocks()
+        # 네 곳의 스크래핑은 서로 독립적이므로 동시에 실행
+        # (유안타는 비동기 HTTP, 나머지 Selenium 스크래퍼는 스레드에서 실행)
+        print("📈 유안타증권 / 🤖 씽크풀 / 🌍 삼성증권 / 📰 StockAnalysis.com 수집 중...")
+        yuanta_stocks, thinkpool_stocks, samsung_stocks, worldnews_articles = await asyncio.gather(
+            yuanta_scraper.ascrape_recommended_stocks(),
+            asyncio.to_thread(thinkpool_scraper.scrape_recommended_stocks),
+            asyncio.to_thread(samsung_scraper.scrape_recommended_stocks),
+            asyncio.to_thread(worldnews_scraper.scrape_recommended_stocks),
+        )
+
+        # 1. 유안타증권 추천 종목 (국내)
         if yuanta_stocks:
             yuanta_formatted = yuanta_scraper.format_recommendations(yuanta_stocks)
             domestic_recommendations.append(yuanta_formatted)
@@ -23,9 +35,7 @@ def propose_scraper(state: State):
         else:
             print("⚠️  유안타증권 추천 종목 수집 실패")
 
-        # 2. 씽크풀 AI 종목 추천 스크래핑 (국내)
-        print("🤖 씽크풀 AI 종목 추천 수집 중...")
-        thinkpool_stocks = thinkpool_scraper.scrape_recommended_stocks()
+        # 2. 씽크풀 AI 종목 추천 (국내)
         if thinkpool_stocks:
             thinkpool_formatted = thinkpool_scraper.format_recommendations(thinkpool_stocks)
             domestic_recommendations.append(thinkpool_formatted)
@@ -33,9 +43,7 @@ def propose_scraper(state: State):
         else:
             print("⚠️  씽크풀 AI 종목 추천 수집 실패")
 
-        # 3. 삼성증권 해외 주식/ETF 추천 종목 스크래핑 (해외)
-        print("🌍 삼성증권 해외 주식/ETF 추천 종목 수집 중...")
-        samsung_stocks = samsung_scraper.scrape_recommended_stocks()
+        # 3. 삼성증권 해외 주식/ETF 추천 종목 (해외)
         if samsung_stocks:
             samsung_formatted = samsung_scraper.format_recommendations(samsung_stocks)
             overseas_recommendations.append(samsung_formatted)
@@ -43,9 +51,7 @@ def propose_scraper(state: State):
         else:
             print("⚠️  삼성증권 해외 주식/ETF 추천 종목 수집 실패")
 
-        # 4. StockAnalysis.com 뉴스 스크래핑 (해외)
-        print("📰 StockAnalysis.com 뉴스 수집 중...")
-        worldnews_articles = worldnews_scraper.scrape_recommended_stocks()
+        # 4. StockAnalysis.com 뉴스 (해외)
         if worldnews_articles:
             worldnews_formatted = worldnews_scraper.format_recommendations(worldnews_articles)
             overseas_recommendations.append(worldnews_formatted)
@@ -53,73 +59,71 @@ def propose_scraper(state: State):
         else:
             print("⚠️  StockAnalysis.com 뉴스 수집 실패")
 
+        update = {}
+
         # 국내 추천 종목 결합
         if domestic_recommendations:
             combined_domestic = "\n\n" + "=" * 60 + "\n\n".join(domestic_recommendations)
-            state["proposed_domestic_data"] = combined_domestic
+            update["proposed_domestic_data"] = combined_domestic
             print("✅ 국내 추천 종목 수집 완료")
         else:
-            state["proposed_domestic_data"] = "국내 추천 종목을 수집할 수 없습니다."
+            update["proposed_domestic_data"] = "국내 추천 종목을 수집할 수 없습니다."
             print("❌ 국내 추천 종목 수집 실패")
 
         # 해외 추천 종목 및 뉴스 결합
         if overseas_recommendations:
             combined_overseas = "\n\n" + "=" * 60 + "\n\n".join(overseas_recommendations)
-            state["proposed_worldwide_data"] = combined_overseas
+            update["proposed_worldwide_data"] = combined_overseas
             print("✅ 해외 추천 종목 및 뉴스 수집 완료")
         else:
-            state["proposed_worldwide_data"] = "해외 추천 종목 및 뉴스를 수집할 수 없습니다."
+            update["proposed_worldwide_data"] = "해외 추천 종목 및 뉴스를 수집할 수 없습니다."
             print("❌ 해외 추천 종목 및 뉴스 수집 실패")
 
-        return state
+        return update
 
     except Exception as e:
         print(f"❌ 추천 종목 및 뉴스 스크래핑 중 오류 발생: {str(e)}")
-        state["proposed_domestic_data"] = f"국내 추천 종목 스크래핑 오류: {str(e)}"
-        state["proposed_worldwide_data"] = f"해외 추천 종목 스크래핑 오류: {str(e)}"
-        return state
+        return {
+            "proposed_domestic_data": f"국내 추천 종목 스크래핑 오류: {str(e)}",
+            "proposed_worldwide_data": f"해외 추천 종목 스크래핑 오류: {str(e)}",
+        }
 
-def proposer(state: State):
+async def proposer(state: State):
     """
     추천 종목과 뉴스를 분석하는 노드
     """
     try:
-        propose_scraper(state)
+        # 스크래핑 결과는 병렬 브랜치와 병합되도록 변경된 키만 모아서 반환
+        update = await propose_scraper(state)
 
         # 기본값 설정
-        proposed_domestic_data = state.get("proposed_domestic_data", "국내 추천 종목 데이터가 없습니다.")
-        proposed_worldwide_data = state.get("proposed_worldwide_data", "해외 추천 종목 데이터가 없습니다.")
+        proposed_domestic_data = update.get("proposed_domestic_data", "국내 추천 종목 데이터가 없습니다.")
+        proposed_worldwide_data = update.get("proposed_worldwide_data", "해외 추천 종목 데이터가 없습니다.")
 
         if not proposed_domestic_data and not proposed_worldwide_data:
             print("수집된 데이터가 없음 → analyzer 건너뜀")
-            state["proposed_data"] = "수집된 데이터가 없습니다."
-            return state
+            update["proposed_data"] = "수집된 데이터가 없습니다."
+            return update
 
         prompt_template = proposer_prompt(proposed_domestic_data, proposed_worldwide_data)
         # print(prompt_template)
-        proposer_llm = prompt_template | llm
+        proposer_llm = prompt_template | get_model("gpt_fouro_mini")
 
         # 빈 딕셔너리를 입력으로 제공 (입력 변수가 없으므로)
-        response = proposer_llm.invoke({})
+        response = await proposer_llm.ainvoke({})
 
         # ChatOpenAI returns AIMessage, so we need to extract the content. use just result when using another model
         proposed_data = response.content if hasattr(response, 'content') else str(response)
 
-        if not proposed_data:
-            state["proposed_data"] = ""
-            return state
-
-        state["proposed_data"] = proposed_data
+        update["proposed_data"] = proposed_data or ""
 
-        return state
+        return update
 
     except Exception as e:
         print(f"Error in analyzer: {str(e)}")
         # 오류 발생 시에도 기본값 설정
-        state["proposed_data"] = f"분석 중 오류가 발생했습니다: {str(e)}"
-        return state
+        return {"proposed_data": f"분석 중 오류가 발생했습니다: {str(e)}"}
 
 if __name__ == "__main__":
-    state = State()
-    proposer(state)
-    print(state["proposed_data"])
\ No newline at end of file
+    result = asyncio.run(proposer(State()))
+    print(result["proposed_data"])
\ No newline at end of file
@@ -0,0 +1,228 @@
+import asyncio
+import dataclasses
+import time
+import weakref
+
+from langgraph.graph import END, StateGraph, START
+from langgraph.types import Send
+
+from src.core.config import settings
+from src.nodes.analyzer import stock_digest
+from src.nodes.history_loader import history_loader
+from src.nodes.news_scraper import news_scraper
+from src.nodes.stock_scraper import stock_scraper
+from src.nodes.types import Indicators, State, SymbolReport, SymbolState
+from src.service.stock_scrapers.get_stock import load_stock_list, load_worldwide_stock_list
+
+# 이벤트 루프별 동시 실행 제한 (세마포어는 생성된 루프에 묶이므로 루프마다 하나씩)
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# 컴파일된 종목별 서브그래프 (한 번만 컴파일해서 재사용)
+_symbol_graph = None
+
+
+def _symbol_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.SYMBOL_CONCURRENCY))
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def build_symbol_graph():
+    """
+    종목 1개를 처리하는 서브그래프를 생성합니다.
+    현재가 수집, 뉴스 수집, 과거 시세 갱신은 동시에 실행되고, 모두 끝나면 종목 요약을 생성합니다.
+    """
+    global _symbol_graph
+    if _symbol_graph is not None:
+        return _symbol_graph
+
+    graph = StateGraph(SymbolState)
+
+    graph.add_node("stock_scraper", stock_scraper)
+    graph.add_node("news_scraper", news_scraper)
+    graph.add_node("history_loader", history_loader)
+    graph.add_node("stock_digest", stock_digest)
+
+    graph.add_edge(START, "stock_scraper")
+    graph.add_edge(START, "news_scraper")
+    graph.add_edge(START, "history_loader")
+    graph.add_edge(["stock_scraper", "news_scraper", "history_loader"], "stock_digest")
+    graph.add_edge("stock_digest", END)
+
+    _symbol_graph = graph.compile()
+    return _symbol_graph
+
+
+async def _screen_domestic():
+    """국내 전 종목 스크리닝 (실패하면 None을 반환해 환경변수 관심 종목으로 진행)"""
+    from src.service.stock_scrapers.screener import run_screener
+
+    try:
+        result = await run_screener()
+    except Exception as e:
+        print(f"전 종목 스크리닝 실패 (환경변수 관심 종목으로 진행합니다): {str(e)}")
+        return None
+    if not result.candidates:
+        print("스크리닝 조건을 통과한 종목이 없습니다. SCREENER_FILTERS를 확인해주세요.")
+    return result
+
+
+async def watchlist_loader(state: State):
+    """
+    환경변수에서 관심 종목 리스트를 로드하고, 전 종목 현재가를 한 번에 미리 조회하여 state에 저장
+    SCREENER_ENABLED이면 국내 종목은 KOSPI·KOSDAQ 전 종목 스크리닝으로 고른 상위 종목을 사용합니다.
+    """
+    print("=== 관심 종목 로드 ===")
+
+    # 스크리너 모드이면 국내 종목은 전 종목 스크리닝 결과(현재가 포함)로 대체
+    screened = await _screen_domestic() if settings.SCREENER_ENABLED else None
+
+    if screened is not None:
+        stocks_domestic = screened.names
+        stocks_worldwide = await asyncio.to_thread(load_worldwide_stock_list)
+    else:
+        # 주식 리스트 로드 (국내, 해외 분리 - 종목 마스터 다운로드가 있을 수 있어 스레드에서 실행)
+        stocks_domestic, stocks_worldwide = await asyncio.to_thread(load_stock_list)
+
+    if not stocks_domestic and not stocks_worldwide:
+        print("주식 리스트가 비어있습니다. 환경변수 STOCK_LIST_DOMESTIC, STOCK_LIST_WORLDWIDE를 확인해주세요.")
+
+    total_stocks = len(stocks_domestic) + len(stocks_worldwide)
+    print(f"수집 대상 종목: {total_stocks}개 (국내: {len(stocks_domestic)}개, 해외: {len(stocks_worldwide)}개)")
+    print(f"동시 처리 종목 수: {settings.SYMBOL_CONCURRENCY}개")
+
+    # 현재가는 API 한도 안에서 전 종목을 한꺼번에 조회 (뉴스 수집 동시성 제한과 무관하게 진행)
+    reports = {}
+    if total_stocks:
+        from src.service.stock_scrapers.api_scraper import fetch_quotes
+
+        started = time.perf_counter()
+
+        # 스크리닝한 국내 종목은 스크리너가 조회한 상세 현재가를 그대로 사용
+        # 실시간 체결가를 수신 중이면 최근 체결이 있는 국내 종목은 REST 조회에서 제외
+        quotes = {}
+        if screened is not None:
+            quotes = {quote.code: quote for quote in screened.candidates}
+        elif settings.KIS_REALTIME_ENABLED:
+            from src.service.stock_scrapers.realtime import realtime_feed
+
+            if realtime_feed.running:
+                realtime_feed.subscribe(stocks_domestic)
+                ticks = realtime_feed.last_ticks(stocks_domestic)
+                quotes = {code: tick.to_quote() for code, tick in ticks.items()}
+                print(f"실시간 체결가 사용: {len(quotes)}/{len(stocks_domestic)}개")
+
+        codes = [code for code in [*stocks_domestic, *stocks_worldwide] if code not in quotes]
+        try:
+            if codes:
+                quotes.update(await fetch_quotes(codes))
+        except Exception as e:
+            print(f"현재가 일괄 조회 실패 (종목별로 다시 조회합니다): {str(e)}")
+
+        for market, stocks in (("domestic", stocks_domestic), ("worldwide", stocks_worldwide)):
+            for code, name in stocks.items():
+                report = SymbolReport(code=code, name=name, market=market, quote=quotes.get(code))
+                reports[report.key] = report
+
+        succeeded = sum(1 for report in reports.values() if report.quote)
+        print(f"현재가 일괄 조회: {succeeded}/{total_stocks}개 성공 ({time.perf_counter() - started:.1f}초)")
+
+    return {
+        "stock_list_domestic": stocks_domestic,
+        "stock_list_worldwide": stocks_worldwide,
+        "symbol_reports": reports,
+    }
+
+
+def dispatch_symbols(state: State):
+    """
+    관심 종목마다 symbol_worker를 하나씩 동적으로 생성합니다 (LangGraph Send).
+    미리 조회한 현재가가 있으면 함께 넘겨 종목별 재조회를 생략합니다.
+    종목이 없으면 바로 symbol_aggregator로 넘어갑니다.
+    """
+    reports = state.get("symbol_reports") or {}
+    sends = []
+    for market in ("domestic", "worldwide"):
+        for code, name in (state.get(f"stock_list_{market}") or {}).items():
+            report = reports.get(f"{code}({name})")
+            sends.append(Send("symbol_worker", {
+                "code": code,
+                "name": name,
+                "market": market,
+                "quote": report.quote if report else None,
+            }))
+    return sends or "symbol_aggregator"
+
+
+async def symbol_worker(state: SymbolState):
+    """
+    종목 1개에 대해 서브그래프를 실행하고 결과를 symbol_reports에 합칩니다.
+    동시에 실행되는 종목 수는 SYMBOL_CONCURRENCY로 제한됩니다.
+    """
+    report = SymbolReport(code=state["code"], name=state["name"], market=state["market"])
+
+    async with _symbol_semaphore():
+        try:
+            result = await build_symbol_graph().ainvoke(state)
+        except Exception as e:
+            print(f"  ✗ {report.key} 종목 처리 실패: {str(e)}")
+            result = {}
+
+    # 서브그래프가 실패해도 watchlist_loader가 미리 조회한 현재가는 유지
+    report.quote = result.get("quote") or state.get("quote")
+    report.news = result.get("news") or []
+    report.digest = result.get("digest") or ""
+
+    return {"symbol_reports": {report.key: report}}
+
+
+def _attach_indicators(reports: list[SymbolReport]) -> dict[str, SymbolReport]:
+    """저장된 과거 시세로 전 종목 기술적 지표를 한 번에 계산해 레코드에 붙입니다."""
+    if not settings.HISTORY_ENABLED or not reports:
+        return {}
+
+    try:
+        # NumPy 지표 모듈은 실제로 계산할 때 import
+        from src.service.history.indicators import watchlist_indicators
+
+        started = time.perf_counter()
+        values = watchlist_indicators([report.code for report in reports])
+    except Exception as e:
+        print(f"기술적 지표 계산 실패: {str(e)}")
+        return {}
+
+    updated = {
+        report.key: dataclasses.replace(report, indicators=Indicators.from_values(values[report.code]))
+        for report in reports
+        if report.code in values
+    }
+    print(f"기술적 지표 계산: {len(updated)}/{len(reports)}개 종목 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+    return updated
+
+
+def symbol_aggregator(state: State):
+    """
+    종목별 결과가 모두 모이는 지점 (수집 결과 요약 출력, 기술적 지표 계산)
+    종목 데이터는 symbol_reports에 레코드 그대로 두고, 직렬화는 최종 분석 프롬프트에서 한 번만 수행합니다.
+    """
+    reports = list((state.get("symbol_reports") or {}).values())
+
+    if not reports:
+        print("수집된 종목 데이터가 없습니다.")
+        return {}
+
+    domestic_count = sum(1 for report in reports if report.market == "domestic")
+    quote_count = sum(1 for report in reports if report.quote)
+    news_count = sum(len(report.news) for report in reports)
+
+    print(f"\n=== 종목별 데이터 수집 완료 ===")
+    print(f"총 {len(reports)}개 종목 (국내: {domestic_count}개, 해외: {len(reports) - domestic_count}개)")
+    print(f"현재가 수집 성공: {quote_count}개, 실패: {len(reports) - quote_count}개")
+    print(f"뉴스 {news_count}개 수집 "
+          f"(뉴스가 있는 종목: {sum(1 for report in reports if report.news)}개)")
+
+    updated = _attach_indicators(reports)
+    return {"symbol_reports": updated} if updated else {}
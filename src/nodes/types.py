@@ -1,16 +1,45 @@
-from typing import TypedDict
+from typing import Annotated, Any, Optional, TypedDict
 
-# agent가 유지할 state를 정의
+from src.core.records import Indicators, NewsArticle, Quote, SymbolReport
+
+
+def keep_latest(current: Any, update: Any) -> Any:
+    """
+    병렬 브랜치 병합용 reducer.
+    None으로는 기존 값을 덮어쓰지 않고, 그 밖의 값("", [], False 포함)은 그대로 갱신합니다.
+    (병렬 브랜치는 서로 다른 키를 쓰므로 값을 지우거나 False로 되돌리는 갱신도 반영되어야 함)
+    """
+    return current if update is None else update
+
+
+def merge_dict(current: dict | None, update: dict | None) -> dict:
+    """딕셔너리 병합 reducer: 종목별 워커가 각자 쓴 결과를 키 단위로 합칩니다."""
+    merged = dict(current or {})
+    merged.update(update or {})
+    return merged
+
+
+# agent가 유지할 state를 정의 (병렬 브랜치가 안전하게 병합되도록 모든 키에 reducer 지정)
 class State(TypedDict):
-    collected_data: str
-    analyzed_data: str
-    stock_list_domestic: list
-    stock_list_worldwide: list
-    scraped_data: str
-    stock_data: str
-    final_analyzed_data: str
-    proposed_domestic_data: str
-    proposed_worldwide_data: str
-    proposed_data: str
-    email_sent: bool
-    email_sent_time: str
\ No newline at end of file
+    collected_data: Annotated[str, keep_latest]
+    analyzed_data: Annotated[str, keep_latest]
+    stock_list_domestic: Annotated[dict, merge_dict]  # {종목코드: 종목명}
+    stock_list_worldwide: Annotated[dict, merge_dict]  # {종목코드: 종목명}
+    symbol_reports: Annotated[dict[str, SymbolReport], merge_dict]  # {종목코드(종목명): 종목별 서브그래프 결과}
+    final_analyzed_data: Annotated[str, keep_latest]
+    proposed_domestic_data: Annotated[str, keep_latest]
+    proposed_worldwide_data: Annotated[str, keep_latest]
+    proposed_data: Annotated[str, keep_latest]
+    email_sent: Annotated[bool, keep_latest]
+    email_sent_time: Annotated[str, keep_latest]
+
+
+# 종목 1개를 처리하는 서브그래프의 state (Send로 종목마다 하나씩 생성)
+class SymbolState(TypedDict):
+    code: str
+    name: str
+    market: str  # "domestic" 또는 "worldwide"
+    quote: Optional[Quote]
+    news: list[NewsArticle]
+    history_bars: int  # 로컬 저장소에 쌓인 일봉 개수
+    digest: str
@@ -1,15 +1,47 @@
-import re
-import os
-import json
-from datetime import datetime
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 
-def final_analyzer_prompt(scraped_data, analyzed_data, stock_data):
+from src.core.records import SymbolReport, to_compact_json
+
+EMPTY_STOCK_LIST = "주식 리스트가 비어있습니다."
+
+
+def _news_payload(reports: list[SymbolReport]) -> str:
+    """종목별 뉴스와 요약을 프롬프트용 JSON으로 직렬화합니다."""
+    if not reports:
+        return EMPTY_STOCK_LIST
+    payload = {}
+    for report in reports:
+        entry = {"news": [article.to_dict() for article in report.news]}
+        if report.digest:
+            entry["digest"] = report.digest
+        payload[report.key] = entry
+    return to_compact_json(payload)
+
+
+def _quote_payload(reports: list[SymbolReport]) -> str:
+    """종목별 현재가 정보를 프롬프트용 JSON으로 직렬화합니다."""
+    if not reports:
+        return EMPTY_STOCK_LIST
+    return to_compact_json({
+        report.key: report.quote.to_fields() if report.quote else {}
+        for report in reports
+    })
+
+
+def _indicator_payload(reports: list[SymbolReport]) -> str:
+    """종목별 기술적 지표를 프롬프트용 JSON으로 직렬화합니다."""
+    payload = {report.key: report.indicators.to_fields() for report in reports if report.indicators}
+    if not payload:
+        return "계산된 기술적 지표가 없습니다."
+    return to_compact_json(payload)
+
+
+def final_analyzer_prompt(analyzed_data, symbol_reports):
     """
     최종 분석을 위한 프롬프트 생성
-    scraped_data: 수집된 뉴스 데이터
     analyzed_data: 이전 분석 결과
+    symbol_reports: 종목별 수집 결과 {종목코드(종목명): SymbolReport}
     """
     base_prompt = """
 당신은 최고의 투자 전략가이자 시장 분석 전문가입니다.
@@ -25,13 +57,19 @@ def final_analyzer_prompt(scraped_data, analyzed_data, stock_data):
 
 **3. 수집된 현재 주식 현황:**
 {stock_data}
+
+**4. 과거 일봉 기반 기술적 지표 (최신 봉 기준):**
+{indicator_data}
 ---
 
-**4. 투자 전략 수립 및 주식 전망 제시 지침:**
+**5. 투자 전략 수립 및 주식 전망 제시 지침:**
 
 * **뉴스 데이터 활용:**
     * 수집된 뉴스 데이터는 **감성 분석(긍정/부정)을 통해 주가에 미칠 영향을 평가**하고, 주요 키워드와 트렌드를 파악하여 분석에 적극 반영해주세요.
 
+* **기술적 지표 활용:**
+    * 제공된 이동평균, RSI, MACD, 볼린저 밴드, ATR, 거래량 Z점수 수치를 근거로 **추세, 과매수/과매도, 변동성, 거래량 이상 여부**를 판단해주세요. 지표가 없는 종목은 추측하지 마세요.
+
 * **최종 투자 전략 제시:**
     * 전반적인 시장 상황(거시 경제, 섹터 트렌드)을 고려한 **종합적인 투자 전략 방향**을 제시해주세요.
 
@@ -42,7 +80,7 @@ def final_analyzer_prompt(scraped_data, analyzed_data, stock_data):
 
 ---
 
-**5. 최종 답변 형식:**
+**6. 최종 답변 형식:**
 
 * 명확하고 간결한 문체로 작성해주세요.
 * 전문 용어는 최소화하고 이해하기 쉽게 설명합니다.
@@ -50,10 +88,12 @@ def final_analyzer_prompt(scraped_data, analyzed_data, stock_data):
 * **각 섹션별(시장 분석, 투자 전략, 개별 주식 전망)로 명확하게 구분하여 제시**해주세요.
     """
 
+    reports = list((symbol_reports or {}).values())
     partial_prompt = base_prompt.format(
-        scraped_data=scraped_data,
+        scraped_data=_news_payload(reports),
         analyzed_data=analyzed_data,
-        stock_data=stock_data
+        stock_data=_quote_payload(reports),
+        indicator_data=_indicator_payload(reports)
     )
 
     prompt = ChatPromptTemplate.from_messages(
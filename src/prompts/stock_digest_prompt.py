@@ -0,0 +1,42 @@
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+def stock_digest_prompt(stock_label, quote_data, news_data):
+    """
+    종목별 요약(digest)을 위한 프롬프트 생성
+    stock_label: 종목코드(종목명)
+    quote_data: 현재가 정보
+    news_data: 수집된 종목 뉴스
+    """
+    base_prompt = """
+당신은 개별 종목을 빠르게 정리하는 주식 애널리스트입니다.
+아래 종목의 현재가 정보와 최신 뉴스를 바탕으로 최종 분석가가 참고할 요약을 작성해주세요.
+
+종목: {stock_label}
+
+현재가 정보:
+{quote_data}
+
+최신 뉴스:
+{news_data}
+
+지시사항:
+* 주가 흐름과 수급/밸류에이션의 핵심 수치를 1~2문장으로 정리합니다.
+* 뉴스의 주요 이슈와 감성(긍정/중립/부정)을 1~2문장으로 정리합니다.
+* 마지막 줄에 "단기 모멘텀: [긍정/중립/부정]"을 표기합니다.
+* 제공되지 않은 수치는 추측하지 말고 생략합니다.
+    """
+
+    partial_prompt = base_prompt.format(
+        stock_label=stock_label,
+        quote_data=quote_data,
+        news_data=news_data
+    )
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            SystemMessage(content=partial_prompt)
+        ]
+    )
+
+    return prompt
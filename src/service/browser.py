@@ -0,0 +1,406 @@
+"""
+Selenium Chrome 드라이버 생성 공통 모듈
+ChromeDriver 바이너리 경로는 프로세스당 한 번만 확인하고 재사용합니다.
+스크래퍼는 브라우저를 직접 띄우지 않고 공용 브라우저 풀(browser_pool)에서 빌려 쓰고 돌려줍니다.
+페이지 로드는 사이트별 서킷 브레이커와 지연 예산으로 보호합니다. (load_page)
+"""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from src.core.config import settings
+from src.service.resilience import LatencyBudget, backoff, get_breaker
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    USE_MANAGER = True
+except ImportError:
+    USE_MANAGER = False
+
+# 브라우저 메모리(RSS) 확인용 (없으면 페이지 수 기준으로만 재생성)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_driver_path: Optional[str] = None
+_driver_path_resolved = False
+_driver_path_lock = threading.Lock()
+
+
+def get_chromedriver_path() -> Optional[str]:
+    """
+    ChromeDriver 경로를 반환합니다.
+    webdriver_manager의 설치/버전 확인은 최초 1회만 수행하고, 이후에는 캐시된 경로를 사용합니다.
+    webdriver_manager가 없거나 실패하면 None (Selenium Manager / PATH의 드라이버 사용)
+    """
+    global _driver_path, _driver_path_resolved
+
+    if _driver_path_resolved:
+        return _driver_path
+
+    with _driver_path_lock:
+        if not _driver_path_resolved:
+            if USE_MANAGER:
+                try:
+                    _driver_path = ChromeDriverManager().install()
+                except Exception as e:
+                    print(f"ChromeDriver 설치 확인 실패, 기본 드라이버를 사용합니다: {e}")
+                    _driver_path = None
+            _driver_path_resolved = True
+
+    return _driver_path
+
+
+def create_chrome_driver(options) -> webdriver.Chrome:
+    """캐시된 ChromeDriver 경로로 Chrome WebDriver를 생성합니다."""
+    driver_path = get_chromedriver_path()
+    if driver_path:
+        return webdriver.Chrome(service=Service(driver_path), options=options)
+    return webdriver.Chrome(options=options)
+
+
+def load_page(driver, url: str, budget: Optional[LatencyBudget] = None, retries: Optional[int] = None):
+    """
+    페이지를 엽니다. 사이트(호스트)별 서킷 브레이커로 보호하고, 페이지 로드 타임아웃을 지연 예산 안으로 제한합니다.
+    로드에 실패하면 예산이 남아 있는 동안 retries번까지 백오프 후 다시 시도합니다.
+
+    Raises:
+        CircuitOpenError: 사이트가 연속 실패로 차단 중인 경우 (기다리지 않고 바로 발생)
+        WebDriverException: 재시도 후에도 페이지를 열지 못한 경우
+    """
+    retries = settings.SCRAPE_RETRIES if retries is None else retries
+    budget = budget or LatencyBudget()
+    breaker = get_breaker(url)
+    breaker.check()
+
+    try:
+        for attempt in range(retries + 1):
+            driver.set_page_load_timeout(budget.cap(settings.SCRAPE_PAGE_TIMEOUT))
+            browser_pool.count_page(driver)
+            try:
+                driver.get(url)
+            except WebDriverException as e:
+                delay = backoff(attempt)
+                if attempt >= retries or not budget.allows(delay):
+                    breaker.record_failure()
+                    raise
+                print(f"  페이지 로드 실패, {delay:.1f}초 후 재시도: {type(e).__name__}")
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return
+    finally:
+        breaker.release()
+
+
+# 맨 아래로 스크롤한 뒤 새 항목이 붙을 때까지 기다리는 스크립트 (execute_async_script용)
+# 항목 수(selector) 또는 문서 높이가 늘어나면 바로 true, timeout까지 변화가 없으면 false로 끝남
+_SCROLL_AND_WAIT_SCRIPT = """
+const selector = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const count = () => selector ? document.querySelectorAll(selector).length : 0;
+const startCount = count(), startHeight = document.documentElement.scrollHeight;
+const grew = () => count() > startCount || document.documentElement.scrollHeight > startHeight;
+let finished = false, timer = null;
+const observer = new MutationObserver(() => { if (grew()) finish(true); });
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => finish(grew()), timeoutMs);
+window.scrollTo(0, document.documentElement.scrollHeight);
+"""
+
+
+def scroll_and_wait(driver, item_selector: Optional[str] = None, timeout: Optional[float] = None,
+                    budget: Optional[LatencyBudget] = None) -> bool:
+    """
+    페이지 맨 아래로 스크롤하고, 새 항목이 붙는 즉시(MutationObserver) 돌아옵니다.
+    고정 시간을 기다리지 않고 항목 수(item_selector) 또는 문서 높이가 늘어나는 순간 끝나며,
+    timeout초 안에 변화가 없으면 더 불러올 내용이 없는 것으로 봅니다.
+
+    Returns:
+        새 내용이 붙었으면 True
+    """
+    timeout = settings.SCROLL_WAIT_TIMEOUT if timeout is None else timeout
+    if budget is not None:
+        timeout = min(timeout, budget.remaining())
+    if timeout <= 0:
+        return False
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(_SCROLL_AND_WAIT_SCRIPT, item_selector, int(timeout * 1000)))
+    except WebDriverException as e:
+        print(f"스크롤 중 오류: {type(e).__name__}")
+        return False
+
+
+def pool_options() -> Options:
+    """풀에서 띄우는 Chrome 공통 옵션 (사이트별 User-Agent·언어는 빌릴 때 지정)"""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--log-level=3")
+    return options
+
+
+class BrowserSession:
+    """풀이 관리하는 브라우저 하나 (드라이버와 사용 기록)"""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.pages = 0
+        self.overridden = False
+        try:
+            self.default_user_agent = driver.execute_script("return navigator.userAgent")
+        except WebDriverException:
+            self.default_user_agent = None
+
+    def healthy(self) -> bool:
+        """브라우저가 응답하는지 확인합니다. (죽은 세션·닫힌 창이면 False)"""
+        try:
+            return bool(self.driver.window_handles) and self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def rss_mb(self) -> Optional[float]:
+        """ChromeDriver와 하위 Chrome 프로세스의 메모리 사용량 합계 (MB, psutil이 없으면 None)"""
+        if psutil is None:
+            return None
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            processes = [process, *process.children(recursive=True)]
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def override(self, user_agent: Optional[str], accept_language: Optional[str]):
+        """이번 사용에 한해 User-Agent·Accept-Language를 바꿉니다. (돌려줄 때 원래대로)"""
+        params = {"userAgent": user_agent or self.default_user_agent or ""}
+        if accept_language:
+            params["acceptLanguage"] = accept_language
+        self.driver.execute_cdp_cmd("Network.setUserAgentOverride", params)
+        self.overridden = True
+
+    def reset(self):
+        """다음 사용을 위해 정리합니다. (추가로 열린 창 닫기, 빈 페이지로 이동, User-Agent 복원)"""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.driver.get("about:blank")
+        if self.overridden:
+            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": self.default_user_agent or ""})
+            self.overridden = False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    미리 띄워 둔 Chrome을 여러 스크래퍼가 돌려 쓰는 풀
+    빌릴 때 응답 여부를 확인하고, 일정 페이지 수를 열었거나 메모리가 한도를 넘은 브라우저는 돌려받을 때 종료합니다.
+    (WebDriver 하나는 동시에 한 스레드만 쓸 수 있으므로 탭이 아니라 브라우저 단위로 빌려줌)
+    """
+
+    def __init__(self, size: int, max_pages: int, max_rss_mb: float, options_factory=pool_options):
+        """
+        Args:
+            size: 동시에 띄울 수 있는 최대 브라우저 수
+            max_pages: 브라우저 하나로 열 최대 페이지 수 (넘으면 새로 띄움, 0이면 제한 없음)
+            max_rss_mb: 브라우저 하나의 최대 메모리 사용량 (MB, 넘으면 새로 띄움, 0이면 확인하지 않음)
+            options_factory: Chrome 옵션 생성 함수
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.options_factory = options_factory
+        self._condition = threading.Condition()
+        self._idle: List[BrowserSession] = []
+        self._by_driver: Dict[int, BrowserSession] = {}
+        self._opened = 0  # 실행 중이거나 띄우는 중인 브라우저 수
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+
+    def _launch(self) -> BrowserSession:
+        driver = create_chrome_driver(self.options_factory())
+        session = BrowserSession(driver)
+        with self._condition:
+            self._by_driver[id(driver)] = session
+            self.created += 1
+        return session
+
+    def _discard(self, session: BrowserSession):
+        session.quit()
+        with self._condition:
+            self._by_driver.pop(id(session.driver), None)
+            self._opened -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> BrowserSession:
+        """
+        쉬고 있는 브라우저를 빌립니다. 없으면 풀 크기 안에서 새로 띄우고, 가득 찼으면 반납될 때까지 기다립니다.
+
+        Raises:
+            TimeoutError: timeout초 안에 브라우저를 빌리지 못한 경우
+        """
+        timeout = settings.BROWSER_ACQUIRE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("브라우저 풀이 종료되었습니다.")
+                session, launch = None, False
+                if self._idle:
+                    session = self._idle.pop()
+                elif self._opened < self.size:
+                    self._opened += 1
+                    launch = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"{timeout:g}초 안에 사용할 수 있는 브라우저가 없습니다.")
+                    self._condition.wait(remaining)
+                    continue
+
+            if launch:
+                try:
+                    return self._launch()
+                except Exception:
+                    with self._condition:
+                        self._opened -= 1
+                        self._condition.notify()
+                    raise
+
+            if session.healthy():
+                return session
+            print("  ⚠️  응답하지 않는 브라우저를 종료하고 새로 띄웁니다.")
+            self._discard(session)
+
+    def release(self, session: BrowserSession, broken: bool = False):
+        """빌린 브라우저를 돌려줍니다. 재사용 한도를 넘었거나 정리에 실패하면 종료합니다."""
+        reason = None
+        if broken:
+            reason = "오류"
+        elif self.max_pages and session.pages >= self.max_pages:
+            reason = f"{session.pages}페이지 사용"
+        elif self.max_rss_mb:
+            rss = session.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                reason = f"메모리 {rss:.0f}MB"
+
+        if reason is None:
+            try:
+                session.reset()
+            except Exception:
+                reason = "정리 실패"
+
+        with self._condition:
+            closed = self._closed
+        if reason is not None or closed:
+            if reason is not None:
+                print(f"  ♻️  브라우저 재생성 ({reason})")
+                self.recycled += 1
+            self._discard(session)
+            return
+
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self, user_agent: Optional[str] = None, accept_language: Optional[str] = None,
+                timeout: Optional[float] = None):
+        """
+        브라우저를 빌려 드라이버를 넘겨주고, 블록이 끝나면 돌려줍니다.
+        WebDriver 세션 자체가 끊긴 오류로 끝나면 재사용하지 않고 종료합니다.
+
+        Args:
+            user_agent: 이번 사용에만 적용할 User-Agent
+            accept_language: 이번 사용에만 적용할 Accept-Language (예: "ko-KR")
+            timeout: 브라우저를 빌릴 때까지 기다릴 최대 시간 (초)
+        """
+        session = self.acquire(timeout)
+        broken = False
+        try:
+            if user_agent or accept_language:
+                session.override(user_agent, accept_language)
+            yield session.driver
+        except WebDriverException:
+            broken = not session.healthy()
+            raise
+        finally:
+            self.release(session, broken=broken)
+
+    def count_page(self, driver):
+        """풀에서 빌린 드라이버로 페이지를 하나 열었음을 기록합니다. (load_page에서 호출)"""
+        with self._condition:
+            session = self._by_driver.get(id(driver))
+            if session is not None:
+                session.pages += 1
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """브라우저 count개(기본값: 풀 크기)를 미리 띄워 둡니다. (블로킹) 준비된 브라우저 수를 반환합니다."""
+        count = self.size if count is None else min(count, self.size)
+        sessions = []
+        try:
+            for _ in range(count):
+                sessions.append(self.acquire(timeout=0))
+        except (TimeoutError, WebDriverException) as e:
+            print(f"  ⚠️  브라우저 미리 띄우기 중단: {e}")
+        finally:
+            for session in sessions:
+                self.release(session)
+        return len(sessions)
+
+    def close(self):
+        """
+        풀을 닫고 쉬고 있는 브라우저를 모두 종료합니다. (빌려 간 브라우저는 반납될 때 종료)
+        프로세스 종료 시 자동으로 호출되며, 닫힌 풀에서는 더 빌릴 수 없습니다.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "size": self.size,
+                "open": self._opened,
+                "idle": len(self._idle),
+                "created": self.created,
+                "recycled": self.recycled,
+            }
+
+
+# 전역 브라우저 풀 (처음 빌릴 때 브라우저를 띄우고, 프로세스 종료 시 모두 닫음)
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_pages=settings.BROWSER_MAX_PAGES,
+    max_rss_mb=settings.BROWSER_MAX_RSS_MB,
+)
+atexit.register(browser_pool.close)
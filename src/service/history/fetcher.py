@@ -0,0 +1,239 @@
+"""
+과거 시세(OHLCV) 수집
+국내 종목은 한국투자증권 기간별 시세(일봉)·당일 분봉 API, 해외 종목은 Yahoo Finance chart API로 조회하고,
+저장소에 마지막으로 저장된 봉 이후 구간만 받아 이어 붙입니다.
+"""
+import calendar
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.core.config import settings
+from src.service import http_client
+from src.service.stock_scrapers.api_scraper import (
+    KIS_BASE_URL,
+    YAHOO_CHART_URL,
+    YAHOO_HEADERS,
+    _kis_get,
+    get_headers,
+    yahoo_rate_limiter,
+)
+from .store import BAR_DTYPE, empty_bars, history_store, normalize_bars
+
+logger = logging.getLogger(__name__)
+
+# 국내주식 기간별 시세 (요청당 최대 100봉, 최신순)
+KIS_DAILY_CHART_URL = f"{KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+KIS_DAILY_CHART_TR_ID = "FHKST03010100"
+KIS_DAILY_CHART_MAX_ROWS = 100
+# 국내주식 당일 분봉 (요청당 최대 30봉, 최신순 - 당일 데이터만 제공)
+KIS_MINUTE_CHART_URL = f"{KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+KIS_MINUTE_CHART_TR_ID = "FHKST03010200"
+KIS_MINUTE_CHART_MAX_ROWS = 30
+
+KST = ZoneInfo("Asia/Seoul")
+KRX_OPEN_HOUR = "090000"
+
+# Yahoo Finance 1분봉은 최근 며칠치만 제공
+YAHOO_MINUTE_MAX_DAYS = 7
+
+# 수정주가 반영 여부를 비교할 때 허용하는 종가 차이 (상대값)
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def _day_ts(day: date) -> int:
+    """거래일을 일봉 시각(해당 날짜 00:00 UTC의 epoch 초)으로 변환합니다."""
+    return calendar.timegm(day.timetuple())
+
+
+def _ts_day(ts: int) -> date:
+    return datetime.fromtimestamp(ts, timezone.utc).date()
+
+
+def _bars(rows: List[tuple]) -> np.ndarray:
+    return normalize_bars(np.array(rows, dtype=BAR_DTYPE)) if rows else empty_bars()
+
+
+def _kis_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def fetch_domestic_daily(stock_code: str, start: date, end: Optional[date] = None) -> np.ndarray:
+    """국내 주식 일봉을 start~end(포함) 구간만큼 조회합니다. (100봉씩 과거로 나눠 요청)"""
+    end = end or datetime.now(KST).date()
+    headers = get_headers(KIS_DAILY_CHART_TR_ID)
+
+    rows = []
+    while end >= start:
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": stock_code,
+            "FID_INPUT_DATE_1": start.strftime("%Y%m%d"),
+            "FID_INPUT_DATE_2": end.strftime("%Y%m%d"),
+            "FID_PERIOD_DIV_CODE": "D",
+            "FID_ORG_ADJ_PRC": "0",  # 수정주가
+        }
+        result = _kis_get(KIS_DAILY_CHART_URL, headers, params, stock_code).json()
+        if result.get("rt_cd") != "0":
+            raise ValueError(f"국내 주식 일봉 조회 실패: {result.get('msg1', '알 수 없는 오류')}")
+
+        items = [item for item in result.get("output2") or [] if item.get("stck_bsop_date")]
+        for item in items:
+            day = datetime.strptime(item["stck_bsop_date"], "%Y%m%d").date()
+            rows.append((
+                _day_ts(day),
+                _kis_number(item.get("stck_oprc")),
+                _kis_number(item.get("stck_hgpr")),
+                _kis_number(item.get("stck_lwpr")),
+                _kis_number(item.get("stck_clpr")),
+                _kis_number(item.get("acml_vol")),
+            ))
+
+        if len(items) < KIS_DAILY_CHART_MAX_ROWS:
+            break
+        oldest = min(item["stck_bsop_date"] for item in items)
+        end = datetime.strptime(oldest, "%Y%m%d").date() - timedelta(days=1)
+
+    return _bars(rows)
+
+
+def fetch_domestic_minute(stock_code: str, since_ts: Optional[int] = None) -> np.ndarray:
+    """국내 주식 당일 1분봉을 since_ts(포함) 이후만큼 조회합니다. (30봉씩 과거로 나눠 요청)"""
+    now = datetime.now(KST)
+    session_start = int(now.replace(hour=9, minute=0, second=0, microsecond=0).timestamp())
+    since_ts = max(since_ts or session_start, session_start)
+    headers = get_headers(KIS_MINUTE_CHART_TR_ID)
+
+    rows = []
+    hour = now.strftime("%H%M%S")
+    while hour >= KRX_OPEN_HOUR:
+        params = {
+            "FID_ETC_CLS_CODE": "",
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": stock_code,
+            "FID_INPUT_HOUR_1": hour,
+            "FID_PW_DATA_INCU_YN": "N",
+        }
+        result = _kis_get(KIS_MINUTE_CHART_URL, headers, params, stock_code).json()
+        if result.get("rt_cd") != "0":
+            raise ValueError(f"국내 주식 분봉 조회 실패: {result.get('msg1', '알 수 없는 오류')}")
+
+        items = [item for item in result.get("output2") or [] if item.get("stck_cntg_hour")]
+        oldest_ts = None
+        for item in items:
+            bar_time = datetime.strptime(item["stck_bsop_date"] + item["stck_cntg_hour"], "%Y%m%d%H%M%S")
+            ts = int(bar_time.replace(tzinfo=KST).timestamp())
+            oldest_ts = ts if oldest_ts is None else min(oldest_ts, ts)
+            if ts >= since_ts:
+                rows.append((
+                    ts,
+                    _kis_number(item.get("stck_oprc")),
+                    _kis_number(item.get("stck_hgpr")),
+                    _kis_number(item.get("stck_lwpr")),
+                    _kis_number(item.get("stck_prpr")),
+                    _kis_number(item.get("cntg_vol")),
+                ))
+
+        if len(items) < KIS_MINUTE_CHART_MAX_ROWS or oldest_ts is None or oldest_ts <= since_ts:
+            break
+        hour = datetime.fromtimestamp(oldest_ts - 60, KST).strftime("%H%M%S")
+
+    return _bars(rows)
+
+
+def fetch_worldwide(stock_code: str, since_ts: int, interval: str = "1d") -> np.ndarray:
+    """해외 주식 봉을 since_ts(포함) 이후만큼 Yahoo Finance chart API로 조회합니다."""
+    params = {
+        "period1": str(since_ts),
+        "period2": str(int(datetime.now(timezone.utc).timestamp())),
+        "interval": interval,
+        "includePrePost": "false",
+    }
+    response = http_client.request("GET", f"{YAHOO_CHART_URL}/{stock_code}", limiter=yahoo_rate_limiter,
+                                   headers=YAHOO_HEADERS, params=params)
+    response.raise_for_status()
+    results = (response.json().get("chart") or {}).get("result") or []
+    if not results or not results[0].get("timestamp"):
+        return empty_bars()
+
+    result = results[0]
+    quote = (result.get("indicators") or {}).get("quote", [{}])[0]
+    timestamps = np.asarray(result["timestamp"], dtype="<i8")
+    if interval == "1d":
+        # 일봉은 거래소 현지 날짜 기준 00:00 UTC로 맞춤 (국내 일봉과 같은 기준)
+        offset = int((result.get("meta") or {}).get("gmtoffset") or 0)
+        timestamps = (timestamps + offset) // 86400 * 86400
+
+    bars = np.empty(len(timestamps), dtype=BAR_DTYPE)
+    bars["ts"] = timestamps
+    for column in ("open", "high", "low", "close", "volume"):
+        values = quote.get(column) or [None] * len(timestamps)
+        bars[column] = np.array(values, dtype="f8")  # None → nan
+    # 거래가 없었던 봉(종가 없음)은 제외
+    return normalize_bars(bars[~np.isnan(bars["close"])])
+
+
+def _fetch(stock_code: str, market: str, interval: str, since_ts: int) -> np.ndarray:
+    if market == "domestic":
+        if interval == "1m":
+            return fetch_domestic_minute(stock_code, since_ts)
+        return fetch_domestic_daily(stock_code, _ts_day(since_ts))
+    return fetch_worldwide(stock_code, since_ts, interval)
+
+
+def _initial_since(interval: str) -> int:
+    now = datetime.now(timezone.utc)
+    if interval == "1m":
+        return int((now - timedelta(days=YAHOO_MINUTE_MAX_DAYS - 1)).timestamp())
+    return _day_ts(now.date() - timedelta(days=settings.HISTORY_LOOKBACK_DAYS))
+
+
+def _adjusted(stored: np.ndarray, fetched: np.ndarray) -> bool:
+    """다시 받은 확정 봉의 종가가 저장된 값과 다르면 수정주가(액면분할 등)가 반영된 것으로 판단합니다."""
+    ts = stored["ts"][-2]
+    matched = fetched[fetched["ts"] == ts]
+    if len(matched) == 0:
+        return False
+    old_close, new_close = float(stored["close"][-2]), float(matched["close"][0])
+    return abs(new_close - old_close) > ADJUSTMENT_TOLERANCE * max(abs(old_close), 1.0)
+
+
+def update_history(stock_code: str, market: str, interval: str = "1d") -> np.ndarray:
+    """
+    종목의 과거 시세를 최신으로 갱신하고 저장된 봉 전체를 반환합니다.
+    저장된 봉이 있으면 마지막 두 봉부터만 다시 받아 이어 붙입니다.
+    (마지막 봉은 장중에 바뀔 수 있고, 그 앞의 확정 봉은 수정주가 반영 여부 확인에 사용)
+    조회에 실패하면 저장된 봉을 그대로 반환합니다.
+    """
+    stored = history_store.load(stock_code, interval)
+    try:
+        fetched = None
+        if len(stored) >= 2:
+            fetched = _fetch(stock_code, market, interval, int(stored["ts"][-2]))
+            if _adjusted(stored, fetched):
+                print(f"  ↻ {stock_code} 수정주가 반영 → 과거 시세 전체 재수집")
+                fetched = None
+
+        if fetched is None:
+            fetched = _fetch(stock_code, market, interval, _initial_since(interval))
+            if len(fetched):
+                history_store.replace(stock_code, interval, fetched)
+        else:
+            history_store.merge(stock_code, interval, fetched)
+    except Exception as e:
+        logger.error(f"{stock_code} 과거 시세 조회 중 오류 발생: {e}")
+
+    return history_store.load(stock_code, interval)
+
+
+def history_summary(bars: np.ndarray) -> Dict[str, Any]:
+    """저장된 봉의 개수와 기간 (출력용)"""
+    if len(bars) == 0:
+        return {"bars": 0}
+    return {"bars": len(bars), "from": str(_ts_day(int(bars["ts"][0]))), "to": str(_ts_day(int(bars["ts"][-1])))}
@@ -0,0 +1,242 @@
+"""
+기술적 지표 계산 (NumPy 벡터화)
+관심 종목 전체의 과거 시세를 (종목 수 × 봉 수) 2-D 배열로 맞춘 뒤 한 번에 계산합니다.
+봉 수가 다른 종목은 최신 봉 기준으로 오른쪽 정렬하고 앞쪽 빈 칸은 NaN으로 채웁니다.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .store import history_store
+
+# 지표 계산에 사용할 최대 봉 수 (지수이동평균이 수렴하기에 충분한 길이)
+INDICATOR_LOOKBACK = 500
+
+SMA_WINDOWS = (5, 20, 60, 120)
+EMA_SPAN = 20
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_WINDOW, BOLLINGER_WIDTH = 20, 2.0
+ATR_PERIOD = 14
+VOLUME_Z_WINDOW = 20
+
+# 지수이동평균 전체 시계열을 계산할 때 한 번에 처리하는 봉 수 (블록 단위 행렬곱)
+EMA_BLOCK = 64
+
+
+def align_right(series: List[np.ndarray], length: Optional[int] = None) -> np.ndarray:
+    """길이가 다른 1-D 시계열들을 최신 봉 기준으로 맞춘 2-D 배열 (앞쪽 빈 칸은 NaN)"""
+    length = length if length is not None else max((len(s) for s in series), default=0)
+    matrix = np.full((len(series), length), np.nan)
+    for row, values in enumerate(series):
+        values = np.asarray(values[-length:] if length else values[:0], dtype="f8")
+        if len(values):
+            matrix[row, length - len(values):] = values
+    return matrix
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """봉 축으로 periods만큼 뒤로 민 배열 (앞쪽은 NaN)"""
+    out = np.full_like(x, np.nan)
+    if periods < x.shape[1]:
+        out[:, periods:] = x[:, :-periods]
+    return out
+
+
+def _valid_count(x: np.ndarray) -> np.ndarray:
+    """종목별 유효한(NaN이 아닌) 봉 수"""
+    return np.count_nonzero(~np.isnan(x), axis=1)
+
+
+def _fill(x: np.ndarray) -> np.ndarray:
+    """
+    앞쪽 NaN은 첫 유효값으로, 중간 NaN은 직전 값으로 채웁니다.
+    앞쪽을 첫 유효값으로 채우면 지수이동평균이 첫 유효값에서 시작하는 것과 같은 결과가 됩니다.
+    """
+    missing = np.isnan(x)
+    if not missing.any():
+        return x
+
+    rows = np.arange(x.shape[0])
+    first_index = (~missing).argmax(axis=1)
+    first = x[rows, first_index]
+    filled = np.where(np.arange(x.shape[1]) < first_index[:, None], first[:, None], x)
+
+    # 중간에 빈 봉이 있는 종목만 직전 값으로 채움 (대부분은 앞쪽 NaN만 있음)
+    gaps = (missing.sum(axis=1) > first_index) & ~np.isnan(first)
+    if gaps.any():
+        sub = filled[gaps]
+        index = np.where(np.isnan(sub), 0, np.arange(x.shape[1]))
+        np.maximum.accumulate(index, axis=1, out=index)
+        filled[gaps] = np.take_along_axis(sub, index, axis=1)
+    return filled
+
+
+def _tail(x: np.ndarray, window: int) -> np.ndarray:
+    """최근 window봉 (봉 수가 모자라면 NaN 한 칸으로 대체해 결과가 NaN이 되도록 함)"""
+    if window > x.shape[1]:
+        return np.full((x.shape[0], 1), np.nan)
+    return x[:, -window:]
+
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    """최신 봉의 단순이동평균 (창 안에 NaN이 있으면 NaN)"""
+    return _tail(x, window).mean(axis=1)
+
+
+def _mean_std(x: np.ndarray, window: int):
+    tail = _tail(x, window)
+    return tail.mean(axis=1), tail.std(axis=1)
+
+
+def _leading(x: np.ndarray) -> np.ndarray:
+    """첫 유효값 이전 구간(앞쪽 NaN) 마스크"""
+    valid = ~np.isnan(x)
+    first_index = np.where(valid.any(axis=1), valid.argmax(axis=1), x.shape[1])
+    return np.arange(x.shape[1]) < first_index[:, None]
+
+
+def _ema_blocks(filled: np.ndarray, alpha: float) -> np.ndarray:
+    # y[t] = (1 - alpha) * y[t-1] + alpha * x[t] 을 EMA_BLOCK봉씩 행렬곱으로 계산 (y[-1] = x[0])
+    n_cols = filled.shape[1]
+    out = np.empty_like(filled)
+    steps = np.arange(EMA_BLOCK)
+    lag = steps[:, None] - steps[None, :]
+    weights = np.where(lag >= 0, alpha * (1 - alpha) ** np.maximum(lag, 0), 0.0).T
+    decay = (1 - alpha) ** (steps + 1)
+
+    prev = filled[:, 0]
+    for start in range(0, n_cols, EMA_BLOCK):
+        block = filled[:, start:start + EMA_BLOCK]
+        size = block.shape[1]
+        np.matmul(block, weights[:size, :size], out=out[:, start:start + size])
+        out[:, start:start + size] += prev[:, None] * decay[None, :size]
+        prev = out[:, start + size - 1]
+    return out
+
+
+def ema_series(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    지수이동평균 전체 시계열 (첫 유효값에서 시작, 중간 NaN은 직전 값으로 채움)
+    점화식을 EMA_BLOCK봉 단위 행렬곱으로 풀어 봉마다 반복하지 않습니다.
+    """
+    if x.shape[1] == 0:
+        return np.empty_like(x)
+    out = _ema_blocks(_fill(x), alpha)
+    out[_leading(x)] = np.nan
+    return out
+
+
+def ema(x: np.ndarray, alpha: float, min_periods: int = 1) -> np.ndarray:
+    """
+    최신 봉의 지수이동평균 (첫 유효값에서 시작, 중간 NaN은 직전 값으로 채움)
+    전체 시계열 없이 가중합 한 번(행렬-벡터 곱)으로 계산합니다.
+    """
+    n_cols = x.shape[1]
+    if n_cols == 0:
+        return np.full(x.shape[0], np.nan)
+    filled = _fill(x)
+    weights = alpha * (1 - alpha) ** np.arange(n_cols - 1, -1, -1)
+    value = filled @ weights + filled[:, 0] * (1 - alpha) ** n_cols
+    return np.where(_valid_count(x) >= min_periods, value, np.nan)
+
+
+def rsi(close: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """최신 봉의 RSI (Wilder 평활)"""
+    diff = close - shift(close)
+    gain = ema(np.clip(diff, 0, None), 1 / period, min_periods=period)
+    loss = ema(np.clip(-diff, 0, None), 1 / period, min_periods=period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100 - 100 / (1 + gain / loss)
+    return np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), value)
+
+
+def macd(close: np.ndarray, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+    """최신 봉의 MACD 선, 시그널 선, 히스토그램"""
+    filled = _fill(close)
+    line = _ema_blocks(filled, 2 / (fast + 1)) - _ema_blocks(filled, 2 / (slow + 1))
+    line[_leading(close)] = np.nan
+    enough = _valid_count(close) >= slow + signal - 1
+    line_value = np.where(_valid_count(close) >= slow, line[:, -1], np.nan)
+    signal_value = np.where(enough, ema(line, 2 / (signal + 1)), np.nan)
+    return line_value, signal_value, line_value - signal_value
+
+
+def bollinger(close: np.ndarray, window: int = BOLLINGER_WINDOW, width: float = BOLLINGER_WIDTH):
+    """최신 봉의 볼린저 밴드 상단, 하단, %B"""
+    mean, std = _mean_std(close, window)
+    upper, lower = mean + width * std, mean - width * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_b = np.where(upper > lower, (close[:, -1] - lower) / (upper - lower), np.nan)
+    return upper, lower, percent_b
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = ATR_PERIOD) -> np.ndarray:
+    """최신 봉의 ATR (Wilder 평활, 첫 봉은 고가-저가)"""
+    prev_close = shift(close)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return ema(true_range, 1 / period, min_periods=period)
+
+
+def volume_zscore(volume: np.ndarray, window: int = VOLUME_Z_WINDOW) -> np.ndarray:
+    """최신 봉 거래량의 Z점수 (최근 window봉 평균·표준편차 대비)"""
+    mean, std = _mean_std(volume, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (volume[:, -1] - mean) / std, np.nan)
+
+
+def compute_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    (종목 수 × 봉 수) 배열로 전 종목의 최신 봉 지표를 한 번에 계산합니다.
+
+    Returns:
+        {지표 이름: 종목 수 길이의 1-D 배열} (계산할 수 없는 값은 NaN)
+    """
+    result = {"bars": _valid_count(close).astype("f8")}
+    if close.shape[1] == 0:
+        return result
+
+    for window in SMA_WINDOWS:
+        result[f"sma_{window}"] = sma(close, window)
+    result[f"ema_{EMA_SPAN}"] = ema(close, 2 / (EMA_SPAN + 1), min_periods=EMA_SPAN)
+    result[f"rsi_{RSI_PERIOD}"] = rsi(close)
+    result["macd"], result["macd_signal"], result["macd_hist"] = macd(close)
+    result["bb_upper"], result["bb_lower"], result["bb_percent_b"] = bollinger(close)
+
+    atr_values = atr(high, low, close)
+    result[f"atr_{ATR_PERIOD}"] = atr_values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["atr_pct"] = atr_values / close[:, -1] * 100
+
+    result[f"volume_z_{VOLUME_Z_WINDOW}"] = volume_zscore(volume)
+    return result
+
+
+def watchlist_indicators(stock_codes: List[str], interval: str = "1d") -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    로컬 저장소의 과거 시세로 여러 종목의 지표를 한 번에 계산합니다.
+
+    Returns:
+        {종목코드: {지표 이름: 값}} (저장된 봉이 없는 종목은 포함되지 않음, 계산할 수 없는 값은 None)
+    """
+    histories = {code: history_store.load(code, interval) for code in stock_codes}
+    histories = {code: bars for code, bars in histories.items() if len(bars)}
+    if not histories:
+        return {}
+
+    codes = list(histories)
+    length = min(INDICATOR_LOOKBACK, max(len(bars) for bars in histories.values()))
+    columns = {
+        column: align_right([histories[code][column] for code in codes], length)
+        for column in ("close", "high", "low", "volume")
+    }
+    values = compute_indicators(columns["close"], columns["high"], columns["low"], columns["volume"])
+
+    return {
+        code: {
+            name: (None if np.isnan(array[row]) else float(array[row]))
+            for name, array in values.items()
+        }
+        for row, code in enumerate(codes)
+    }
@@ -0,0 +1,127 @@
+"""
+종목별 과거 시세(OHLCV) 로컬 저장소
+종목·봉 간격마다 고정 길이 레코드(BAR_DTYPE)를 이어 쓴 바이너리 파일 하나를 두고,
+읽을 때는 NumPy memmap으로 파일 전체를 복사 없이 매핑합니다.
+새로 받은 봉은 겹치는 구간부터 덮어쓰며 덧붙이므로 기존 데이터는 다시 쓰지 않습니다.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.core.config import settings
+
+# 봉 레코드 (ts: 일봉은 거래일 00:00 UTC, 분봉은 봉 시작 시각의 epoch 초)
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+# 지원하는 봉 간격 (일봉, 1분봉)
+INTERVALS = ("1d", "1m")
+
+
+def empty_bars() -> np.ndarray:
+    return np.empty(0, dtype=BAR_DTYPE)
+
+
+def normalize_bars(bars: np.ndarray) -> np.ndarray:
+    """시각 순으로 정렬하고, 같은 시각의 봉은 마지막 것만 남깁니다."""
+    if len(bars) == 0:
+        return empty_bars()
+    bars = bars[np.argsort(bars["ts"], kind="stable")]
+    keep = np.append(bars["ts"][1:] != bars["ts"][:-1], True)
+    return bars[keep]
+
+
+class HistoryStore:
+    def __init__(self, root: str):
+        """
+        Args:
+            root: 저장 디렉토리 (봉 간격별 하위 디렉토리에 종목별 파일 생성)
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, code: str, interval: str = "1d") -> Path:
+        if interval not in INTERVALS:
+            raise ValueError(f"지원하지 않는 봉 간격입니다: {interval} (지원: {', '.join(INTERVALS)})")
+        return self.root / interval / f"{code.replace('/', '_')}.bin"
+
+    def load(self, code: str, interval: str = "1d") -> np.ndarray:
+        """
+        저장된 봉 전체를 읽기 전용 memmap으로 반환합니다. (저장된 봉이 없으면 빈 배열)
+        마지막 레코드가 쓰다 만 상태면 온전한 레코드까지만 매핑합니다.
+        """
+        path = self.path(code, interval)
+        try:
+            count = path.stat().st_size // BAR_DTYPE.itemsize
+        except FileNotFoundError:
+            return empty_bars()
+        if count == 0:
+            return empty_bars()
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+    def last_ts(self, code: str, interval: str = "1d") -> Optional[int]:
+        """마지막으로 저장된 봉의 시각 (없으면 None)"""
+        bars = self.load(code, interval)
+        return int(bars["ts"][-1]) if len(bars) else None
+
+    def merge(self, code: str, interval: str, bars: np.ndarray) -> int:
+        """
+        새로 받은 봉을 저장합니다. 저장된 봉과 시각이 겹치면 새 봉으로 교체합니다.
+
+        Returns:
+            저장 후 늘어난 봉 개수
+        """
+        bars = normalize_bars(np.asarray(bars, dtype=BAR_DTYPE))
+        if len(bars) == 0:
+            return 0
+
+        path = self.path(code, interval)
+        with self._lock:
+            existing = self.load(code, interval)
+            before = len(existing)
+            if before and bars["ts"][-1] < existing["ts"][-1]:
+                # 과거 구간 보충처럼 저장된 봉 사이에 끼워 넣는 경우는 전체를 다시 씀
+                merged = normalize_bars(np.concatenate([np.array(existing), bars]))
+                del existing
+                self._write(path, merged)
+                return len(merged) - before
+
+            # 일반적인 경우: 겹치는 첫 봉 위치부터 새 봉으로 덮어씀
+            # (파일이 줄어들면 다른 곳에서 열어 둔 memmap이 깨질 수 있으므로 남는 부분이 있을 때만 잘라냄)
+            cut = int(np.searchsorted(existing["ts"], bars["ts"][0])) if before else 0
+            del existing
+            path.parent.mkdir(parents=True, exist_ok=True)
+            end = (cut + len(bars)) * BAR_DTYPE.itemsize
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.seek(cut * BAR_DTYPE.itemsize)
+                f.write(bars.tobytes())
+                if f.seek(0, os.SEEK_END) > end:
+                    f.truncate(end)
+            return cut + len(bars) - before
+
+    def replace(self, code: str, interval: str, bars: np.ndarray):
+        """저장된 봉을 모두 새 봉으로 교체합니다. (수정주가 반영 등 전체 재수집 시)"""
+        with self._lock:
+            self._write(self.path(code, interval), normalize_bars(np.asarray(bars, dtype=BAR_DTYPE)))
+
+    @staticmethod
+    def _write(path: Path, bars: np.ndarray):
+        # 임시 파일에 쓴 뒤 교체해 중간에 중단되어도 기존 파일이 깨지지 않도록 함
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(bars.tobytes())
+        os.replace(tmp_path, path)
+
+
+# 전역 과거 시세 저장소 인스턴스
+history_store = HistoryStore(settings.HISTORY_DIR)
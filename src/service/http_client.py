@@ -0,0 +1,263 @@
+"""
+공용 HTTP 클라이언트
+모든 HTTP 호출(한국투자증권, Yahoo Finance, 증권사 추천 페이지 등)이 커넥션 풀을 공유해
+호스트마다 TCP/TLS 연결을 재사용(keep-alive)합니다.
+기본 타임아웃, 지터를 준 지수 백오프 재시도, 호스트별 서킷 브레이커와 호출 통계를 제공하며
+h2 패키지가 설치되어 있으면 HTTP/2를 사용합니다.
+"""
+import asyncio
+import atexit
+import importlib.util
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.config import settings
+from src.service.resilience import CircuitBreaker, LatencyBudget, backoff, get_breaker, source_of
+
+# 일시적인 오류로 보고 재시도할 응답 코드
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# 재시도 후에도 이 응답이면 소스 장애로 보고 서킷 브레이커에 실패로 기록 (429는 한도 초과일 뿐이므로 제외)
+FAILURE_STATUS_CODES = {502, 503, 504}
+
+# h2 패키지가 있을 때만 HTTP/2 사용 (없으면 HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+# 이벤트 루프별 비동기 클라이언트 (AsyncClient는 생성된 루프에서만 사용 가능)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+class TokenBucket:
+    """
+    초당 요청 수를 제한하는 토큰 버킷
+    요청마다 토큰 하나를 예약하고, 토큰이 모자라면 채워질 때까지 기다립니다.
+    예약 계산만 락으로 보호하므로 여러 스레드/이벤트 루프에서 함께 사용할 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            capacity: 한 번에 몰아서 보낼 수 있는 최대 요청 수 (1이면 요청 간격을 균등하게 유지)
+        """
+        self.rate = max(rate, 0.1)
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+@dataclass
+class HostMetrics:
+    """호스트별 호출 통계"""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_seconds / self.requests * 1000 if self.requests else 0.0
+
+
+_metrics: dict[str, HostMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def _client_options() -> dict:
+    # httpx 커넥션 풀은 호스트(origin)별로 연결을 보관하고, 전체 연결 수만 제한
+    return {
+        "timeout": httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+        ),
+        "http2": HTTP2_AVAILABLE,
+        "follow_redirects": True,
+    }
+
+
+def get_client() -> httpx.Client:
+    """프로세스 전체에서 공유하는 동기 클라이언트 (스레드 안전)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 공유하는 비동기 클라이언트"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_options())
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_client():
+    """현재 이벤트 루프의 비동기 클라이언트를 닫습니다. (asyncio.run 종료 전에 호출)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@atexit.register
+def close_client():
+    """동기 클라이언트를 닫습니다. (프로세스 종료 시 자동 호출)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _record(url, elapsed: float, error: bool = False, retry: bool = False):
+    host = urlsplit(str(url)).netloc
+    with _metrics_lock:
+        metrics = _metrics.setdefault(host, HostMetrics())
+        if retry:
+            metrics.retries += 1
+            return
+        metrics.requests += 1
+        metrics.total_seconds += elapsed
+        if error:
+            metrics.errors += 1
+
+
+def get_metrics() -> dict[str, dict]:
+    """호스트별 호출 통계 스냅샷 {호스트: {requests, errors, retries, total_seconds, avg_ms}}"""
+    with _metrics_lock:
+        return {
+            host: {**asdict(metrics), "avg_ms": round(metrics.avg_ms, 1)}
+            for host, metrics in _metrics.items()
+        }
+
+
+def _settle(breaker: CircuitBreaker, status_code: int):
+    # 최종 응답으로 서킷 브레이커 상태 갱신 (429는 성공·실패 어느 쪽으로도 보지 않음)
+    if status_code in FAILURE_STATUS_CODES:
+        breaker.record_failure()
+    elif status_code == 429:
+        breaker.release()
+    else:
+        breaker.record_success()
+
+
+def _last_attempt(attempt: int, retries: int, budget: Optional[LatencyBudget], delay: float) -> bool:
+    # 재시도 횟수를 다 썼거나, 백오프 후 지연 예산이 남지 않으면 마지막 시도
+    return attempt >= retries or (budget is not None and not budget.allows(delay))
+
+
+def request(method: str, url: str, retries: Optional[int] = None,
+            limiter: Optional[TokenBucket] = None, budget: Optional[LatencyBudget] = None,
+            **kwargs) -> httpx.Response:
+    """
+    공용 동기 클라이언트로 요청을 보냅니다.
+    연결 오류/타임아웃과 429·502·503·504 응답은 재시도하고, 마지막 응답(또는 예외)을 그대로 돌려줍니다.
+    호스트가 연속으로 실패해 차단 중이면 요청하지 않고 바로 CircuitOpenError를 발생시킵니다.
+    limiter를 넘기면 재시도를 포함한 매 요청마다 토큰을 하나씩 사용합니다.
+    budget을 넘기면 타임아웃을 남은 시간 안으로 줄이고, 남은 시간이 없으면 재시도하지 않습니다.
+    나머지 인자는 httpx.Client.request와 같습니다.
+    """
+    retries = settings.HTTP_RETRIES if retries is None else retries
+    client = get_client()
+    breaker = get_breaker(source_of(url))
+    breaker.check()
+
+    try:
+        for attempt in range(retries + 1):
+            if limiter:
+                limiter.acquire_sync()
+            if budget:
+                kwargs["timeout"] = budget.cap(settings.HTTP_TIMEOUT)
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                _record(url, time.perf_counter() - started, error=True)
+                delay = backoff(attempt)
+                if _last_attempt(attempt, retries, budget, delay):
+                    breaker.record_failure()
+                    raise
+            else:
+                _record(url, time.perf_counter() - started, error=response.status_code >= 400)
+                delay = backoff(attempt)
+                if response.status_code not in RETRY_STATUS_CODES or _last_attempt(attempt, retries, budget, delay):
+                    _settle(breaker, response.status_code)
+                    return response
+
+            _record(url, 0.0, retry=True)
+            time.sleep(delay)
+    finally:
+        # 예상하지 못한 예외로 끝난 시험 호출 자리 반납 (이미 판정된 경우에는 영향 없음)
+        breaker.release()
+
+
+async def arequest(method: str, url: str, retries: Optional[int] = None,
+                   client: Optional[httpx.AsyncClient] = None,
+                   limiter: Optional[TokenBucket] = None, budget: Optional[LatencyBudget] = None,
+                   **kwargs) -> httpx.Response:
+    """
+    request의 비동기 버전. client를 넘기지 않으면 현재 이벤트 루프의 공용 클라이언트를 사용합니다.
+    """
+    retries = settings.HTTP_RETRIES if retries is None else retries
+    client = client or get_async_client()
+    breaker = get_breaker(source_of(url))
+    breaker.check()
+
+    try:
+        for attempt in range(retries + 1):
+            if limiter:
+                await limiter.acquire()
+            if budget:
+                kwargs["timeout"] = budget.cap(settings.HTTP_TIMEOUT)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                _record(url, time.perf_counter() - started, error=True)
+                delay = backoff(attempt)
+                if _last_attempt(attempt, retries, budget, delay):
+                    breaker.record_failure()
+                    raise
+            else:
+                _record(url, time.perf_counter() - started, error=response.status_code >= 400)
+                delay = backoff(attempt)
+                if response.status_code not in RETRY_STATUS_CODES or _last_attempt(attempt, retries, budget, delay):
+                    _settle(breaker, response.status_code)
+                    return response
+
+            _record(url, 0.0, retry=True)
+            await asyncio.sleep(delay)
+    finally:
+        breaker.release()
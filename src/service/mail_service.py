@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional
 import re
 
+from src.core.records import Quote, SymbolReport
+
 class EmailService:
     def __init__(self):
         self.smtp_server = "smtp.gmail.com"
@@ -14,15 +16,14 @@ class EmailService:
         self.sender_password = os.getenv('SENDER_PASSWORD')
         self.recipient_email = os.getenv('RECIPIENT_EMAIL')
         
-    def send_analysis_report(self, final_analyzed_data: str, proposed_data: str = "", stock_data: str = "", scraped_data: str = "", proposed_domestic_data: str = "", proposed_worldwide_data: str = "") -> bool:
+    def send_analysis_report(self, final_analyzed_data: str, proposed_data: str = "", symbol_reports: Optional[dict[str, SymbolReport]] = None, proposed_domestic_data: str = "", proposed_worldwide_data: str = "") -> bool:
         """
         분석 결과를 이메일로 전송합니다.
         
         Args:
             final_analyzed_data: 최종 분석 결과
             proposed_data: 추천 종목 데이터
-            stock_data: 주식 데이터 (선택사항)
-            scraped_data: 스크랩된 뉴스 데이터 (선택사항)
+            symbol_reports: 관심 종목별 수집 결과 {종목코드(종목명): SymbolReport} (선택사항)
             proposed_domestic_data: 국내 추천 종목 데이터 (선택사항)
             proposed_worldwide_data: 해외 추천 종목 데이터 (선택사항)
             
@@ -42,8 +43,9 @@ class EmailService:
             msg['Subject'] = f"📊 주식 시장 분석 보고서 - {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}"
             
             # HTML 이메일 본문 생성
-            html_body = self._create_html_email_body(final_analyzed_data, proposed_data, stock_data, scraped_data, proposed_domestic_data, proposed_worldwide_data)
-            text_body = self._create_text_email_body(final_analyzed_data, proposed_data, stock_data, scraped_data, proposed_domestic_data, proposed_worldwide_data)
+            reports = list((symbol_reports or {}).values())
+            html_body = self._create_html_email_body(final_analyzed_data, proposed_data, reports, proposed_domestic_data, proposed_worldwide_data)
+            text_body = self._create_text_email_body(final_analyzed_data, proposed_data, reports, proposed_domestic_data, proposed_worldwide_data)
             
             # HTML과 텍스트 버전 모두 첨부
             msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
@@ -62,12 +64,13 @@ class EmailService:
             print(f"❌ 이메일 전송 실패: {str(e)}")
             return False
     
-    def _create_html_email_body(self, final_analyzed_data: str, proposed_data: str, stock_data: str, scraped_data: str, proposed_domestic_data: str, proposed_worldwide_data: str) -> str:
+    def _create_html_email_body(self, final_analyzed_data: str, proposed_data: str, reports: list[SymbolReport], proposed_domestic_data: str, proposed_worldwide_data: str) -> str:
         """
         HTML 형식의 이메일 본문을 생성합니다.
         """
         # 분석 데이터를 HTML로 변환
         html_analysis = self._convert_analysis_to_html(final_analyzed_data)
+        html_quotes = self._convert_quotes_to_html(reports) if reports else ""
         html_proposed = self._convert_proposed_to_html(proposed_data) if proposed_data else ""
         html_domestic = self._convert_raw_data_to_html(proposed_domestic_data, "🇰🇷 국내 추천 종목") if proposed_domestic_data else ""
         html_worldwide = self._convert_raw_data_to_html(proposed_worldwide_data, "🌍 해외 추천 종목") if proposed_worldwide_data else ""
@@ -90,6 +93,8 @@ class EmailService:
         <div style="padding: 30px;">
             {html_analysis}
             
+            {html_quotes}
+            
             {html_proposed}
             
             {html_domestic}
@@ -163,6 +168,57 @@ class EmailService:
         
         return '\n'.join(html_sections)
     
+    def _convert_quotes_to_html(self, reports: list[SymbolReport]) -> str:
+        """
+        관심 종목 현재가를 HTML 표로 변환합니다.
+        """
+        rows = []
+        for report in reports:
+            price, change_rate, volume = self._format_quote(report.quote)
+            if report.quote and report.quote.change_rate:
+                color = "#e74c3c" if report.quote.change_rate > 0 else "#3498db"
+            else:
+                color = "#333"
+            rows.append(f"""
+                <tr>
+                    <td style="padding: 8px; border-bottom: 1px solid #dee2e6;">{report.name} <span style="color: #7f8c8d; font-size: 12px;">({report.code})</span></td>
+                    <td style="padding: 8px; border-bottom: 1px solid #dee2e6; text-align: right;">{price}</td>
+                    <td style="padding: 8px; border-bottom: 1px solid #dee2e6; text-align: right; color: {color};">{change_rate}</td>
+                    <td style="padding: 8px; border-bottom: 1px solid #dee2e6; text-align: right;">{volume}</td>
+                    <td style="padding: 8px; border-bottom: 1px solid #dee2e6; text-align: right;">{len(report.news)}</td>
+                </tr>""")
+
+        return f"""
+            <div style="margin-bottom: 30px;">
+                <div style="color: #2c3e50; font-size: 20px; font-weight: 600; margin-bottom: 15px; padding-bottom: 10px; border-bottom: 2px solid #3498db;">
+                    💹 관심 종목 현황
+                </div>
+                <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
+                    <tr style="background-color: #f8f9fa;">
+                        <th style="padding: 8px; text-align: left;">종목</th>
+                        <th style="padding: 8px; text-align: right;">현재가</th>
+                        <th style="padding: 8px; text-align: right;">등락률</th>
+                        <th style="padding: 8px; text-align: right;">거래량</th>
+                        <th style="padding: 8px; text-align: right;">뉴스</th>
+                    </tr>{''.join(rows)}
+                </table>
+            </div>
+            """
+
+    def _format_quote(self, quote: Optional[Quote]) -> tuple[str, str, str]:
+        """
+        현재가/등락률/거래량을 표시용 문자열로 변환합니다.
+        """
+        if not quote or quote.price is None:
+            return "-", "-", "-"
+        if quote.market == "domestic":
+            price = f"{quote.price:,.0f}원"
+        else:
+            price = f"{quote.price:,.2f} {quote.currency}" if quote.currency else f"{quote.price:,.2f}"
+        change_rate = f"{quote.change_rate:+.2f}%" if quote.change_rate is not None else "-"
+        volume = f"{quote.volume:,}" if quote.volume is not None else "-"
+        return price, change_rate, volume
+
     def _convert_proposed_to_html(self, proposed_data: str) -> str:
         """
         추천 종목 데이터를 HTML로 변환합니다.
@@ -349,7 +405,7 @@ class EmailService:
         
         return f'<div style="margin-bottom: 20px; padding: 15px; background-color: #f8f9fa; border-radius: 8px; border-left: 4px solid #3498db;">{html}</div>'
     
-    def _create_text_email_body(self, final_analyzed_data: str, proposed_data: str, stock_data: str, scraped_data: str, proposed_domestic_data: str, proposed_worldwide_data: str) -> str:
+    def _create_text_email_body(self, final_analyzed_data: str, proposed_data: str, reports: list[SymbolReport], proposed_domestic_data: str, proposed_worldwide_data: str) -> str:
         """
         텍스트 형식의 이메일 본문을 생성합니다 (HTML을 지원하지 않는 클라이언트용).
         """
@@ -363,6 +419,20 @@ class EmailService:
 {'='*50}
 {final_analyzed_data}
 
+"""
+        
+        if reports:
+            lines = []
+            for report in reports:
+                price, change_rate, volume = self._format_quote(report.quote)
+                lines.append(f"{report.key}: {price} ({change_rate}), 거래량 {volume}, 뉴스 {len(report.news)}건")
+            quote_lines = "\n".join(lines)
+            body += f"""
+{'='*50}
+💹 관심 종목 현황
+{'='*50}
+{quote_lines}
+
 """
         
         if proposed_data:
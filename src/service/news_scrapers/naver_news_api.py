@@ -0,0 +1,146 @@
+"""
+네이버 증권 종목 뉴스 JSON API 수집 (브라우저 없이 HTTP로만 수집)
+m.stock.naver.com 모바일 뉴스 페이지가 내부적으로 호출하는 JSON API를 페이지 단위로 직접 조회해
+Selenium 스크래퍼(naver_scraper)와 같은 {'title', 'content'} 형태로 반환합니다.
+응답 형식이 예상과 다르면 NewsApiShapeError를 발생시키고, 호출하는 쪽에서 Selenium 수집으로 대체합니다.
+"""
+import html
+import re
+from typing import Any, Container, List, Optional, Set
+
+from src.service import http_client
+from src.service.news_scrapers.seen_store import article_key
+from src.service.resilience import LatencyBudget
+
+NAVER_NEWS_API_URL = "https://m.stock.naver.com/api/news/stock/{code}"
+NAVER_NEWS_PAGE_SIZE = 20
+# 키워드 필터로 걸러지는 기사가 많아도 이 페이지 수까지만 조회
+NAVER_NEWS_MAX_PAGES = 5
+NAVER_NEWS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                  "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+    "Accept": "application/json",
+}
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+class NewsApiShapeError(ValueError):
+    """뉴스 API 주소나 응답 형식이 바뀌어 파싱할 수 없는 경우"""
+
+
+def _clean(text: Any) -> str:
+    """HTML 태그·엔티티를 제거하고 공백을 정리합니다."""
+    text = html.unescape(_TAG_PATTERN.sub(" ", str(text or "")))
+    return _SPACE_PATTERN.sub(" ", text).strip()
+
+
+def parse_news_page(payload: Any) -> List[dict]:
+    """
+    뉴스 API 응답 한 페이지를 기사 목록으로 변환합니다.
+    응답은 관련 기사 묶음의 배열이고, 묶음마다 items에 기사(title, body)가 들어 있습니다.
+
+    Raises:
+        NewsApiShapeError: 응답 구조가 예상과 다른 경우
+    """
+    if not isinstance(payload, list):
+        raise NewsApiShapeError(f"응답이 배열이 아닙니다: {type(payload).__name__}")
+
+    articles = []
+    for group in payload:
+        items = group.get("items") if isinstance(group, dict) else None
+        if not isinstance(items, list):
+            raise NewsApiShapeError("기사 묶음에 items 배열이 없습니다.")
+        for item in items:
+            if not isinstance(item, dict) or "title" not in item:
+                raise NewsApiShapeError("기사에 title 항목이 없습니다.")
+            articles.append({"title": _clean(item["title"]), "content": _clean(item.get("body"))})
+    return articles
+
+
+def _request_args(stock_code: str, page: int) -> dict:
+    return {
+        "headers": {**NAVER_NEWS_HEADERS, "Referer": f"https://m.stock.naver.com/domestic/stock/{stock_code}/news"},
+        "params": {"pageSize": NAVER_NEWS_PAGE_SIZE, "page": page},
+    }
+
+
+def _page_articles(response) -> List[dict]:
+    """응답을 검사하고 기사 목록으로 변환합니다. (주소가 사라졌거나 JSON이 아니면 형식 변경으로 봄)"""
+    if response.status_code == 404:
+        raise NewsApiShapeError("뉴스 API 주소를 찾을 수 없습니다 (404).")
+    response.raise_for_status()
+    try:
+        payload = response.json()
+    except ValueError as e:
+        raise NewsApiShapeError(f"JSON 응답이 아닙니다: {e}") from e
+    return parse_news_page(payload)
+
+
+def _collect(articles: List[dict], seen: Set[str], page_articles: List[dict], keyword: str, max_count: int,
+             known: Optional[Container[str]] = None) -> bool:
+    """
+    한 페이지의 기사를 중복 없이 키워드로 걸러 담고, 더 조회할 필요가 없으면 True를 반환합니다.
+    known(이전 실행에서 수집한 기사 키)에 있는 기사에 닿으면 그 뒤는 모두 수집한 기사이므로 멈춥니다.
+    """
+    if not page_articles:
+        return True
+    for article in page_articles:
+        if known and article_key(article) in known:
+            return True
+        unique_key = article["title"] + article["content"]
+        if unique_key in seen:
+            continue
+        seen.add(unique_key)
+        if keyword in article["title"] or keyword in article["content"]:
+            articles.append(article)
+            if len(articles) >= max_count:
+                return True
+    return len(page_articles) < NAVER_NEWS_PAGE_SIZE
+
+
+def fetch_naver_stock_news(stock_code: str, keyword: str = "", max_count: int = 20,
+                           budget: Optional[LatencyBudget] = None,
+                           known: Optional[Container[str]] = None) -> List[dict]:
+    """
+    네이버 증권 뉴스 API에서 keyword가 제목 또는 내용에 포함된 기사를 최대 max_count개까지 수집합니다.
+    known을 넘기면 그 안의 기사(이전 실행에서 수집한 기사)에 닿는 즉시 수집을 멈춥니다.
+
+    Raises:
+        NewsApiShapeError: API 형식이 바뀐 경우 (Selenium 수집으로 대체)
+        CircuitOpenError, httpx.HTTPError: 네이버가 응답하지 않는 경우
+    """
+    budget = budget or LatencyBudget()
+    url = NAVER_NEWS_API_URL.format(code=stock_code)
+    articles, seen = [], set()
+    for page in range(1, NAVER_NEWS_MAX_PAGES + 1):
+        response = http_client.request("GET", url, budget=budget, **_request_args(stock_code, page))
+        if _collect(articles, seen, _page_articles(response), keyword, max_count, known) or budget.expired:
+            break
+    return articles
+
+
+async def afetch_naver_stock_news(stock_code: str, keyword: str = "", max_count: int = 20,
+                                  budget: Optional[LatencyBudget] = None,
+                                  known: Optional[Container[str]] = None) -> List[dict]:
+    """fetch_naver_stock_news의 비동기 버전 (공용 비동기 클라이언트의 커넥션을 재사용)"""
+    budget = budget or LatencyBudget()
+    url = NAVER_NEWS_API_URL.format(code=stock_code)
+    articles, seen = [], set()
+    for page in range(1, NAVER_NEWS_MAX_PAGES + 1):
+        response = await http_client.arequest("GET", url, budget=budget, **_request_args(stock_code, page))
+        if _collect(articles, seen, _page_articles(response), keyword, max_count, known) or budget.expired:
+            break
+    return articles
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    started = time.perf_counter()
+    news = fetch_naver_stock_news(sys.argv[1] if len(sys.argv) > 1 else "005930", max_count=10)
+    for article in news:
+        print(f"- {article['title']}")
+    print(f"{len(news)}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
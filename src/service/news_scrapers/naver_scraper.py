@@ -4,42 +4,48 @@ from urllib.parse import urljoin
 import time
 from datetime import datetime
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+from typing import Container, Optional
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-def scroll_down(driver, pause_time=2):
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(pause_time)
-    new_height = driver.execute_script("return document.body.scrollHeight")
-    return new_height != last_height
+from src.service.browser import browser_pool, load_page, scroll_and_wait
+from src.service.news_scrapers.naver_news_api import NewsApiShapeError, fetch_naver_stock_news
+from src.service.news_scrapers.seen_store import article_key
+from src.service.resilience import LatencyBudget, ensure_available, get_breaker
 
-def scrape_naver_stock_news_filtered(stock_code: str, keyword: str, max_count: int = 20) -> list[dict]:
+# 뉴스 항목 선택자
+NEWS_ITEM_SELECTOR = 'div.NewsList_inner__kSzOg'
+
+def scrape_naver_stock_news_filtered(stock_code: str, keyword: str, max_count: int = 20,
+                                     known: Optional[Container[str]] = None) -> list[dict]:
     """
     Selenium을 사용해 네이버 모바일 주식 뉴스 페이지에서 뉴스 기사 중 keyword가 제목 또는 내용에 포함된 것만 최대 max_count개까지 수집 (무한 스크롤 지원)
+    브라우저는 공용 브라우저 풀에서 빌려 쓰고 돌려줍니다.
+    네이버가 연속으로 응답하지 않으면 브라우저를 띄우지 않고 바로 CircuitOpenError를 발생시키며,
+    전체 수집 시간은 지연 예산(SCRAPE_BUDGET) 안으로 제한합니다.
+    known(이전 실행에서 수집한 기사 키)을 넘기면 그 안의 기사에 닿는 즉시 수집을 멈춥니다.
     """
     url = f"https://m.stock.naver.com/domestic/stock/{stock_code}/news"
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    ensure_available(url)
 
     all_articles = []
     seen = set()
-    try:
-        driver.get(url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'div.NewsList_inner__kSzOg'))
-        )
-        while len(all_articles) < max_count:
-            news_items = driver.find_elements(By.CSS_SELECTOR, 'div.NewsList_inner__kSzOg')
+    reached_known = False
+    with browser_pool.session() as driver:
+        budget = LatencyBudget()
+        load_page(driver, url, budget)
+        try:
+            WebDriverWait(driver, budget.cap(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, NEWS_ITEM_SELECTOR))
+            )
+        except TimeoutException:
+            # 페이지는 열렸지만 뉴스 목록이 나타나지 않음 (오류 페이지 등) → 소스 실패로 기록
+            get_breaker(url).record_failure()
+            raise
+        while len(all_articles) < max_count and not budget.expired and not reached_known:
+            news_items = driver.find_elements(By.CSS_SELECTOR, NEWS_ITEM_SELECTOR)
             for item in news_items:
                 try:
                     title = item.find_element(By.CSS_SELECTOR, 'p.NewsList_title__JKIWC').text.strip()
@@ -53,6 +59,10 @@ def scrape_naver_stock_news_filtered(stock_code: str, keyword: str, max_count: i
                             content = content_elem.get_attribute('textContent').strip()
                     except:
                         pass
+                    # 이전 실행에서 수집한 기사에 닿으면 그 뒤는 모두 수집한 기사
+                    if known and article_key({'title': title, 'content': content}) in known:
+                        reached_known = True
+                        break
                     # 중복 방지
                     unique_key = title + content
                     if unique_key in seen:
@@ -64,14 +74,12 @@ def scrape_naver_stock_news_filtered(stock_code: str, keyword: str, max_count: i
                             break
                 except Exception as e:
                     continue
-            if len(all_articles) >= max_count:
+            if len(all_articles) >= max_count or reached_known:
                 break
-            # 스크롤 다운
-            changed = scroll_down(driver)
+            # 스크롤 다운 (새 뉴스가 붙는 즉시 진행, 붙지 않으면 더 없는 것으로 봄)
+            changed = scroll_and_wait(driver, NEWS_ITEM_SELECTOR, budget=budget)
             if not changed:
                 break
-    finally:
-        driver.quit()
     return all_articles
 
 def scrape_stock_domestic_news(
@@ -107,12 +115,16 @@ def scrape_stock_domestic_news(
         print(f"\n[{i}/{len(stock_info)}] {stock_code}({stock_name}) 뉴스 수집 중...")
 
         try:
-            # 네이버 주식 뉴스 수집
-            news_list = scrape_naver_stock_news_filtered(
-                stock_code=stock_code,
-                keyword=keyword,
-                max_count=max_count_per_stock
-            )
+            # 네이버 주식 뉴스 수집 (뉴스 API 형식이 바뀌었으면 브라우저로 수집)
+            try:
+                news_list = fetch_naver_stock_news(stock_code, keyword=keyword, max_count=max_count_per_stock)
+            except NewsApiShapeError as e:
+                print(f"  ⚠️  네이버 뉴스 API 형식 변경, 브라우저로 수집합니다: {str(e)}")
+                news_list = scrape_naver_stock_news_filtered(
+                    stock_code=stock_code,
+                    keyword=keyword,
+                    max_count=max_count_per_stock
+                )
 
             # 종목코드(종목명) 형태로 키 생성 - UTF-8 인코딩 보장
             key = f"{stock_code}({stock_name})"
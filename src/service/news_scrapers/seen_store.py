@@ -0,0 +1,170 @@
+"""
+이미 수집한 뉴스 기사 저장소 (SQLite)
+종목별로 수집한 기사의 키(정규화한 링크 또는 제목의 해시)와 마지막 수집 지점(워터마크)을 보관해
+다음 실행에서는 이미 본 기사에 닿는 즉시 수집을 멈추고 새 기사만 넘깁니다.
+뉴스 목록은 최신순이므로 이미 본 기사 이후는 모두 이전 실행에서 수집한 기사입니다.
+새 기사가 없는 흔한 경우는 첫 기사와 워터마크만 비교하고 끝나므로, 전체 기사 키는 필요할 때만 읽습니다.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
+
+from src.core.config import settings
+
+_PUNCTUATION_PATTERN = re.compile(r"[^\w]+")
+
+
+def normalize_link(link: str) -> str:
+    """추적용 쿼리·프래그먼트와 끝의 /를 떼고 호스트를 소문자로 바꾼 링크"""
+    parts = urlsplit(link.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+def normalize_title(title: str) -> str:
+    """전각/반각·대소문자·공백·문장부호 차이를 없앤 제목"""
+    return _PUNCTUATION_PATTERN.sub("", unicodedata.normalize("NFKC", title).casefold())
+
+
+def article_key(article: dict) -> str:
+    """기사 식별 키 (링크가 있으면 정규화한 링크, 없으면 정규화한 제목의 해시)"""
+    link = article.get("link") or ""
+    basis = f"link:{normalize_link(link)}" if link else f"title:{normalize_title(article.get('title') or '')}"
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:20]
+
+
+class KnownArticles:
+    """
+    종목의 이미 수집한 기사 키 (스크래퍼의 known 인자로 넘김, `key in known`으로 확인)
+    워터마크(가장 최근 기사 키)와 먼저 비교하고, 다른 기사일 때만 전체 키 집합을 처음 한 번 읽습니다.
+    수집 기록이 없으면 거짓으로 평가되어 전체 수집합니다.
+    """
+
+    def __init__(self, store: "SeenArticleStore", symbol: str):
+        self._store = store
+        self._symbol = symbol
+        watermark = store.watermark(symbol)
+        self.newest_key: Optional[str] = watermark["newest_key"] if watermark else None
+        self._keys: Optional[Set[str]] = None
+
+    def __contains__(self, key: str) -> bool:
+        if self.newest_key is None:
+            return False
+        if key == self.newest_key:
+            return True
+        if self._keys is None:
+            self._keys = self._store.seen_keys(self._symbol)
+        return key in self._keys
+
+    def __bool__(self) -> bool:
+        return self.newest_key is not None
+
+
+class SeenArticleStore:
+    def __init__(self, db_path: Optional[str] = None, retention_days: float = 30):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 프로세스 메모리에만 보관)
+            retention_days: 기사 키를 보관할 기간 (일, 지나면 삭제)
+        """
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path or ":memory:", check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_articles ("
+                "symbol TEXT NOT NULL, key TEXT NOT NULL, first_seen REAL NOT NULL, PRIMARY KEY (symbol, key))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_watermarks ("
+                "symbol TEXT PRIMARY KEY, newest_key TEXT NOT NULL, crawled_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM seen_articles WHERE first_seen < ?", (time.time() - self.retention_days * 86400,)
+            )
+            self._conn.commit()
+        return self._conn
+
+    def seen_keys(self, symbol: str) -> Set[str]:
+        """종목의 이미 수집한 기사 키 집합 (조회 실패 시 빈 집합 - 전체 수집)"""
+        with self._lock:
+            try:
+                rows = self._db().execute("SELECT key FROM seen_articles WHERE symbol = ?", (symbol,)).fetchall()
+            except sqlite3.Error as e:
+                print(f"수집 기사 저장소 조회 실패: {e}")
+                return set()
+        return {row[0] for row in rows}
+
+    def known(self, symbol: str) -> KnownArticles:
+        """스크래퍼의 중단 조건에 넘길 종목의 이미 수집한 기사 키 (워터마크 우선 비교)"""
+        return KnownArticles(self, symbol)
+
+    def watermark(self, symbol: str) -> Optional[Dict[str, float | str]]:
+        """마지막 수집 지점 {'newest_key': 가장 최근 기사 키, 'crawled_at': 수집 시각} (없으면 None)"""
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    "SELECT newest_key, crawled_at FROM crawl_watermarks WHERE symbol = ?", (symbol,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"수집 기사 저장소 조회 실패: {e}")
+                return None
+        return {"newest_key": row[0], "crawled_at": row[1]} if row else None
+
+    def mark(self, symbol: str, articles: Iterable[dict]):
+        """
+        새로 수집한 기사를 기록하고 워터마크를 가장 최근 기사로 옮깁니다. (articles는 최신순)
+        새 기사가 없으면 수집 시각만 갱신합니다.
+        """
+        keys = [article_key(article) for article in articles]
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._db()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO seen_articles (symbol, key, first_seen) VALUES (?, ?, ?)",
+                    [(symbol, key, now) for key in keys],
+                )
+                if keys:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO crawl_watermarks (symbol, newest_key, crawled_at) VALUES (?, ?, ?)",
+                        (symbol, keys[0], now),
+                    )
+                else:
+                    conn.execute("UPDATE crawl_watermarks SET crawled_at = ? WHERE symbol = ?", (now, symbol))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"수집 기사 저장소 기록 실패: {e}")
+
+    def forget(self, symbol: Optional[str] = None):
+        """종목(없으면 전체)의 수집 기록을 지웁니다. (다음 실행에서 처음부터 다시 수집)"""
+        with self._lock:
+            try:
+                conn = self._db()
+                if symbol is None:
+                    conn.execute("DELETE FROM seen_articles")
+                    conn.execute("DELETE FROM crawl_watermarks")
+                else:
+                    conn.execute("DELETE FROM seen_articles WHERE symbol = ?", (symbol,))
+                    conn.execute("DELETE FROM crawl_watermarks WHERE symbol = ?", (symbol,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"수집 기사 저장소 초기화 실패: {e}")
+
+
+# 전역 수집 기사 저장소 (SQLite 파일은 처음 사용할 때 엶)
+news_seen_store = SeenArticleStore(
+    db_path=settings.NEWS_SEEN_DB_PATH or None,
+    retention_days=settings.NEWS_SEEN_RETENTION_DAYS,
+)
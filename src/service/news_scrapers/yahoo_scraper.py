@@ -4,112 +4,221 @@ from urllib.parse import urljoin
 import time
 from datetime import datetime
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os
 import sys
+import hashlib
+import importlib.util
+import re
+from dataclasses import dataclass
+from typing import Container, Dict, List, Optional
 
-def create_driver():
+from src.service.browser import browser_pool, load_page, scroll_and_wait
+from src.service.news_scrapers.seen_store import article_key
+from src.service.resilience import LatencyBudget, ensure_available, get_breaker
+
+# 헤드리스 Chrome 기본 User-Agent(HeadlessChrome) 대신 사용할 데스크톱 User-Agent
+YAHOO_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 페이지 소스 파서 (lxml이 설치되어 있으면 더 빠른 lxml 사용)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# 뉴스 항목 후보 선택자 (앞에서부터 시도)
+NEWS_SELECTORS = [
+    'li.stream-item.story-item',
+    'div[data-testid="storyitem"]',
+    'a[data-ylk*="elm:hdln"]',
+    'div[data-test-id="news-item"]',
+    '.news-item',
+    'article',
+    '.news-list-item',
+    '[data-test-id="news-list"] > div',
+    '.news-card',
+    '.article-item',
+    'div[class*="news"]',
+    'div[class*="article"]'
+]
+
+# 제목 후보 선택자 (Yahoo Finance 실제 구조 → 일반적인 구조 순)
+TITLE_SELECTORS = [
+    'h3.clamp',  # Yahoo Finance 실제 제목 클래스
+    'h3.yf-10mgn4g',  # Yahoo Finance 제목 클래스
+    'h3',
+    'h4', 'h2', 'h1',
+    '.news-title', '[data-test-id="news-title"]',
+    '.title', '.headline', '.article-title',
+    'a[class*="title"]', 'span[class*="title"]',
+    'div[class*="title"]'
+]
+
+# 내용 후보 선택자
+CONTENT_SELECTORS = [
+    'p.clamp',  # Yahoo Finance 실제 내용 클래스
+    'p.yf-10mgn4g',  # Yahoo Finance 내용 클래스
+    'p',
+    '.news-summary', '[data-test-id="news-summary"]',
+    '.summary', '.description', '.content',
+    'div[class*="summary"]', 'div[class*="content"]',
+    'span[class*="summary"]', 'span[class*="content"]'
+]
+
+# 의미 있는 제목/내용으로 보는 최소 길이
+MIN_TITLE_LENGTH = 5
+MIN_CONTENT_LENGTH = 10
+
+# Yahoo Finance 빌드마다 바뀌는 CSS 클래스 (yf-xxxxxxx) → 레이아웃 버전 식별에 사용
+_LAYOUT_CLASS_PATTERN = re.compile(r"\byf-[0-9a-z]{5,10}\b")
+
+
+@dataclass(frozen=True, slots=True)
+class NewsLayout:
+    """레이아웃 버전별로 한 번 확정한 선택자 (제목/내용을 찾지 못한 경우 None)"""
+    item: str
+    title: Optional[str]
+    content: Optional[str]
+
+
+# {레이아웃 지문: 확정한 선택자}
+_layouts: Dict[str, NewsLayout] = {}
+
+
+def layout_fingerprint(page_source: str) -> str:
+    """페이지에 쓰인 Yahoo 빌드 클래스 집합으로 레이아웃 버전 지문을 만듭니다."""
+    classes = sorted(set(_LAYOUT_CLASS_PATTERN.findall(page_source)))
+    return hashlib.sha1(" ".join(classes).encode()).hexdigest()[:12]
+
+
+def _text(element) -> str:
+    return element.get_text(" ", strip=True) if element is not None else ""
+
+
+def _first_matching(items, selectors: List[str], min_length: int) -> Optional[str]:
+    """표본 항목에서 의미 있는 텍스트를 처음으로 찾는 선택자"""
+    for selector in selectors:
+        for item in items:
+            if len(_text(item.select_one(selector))) > min_length:
+                return selector
+    return None
+
+
+def resolve_layout(soup) -> Optional[NewsLayout]:
+    """후보 선택자를 차례로 시험해 이 페이지에서 쓸 항목·제목·내용 선택자를 확정합니다."""
+    for item_selector in NEWS_SELECTORS:
+        items = soup.select(item_selector)
+        if items:
+            sample = items[:5]
+            return NewsLayout(
+                item=item_selector,
+                title=_first_matching(sample, TITLE_SELECTORS, MIN_TITLE_LENGTH),
+                content=_first_matching(sample, CONTENT_SELECTORS, MIN_CONTENT_LENGTH),
+            )
+    return None
+
+
+def _item_text(item, selector: Optional[str], candidates: List[str], min_length: int) -> str:
+    """확정한 선택자로 텍스트를 찾고, 이 항목에서만 구조가 다르면 후보 선택자를 차례로 시도합니다."""
+    if selector:
+        text = _text(item.select_one(selector))
+        if len(text) > min_length:
+            return text
+    fallback = ""
+    for candidate in candidates:
+        text = _text(item.select_one(candidate))
+        if len(text) > min_length:
+            return text
+        fallback = fallback or text
+    return fallback
+
+
+def extract_news_items(page_source: str, base_url: str) -> List[dict]:
     """
-    최적화된 Chrome WebDriver를 생성하는 함수
+    페이지 소스 스냅샷 하나를 로컬에서 파싱해 뉴스 항목을 추출합니다.
+    선택자는 레이아웃 버전마다 한 번만 확정해 캐시하고, 캐시된 선택자로 항목이 나오지 않으면 다시 확정합니다.
+
+    Returns:
+        [{'title', 'content', 'link', 'source'}] (제목이 없는 항목은 제외)
     """
-    options = Options()
-    
-    # 기본 설정 (필수만 유지)
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    
-    # 성능 최적화 설정
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-plugins")
-    options.add_argument("--disable-images")
-    options.add_argument("--disable-web-security")
-    
-    # User-Agent 설정
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
-    try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
-    except Exception as e:
-        print(f"Chrome 드라이버 생성 실패: {e}")
-        return None
+    soup = BeautifulSoup(page_source, HTML_PARSER)
+    fingerprint = layout_fingerprint(page_source)
+    layout = _layouts.get(fingerprint)
+    items = soup.select(layout.item) if layout else []
+    if not items:
+        layout = resolve_layout(soup)
+        if layout is None:
+            return []
+        _layouts[fingerprint] = layout
+        print(f"  레이아웃 {fingerprint} 선택자 확정: 항목 {layout.item!r}, 제목 {layout.title!r}, 내용 {layout.content!r}")
+        items = soup.select(layout.item)
 
-def scroll_down(driver, pause_time=1):
-    try:
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause_time)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        return new_height != last_height
-    except Exception as e:
-        print(f"스크롤 중 오류: {e}")
-        return False
+    articles = []
+    for item in items:
+        title = _item_text(item, layout.title, TITLE_SELECTORS, MIN_TITLE_LENGTH)
+        if not title:
+            continue
+        content = _item_text(item, layout.content, CONTENT_SELECTORS, MIN_CONTENT_LENGTH)
+        link_elem = item if item.name == 'a' else item.select_one('a[href]')
+        link = link_elem.get('href', '') if link_elem is not None else ''
+        articles.append({
+            'title': title,
+            'content': content,
+            'link': urljoin(base_url, link) if link else '',
+            'source': 'Yahoo Finance'
+        })
+    return articles
 
-def scrape_yahoo_stock_news_filtered(stock_name: str, keyword: str, max_count: int = 20) -> list[dict]:
+def scrape_yahoo_stock_news_filtered(stock_name: str, keyword: str, max_count: int = 20,
+                                     known: Optional[Container[str]] = None) -> list[dict]:
     """
-    Yahoo Finance 웹 스크래핑 함수
+    Yahoo Finance 웹 스크래핑 함수 (브라우저는 공용 브라우저 풀에서 빌려 쓰고 돌려줌)
+    Yahoo Finance가 연속으로 응답하지 않으면 브라우저를 띄우지 않고 바로 CircuitOpenError를 발생시키며,
+    전체 수집 시간은 지연 예산(SCRAPE_BUDGET) 안으로 제한합니다.
+    known(이전 실행에서 수집한 기사 키)을 넘기면 그 안의 기사에 닿는 즉시 수집을 멈춥니다.
     """
     # Yahoo Finance URL 구조 수정 (종목명 대신 심볼 사용)
     url = f"https://finance.yahoo.com/quote/{stock_name}/news/"
-    
-    driver = create_driver()
-    if driver is None:
-        print("WebDriver 생성에 실패했습니다.")
+    ensure_available(url)
+
+    try:
+        session = browser_pool.acquire()
+    except Exception as e:
+        print(f"WebDriver 생성에 실패했습니다: {e}")
         return []
+    driver = session.driver
+    budget = LatencyBudget()
     
     all_articles = []
     seen = set()
+    reached_known = False
     
     try:
+        session.override(YAHOO_USER_AGENT, None)
         print(f"  페이지 로딩 중: {url}")
-        driver.get(url)
+        load_page(driver, url, budget)
         
         # 페이지 소스 확인 (디버깅용)
         page_source = driver.page_source
         print(f"  페이지 제목: {driver.title}")
         
-        # 다양한 선택자 시도
-        news_selectors = [
-            'li.stream-item.story-item',
-            'div[data-testid="storyitem"]',
-            'a[data-ylk*="elm:hdln"]',
-            'div[data-test-id="news-item"]',
-            '.news-item',
-            'article',
-            '.news-list-item',
-            '[data-test-id="news-list"] > div',
-            '.news-card',
-            '.article-item',
-            'div[class*="news"]',
-            'div[class*="article"]'
-        ]
-        
-        # 페이지 로딩 대기 (여러 선택자 시도)
+        # 뉴스 목록이 나타날 때까지 대기 (후보 선택자를 하나의 선택자로 묶어 한 번만 대기)
+        item_selector = ", ".join(NEWS_SELECTORS)
         element_found = False
-        for selector in news_selectors:
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                print(f"  뉴스 요소 발견 (선택자: {selector})")
-                element_found = True
-                break
-            except:
-                continue
+        try:
+            WebDriverWait(driver, budget.cap(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, item_selector))
+            )
+            element_found = True
+        except Exception:
+            pass
         
         if not element_found:
+            # 페이지는 열렸지만 뉴스 요소가 나타나지 않음 (오류 페이지 등) → 소스 실패로 기록
+            get_breaker(url).record_failure()
             print("  뉴스 아이템을 찾을 수 없습니다. 페이지 구조 확인 중...")
             # 페이지에 뉴스 관련 텍스트가 있는지 확인
-            if "news" not in page_source.lower() and "article" not in page_source.lower():
+            page_source = driver.page_source.lower()
+            if "news" not in page_source and "article" not in page_source:
                 print("  뉴스 페이지가 아닌 것 같습니다.")
                 return []
         
@@ -125,8 +234,10 @@ def scrape_yahoo_stock_news_filtered(stock_name: str, keyword: str, max_count: i
             ]
             
             for selector in cookie_selectors:
+                if budget.expired:
+                    break
                 try:
-                    cookie_button = WebDriverWait(driver, 2).until(
+                    cookie_button = WebDriverWait(driver, budget.cap(2)).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     cookie_button.click()
@@ -138,153 +249,52 @@ def scrape_yahoo_stock_news_filtered(stock_name: str, keyword: str, max_count: i
         except:
             pass
         
-        # 스크롤하여 더 많은 뉴스 로드
+        # 스크롤하여 더 많은 뉴스 로드 (새 뉴스가 붙는 즉시 다음 스크롤, 더 붙지 않으면 중단)
         for _ in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            if not scroll_and_wait(driver, item_selector, budget=budget):
+                break
         
-        while len(all_articles) < max_count:
-            # 뉴스 아이템 찾기
-            news_items = []
-            for selector in news_selectors:
-                try:
-                    items = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if items:
-                        news_items = items
-                        print(f"  뉴스 아이템 {len(items)}개 발견 (선택자: {selector})")
-                        break
-                except:
-                    continue
-            
+        while len(all_articles) < max_count and not budget.expired and not reached_known:
+            # 페이지 소스를 한 번만 가져와 로컬에서 파싱 (항목·선택자마다 WebDriver를 호출하지 않음)
+            news_items = extract_news_items(driver.page_source, url)
             if not news_items:
                 print("  뉴스 아이템을 찾을 수 없습니다.")
                 break
             
-            for item in news_items:
-                try:
-                    # 제목 추출 (Yahoo Finance 실제 구조에 맞게 수정)
-                    title_selectors = [
-                        'h3.clamp',  # Yahoo Finance 실제 제목 클래스
-                        'h3.yf-10mgn4g',  # Yahoo Finance 제목 클래스
-                        'h3',
-                        'h4', 'h2', 'h1',
-                        '.news-title', '[data-test-id="news-title"]',
-                        '.title', '.headline', '.article-title',
-                        'a[class*="title"]', 'span[class*="title"]',
-                        'div[class*="title"]'
-                    ]
-                    title = ""
-                    
-                    # 먼저 현재 아이템에서 제목 찾기
-                    for selector in title_selectors:
-                        try:
-                            title_elem = item.find_element(By.CSS_SELECTOR, selector)
-                            title = title_elem.text.strip()
-                            if title and len(title) > 5:  # 의미있는 제목인지 확인
-                                break
-                        except:
-                            continue
-                    
-                    # 제목을 찾지 못했다면 하위 요소에서 찾기
-                    if not title:
-                        try:
-                            # a 태그 안의 h3 찾기
-                            link_elem = item.find_element(By.CSS_SELECTOR, 'a')
-                            title_elem = link_elem.find_element(By.CSS_SELECTOR, 'h3')
-                            title = title_elem.text.strip()
-                        except:
-                            pass
-                    
-                    if not title:
-                        continue
-                    
-                    # 내용 추출 (Yahoo Finance 실제 구조에 맞게 수정)
-                    content_selectors = [
-                        'p.clamp',  # Yahoo Finance 실제 내용 클래스
-                        'p.yf-10mgn4g',  # Yahoo Finance 내용 클래스
-                        'p',
-                        '.news-summary', '[data-test-id="news-summary"]',
-                        '.summary', '.description', '.content',
-                        'div[class*="summary"]', 'div[class*="content"]',
-                        'span[class*="summary"]', 'span[class*="content"]'
-                    ]
-                    content = ""
-                    
-                    # 먼저 현재 아이템에서 내용 찾기
-                    for selector in content_selectors:
-                        try:
-                            content_elem = item.find_element(By.CSS_SELECTOR, selector)
-                            content = content_elem.text.strip()
-                            if content and len(content) > 10:  # 의미있는 내용인지 확인
-                                break
-                        except:
-                            continue
-                    
-                    # 내용을 찾지 못했다면 하위 요소에서 찾기
-                    if not content:
-                        try:
-                            # a 태그 안의 p 찾기
-                            link_elem = item.find_element(By.CSS_SELECTOR, 'a')
-                            content_elem = link_elem.find_element(By.CSS_SELECTOR, 'p')
-                            content = content_elem.text.strip()
-                        except:
-                            pass
-                    
-                    # 링크 추출
-                    link = ""
-                    try:
-                        if item.tag_name == 'a':
-                            link = item.get_attribute('href')
-                        else:
-                            link_elem = item.find_element(By.CSS_SELECTOR, 'a')
-                            link = link_elem.get_attribute('href')
-                    except:
-                        pass
-                    
-                    # 중복 방지
-                    unique_key = title + content
-                    if unique_key in seen:
-                        continue
-                    seen.add(unique_key)
-                    
-                    # 키워드 필터링
-                    if not keyword or keyword.lower() in title.lower() or keyword.lower() in content.lower():
-                        article = {
-                            'title': title,
-                            'content': content,
-                            'link': link,
-                            'source': 'Yahoo Finance'
-                        }
-                        all_articles.append(article)
-                        print(f"    뉴스 추가: {title[:50]}...")
-                        
-                        if len(all_articles) >= max_count:
-                            break
-                            
-                except Exception as e:
+            for article in news_items:
+                # 이전 실행에서 수집한 기사에 닿으면 그 뒤는 모두 수집한 기사
+                if known and article_key(article) in known:
+                    reached_known = True
+                    break
+                # 중복 방지
+                unique_key = article['title'] + article['content']
+                if unique_key in seen:
                     continue
+                seen.add(unique_key)
+                
+                # 키워드 필터링
+                if not keyword or keyword.lower() in article['title'].lower() or keyword.lower() in article['content'].lower():
+                    all_articles.append(article)
+                    print(f"    뉴스 추가: {article['title'][:50]}...")
+                    
+                    if len(all_articles) >= max_count:
+                        break
             
-            if len(all_articles) >= max_count:
+            if len(all_articles) >= max_count or reached_known:
                 break
                 
-            # 스크롤 다운
-            changed = scroll_down(driver, pause_time=2)
+            # 스크롤 다운 (새 뉴스가 붙을 때까지만 대기)
+            changed = scroll_and_wait(driver, item_selector, budget=budget)
             if not changed:
                 print("  더 이상 스크롤할 내용이 없습니다.")
                 break
-                
-            # 추가 로딩 대기
-            time.sleep(2)
             
     except Exception as e:
         print(f"  Yahoo Finance 스크래핑 중 오류: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        browser_pool.release(session)
         
     return all_articles
 
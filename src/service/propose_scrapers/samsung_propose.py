@@ -1,19 +1,13 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import time
 import os
 
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_MANAGER = True
-except ImportError:
-    USE_MANAGER = False
+from src.service.browser import browser_pool, load_page
+from src.service.resilience import CircuitOpenError, LatencyBudget, ensure_available, get_breaker
 
 class SamsungProposeScraper:
     def __init__(self):
@@ -29,23 +23,26 @@ class SamsungProposeScraper:
         """
         print("🔍 삼성증권 해외주식 추천 종목 스크래핑 시작...")
         
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--log-level=3')
-        
-        if USE_MANAGER:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        else:
-            driver = webdriver.Chrome(options=options)
+        try:
+            ensure_available(self.target_url)
+        except CircuitOpenError as e:
+            print(f"❌ {e}")
+            return []
+
+        # 공용 브라우저 풀에서 브라우저를 빌림 (끝나면 반납)
+        try:
+            session = browser_pool.acquire()
+        except Exception as e:
+            print(f"WebDriver 생성에 실패했습니다: {e}")
+            return []
+        driver = session.driver
+        budget = LatencyBudget()
         
         stock_data = []
         
         try:
             print(f"메인 웹 페이지 로드 중: {self.target_url}")
-            driver.get(self.target_url)
+            load_page(driver, self.target_url, budget)
             
             # 메인 페이지 로딩 대기 (프레임셋이 로드될 때까지)
             time.sleep(3)
@@ -53,11 +50,12 @@ class SamsungProposeScraper:
             # 'frmContent' frame으로 전환
             print("iframe/frame 'frmContent'로 전환 시도 중...")
             try:
-                WebDriverWait(driver, 10).until(
+                WebDriverWait(driver, budget.cap(10)).until(
                     EC.frame_to_be_available_and_switch_to_it((By.ID, 'frmContent'))
                 )
                 print("성공적으로 'frmContent' frame으로 전환되었습니다.")
             except Exception as e:
+                get_breaker(self.target_url).record_failure()
                 print(f"❌ 'frmContent' frame 전환 실패: {e}")
                 return []
             
@@ -124,7 +122,7 @@ class SamsungProposeScraper:
             print(f"❌ 스크래핑 중 오류 발생: {str(e)}")
             return []
         finally:
-            driver.quit()
+            browser_pool.release(session)
     
     def format_recommendations(self, stocks: List[Dict]) -> str:
         """
@@ -1,16 +1,11 @@
 from typing import List, Dict, Optional
 
 # 셀레니움 관련 import 추가
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 import time
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_MANAGER = True
-except ImportError:
-    USE_MANAGER = False
+
+from src.service.browser import browser_pool, load_page
+from src.service.resilience import CircuitOpenError, LatencyBudget, ensure_available
 
 class ThinkpoolProposeScraper:
     def __init__(self):
@@ -25,20 +20,25 @@ class ThinkpoolProposeScraper:
             List[Dict]: 추천 종목 리스트
         """
         print("🔍 셀레니움으로 씽크풀 AI 종목 추천 스크래핑 시작...")
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--lang=ko_KR')
-        
-        if USE_MANAGER:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        else:
-            driver = webdriver.Chrome(options=options)
+        try:
+            ensure_available(self.target_url)
+        except CircuitOpenError as e:
+            print(f"❌ {e}")
+            return []
+
+        # 공용 브라우저 풀에서 브라우저를 빌림 (끝나면 반납)
+        try:
+            session = browser_pool.acquire()
+        except Exception as e:
+            print(f"WebDriver 생성에 실패했습니다: {e}")
+            return []
+        driver = session.driver
+        budget = LatencyBudget()
         
         stocks = []
         try:
-            driver.get(self.target_url)
+            session.override(None, "ko-KR")
+            load_page(driver, self.target_url, budget)
             time.sleep(3)  # JS 렌더링 대기
             
             # itemView 클래스만 추출
@@ -78,7 +78,7 @@ class ThinkpoolProposeScraper:
             print(f"❌ 셀레니움 스크래핑 오류: {str(e)}")
             return []
         finally:
-            driver.quit()
+            browser_pool.release(session)
     
     def format_recommendations(self, stocks: List[Dict]) -> str:
         """
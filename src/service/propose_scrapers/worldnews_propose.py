@@ -1,15 +1,9 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from typing import List, Dict, Optional
 import time
 
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_MANAGER = True
-except ImportError:
-    USE_MANAGER = False
+from src.service.browser import browser_pool, load_page
+from src.service.resilience import CircuitOpenError, LatencyBudget, ensure_available
 
 class WorldnewsProposeScraper:
     def __init__(self):
@@ -26,21 +20,25 @@ class WorldnewsProposeScraper:
         """
         print("🔍 StockAnalysis.com 뉴스 스크래핑 시작...")
         
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--window-size=1920,1080')
-        
-        if USE_MANAGER:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        else:
-            driver = webdriver.Chrome(options=options)
+        try:
+            ensure_available(self.target_url)
+        except CircuitOpenError as e:
+            print(f"❌ {e}")
+            return []
+
+        # 공용 브라우저 풀에서 브라우저를 빌림 (끝나면 반납)
+        try:
+            session = browser_pool.acquire()
+        except Exception as e:
+            print(f"WebDriver 생성에 실패했습니다: {e}")
+            return []
+        driver = session.driver
+        budget = LatencyBudget()
         
         articles_data = []
         
         try:
-            driver.get(self.target_url)
+            load_page(driver, self.target_url, budget)
             time.sleep(5)  # 페이지 로딩 및 동적 콘텐츠 대기
             
             # 각 뉴스 기사를 감싸는 div 요소 찾기
@@ -78,7 +76,7 @@ class WorldnewsProposeScraper:
             print(f"❌ 뉴스 스크래핑 중 오류 발생: {str(e)}")
             return []
         finally:
-            driver.quit()
+            browser_pool.release(session)
     
     def format_recommendations(self, articles: List[Dict]) -> str:
         """
@@ -1,8 +1,10 @@
-import requests
+import httpx
 from bs4 import BeautifulSoup
 import re
 from typing import List, Dict, Optional
 
+from src.service import http_client
+
 class YuantaProposeScraper:
     def __init__(self):
         self.base_url = "https://m.myasset.com/myasset/research/rs_list/RS_0702001_P1.cmd"
@@ -10,6 +12,40 @@ class YuantaProposeScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
     
+    def _request_params(self) -> Dict[str, str]:
+        """추천 종목 페이지 요청 파라미터"""
+        return {
+            'section': '01',
+            'timestamp': '1750775382430'
+        }
+
+    def _parse_recommended_stocks(self, content: bytes) -> List[Dict]:
+        """
+        추천 종목 페이지 HTML에서 종목 정보를 추출합니다.
+
+        Args:
+            content: 응답 본문 (bytes)
+
+        Returns:
+            List[Dict]: 추천 종목 리스트
+        """
+        # HTML 파싱
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # 추천 종목 추출
+        recommended_stocks = []
+
+        # dl 태그들 찾기 (추천 종목 컨테이너)
+        stock_containers = soup.find_all('dl')
+
+        for container in stock_containers:
+            stock_info = self._extract_stock_info(container)
+            if stock_info:
+                recommended_stocks.append(stock_info)
+
+        print(f"✅ {len(recommended_stocks)}개의 추천 종목을 스크래핑했습니다.")
+        return recommended_stocks
+
     def scrape_recommended_stocks(self) -> List[Dict]:
         """
         유안타증권 추천 종목을 스크래핑합니다.
@@ -18,36 +54,38 @@ class YuantaProposeScraper:
             List[Dict]: 추천 종목 리스트
         """
         try:
-            # URL 파라미터 설정
-            params = {
-                'section': '01',
-                'timestamp': '1750775382430'
-            }
-            
             print("🔍 유안타증권 추천 종목 스크래핑 시작...")
             
             # 웹페이지 요청
-            response = requests.get(self.base_url, params=params, headers=self.headers, timeout=10)
+            response = http_client.request("GET", self.base_url, params=self._request_params(), headers=self.headers)
             response.raise_for_status()
+
+            return self._parse_recommended_stocks(response.content)
             
-            # HTML 파싱
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 추천 종목 추출
-            recommended_stocks = []
-            
-            # dl 태그들 찾기 (추천 종목 컨테이너)
-            stock_containers = soup.find_all('dl')
-            
-            for container in stock_containers:
-                stock_info = self._extract_stock_info(container)
-                if stock_info:
-                    recommended_stocks.append(stock_info)
-            
-            print(f"✅ {len(recommended_stocks)}개의 추천 종목을 스크래핑했습니다.")
-            return recommended_stocks
-            
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
+            print(f"❌ 웹페이지 요청 실패: {str(e)}")
+            return []
+        except Exception as e:
+            print(f"❌ 스크래핑 중 오류 발생: {str(e)}")
+            return []
+
+    async def ascrape_recommended_stocks(self) -> List[Dict]:
+        """
+        유안타증권 추천 종목을 비동기로 스크래핑합니다.
+
+        Returns:
+            List[Dict]: 추천 종목 리스트
+        """
+        try:
+            print("🔍 유안타증권 추천 종목 스크래핑 시작...")
+
+            # 웹페이지 요청 (이벤트 루프를 막지 않는 비동기 HTTP)
+            response = await http_client.arequest("GET", self.base_url, params=self._request_params(), headers=self.headers)
+            response.raise_for_status()
+
+            return self._parse_recommended_stocks(response.content)
+
+        except httpx.HTTPError as e:
             print(f"❌ 웹페이지 요청 실패: {str(e)}")
             return []
         except Exception as e:
@@ -0,0 +1,189 @@
+"""
+외부 소스 장애 대응 (서킷 브레이커, 재시도 백오프, 지연 예산)
+소스(호스트)별로 연속 실패를 세어 일정 횟수를 넘으면 차단(open)하고, 차단 중인 소스 호출은
+기다리지 않고 바로 CircuitOpenError로 실패시킵니다. 차단 시간이 지나면 시험 호출 하나만 허용(half-open)해
+성공하면 다시 열고(closed), 실패하면 다시 차단합니다.
+공용 HTTP 클라이언트와 Selenium 스크래퍼(browser.load_page)가 함께 사용합니다.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from src.core.config import settings
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """차단 중인 소스를 호출한 경우"""
+
+    def __init__(self, source: str, retry_after: float):
+        super().__init__(f"{source} 연속 실패로 호출 차단 중 ({retry_after:.0f}초 후 재시도)")
+        self.source = source
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        """
+        Args:
+            name: 소스 이름 (호스트명)
+            failure_threshold: 차단까지의 연속 실패 횟수
+            reset_timeout: 차단 후 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """호출해도 되는지 확인합니다. 차단 시간이 지났으면 시험 호출 하나만 허용합니다."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._trial_running = False
+            if self._state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self._rejected += 1
+            return False
+
+    def check(self):
+        """차단 중이면 CircuitOpenError를 발생시킵니다."""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print(f"✅ {self.name} 호출 차단 해제")
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                print(f"⛔ {self.name} 연속 {self._failures}회 실패 → {self.reset_timeout:.0f}초간 호출 차단")
+
+    def release(self):
+        """성공/실패 판정 없이 끝난 시험 호출을 반납합니다. (다음 호출이 다시 시험 호출이 됨)"""
+        with self._lock:
+            self._trial_running = False
+
+    @contextmanager
+    def guard(self):
+        """블록 실행 전 차단 여부를 확인하고, 예외가 나면 실패·아니면 성공으로 기록합니다."""
+        self.check()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "rejected": self._rejected,
+                "retry_after": round(self.retry_after(), 1) if state == OPEN else 0.0,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def source_of(url: str) -> str:
+    """URL의 소스 이름 (호스트명)"""
+    return urlsplit(str(url)).hostname or str(url)
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    """소스 이름(또는 URL)에 해당하는 서킷 브레이커 (처음 호출 시 생성)"""
+    if "://" in source:
+        source = source_of(source)
+    breaker = _breakers.get(source)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                source,
+                CircuitBreaker(source, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT),
+            )
+    return breaker
+
+
+def ensure_available(source: str):
+    """
+    소스가 차단 중이면 바로 CircuitOpenError를 발생시킵니다.
+    (브라우저 생성처럼 비용이 큰 준비 작업 전에 호출 - 시험 호출 자리는 차지하지 않음)
+    """
+    breaker = get_breaker(source)
+    if breaker.state == OPEN:
+        raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+
+def breaker_stats() -> Dict[str, dict]:
+    """소스별 서킷 브레이커 상태 스냅샷"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def backoff(attempt: int) -> float:
+    """attempt번째 재시도 전 대기 시간 (지수 백오프에 full jitter 적용 - 동시에 실패한 요청이 같은 시각에 몰리지 않도록)"""
+    return random.uniform(0, settings.HTTP_BACKOFF * (2 ** attempt))
+
+
+class LatencyBudget:
+    """
+    작업 하나(종목 1개의 뉴스 수집 등)에 허용하는 전체 소요 시간
+    대기·타임아웃을 남은 시간 안으로 줄이고, 남은 시간이 없으면 재시도하지 않도록 합니다.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = settings.SCRAPE_BUDGET if seconds is None else seconds
+        self._deadline = time.monotonic() + self.seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self._deadline - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float, minimum: float = 0.5) -> float:
+        """timeout을 남은 시간 이하로 줄입니다. (Selenium 타임아웃이 0이 되지 않도록 minimum 이상)"""
+        return max(min(timeout, self.remaining()), minimum)
+
+    def allows(self, delay: float) -> bool:
+        """delay초를 기다린 뒤에도 시간이 남는지 (재시도 여부 판단)"""
+        return self.remaining() > delay
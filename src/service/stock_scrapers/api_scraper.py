@@ -1,259 +1,554 @@
-import requests
-import os
+import asyncio
+import httpx
+import time
 from dotenv import load_dotenv
 from typing import Dict, List, Optional, Any
 import logging
 from src.core.config import settings
-from .get_token import get_access_token, clear_token_cache
+from src.core.records import Quote
+from src.service import http_client
+from src.service.http_client import TokenBucket
+from .get_token import token_manager
+from .quote_cache import quote_cache
+from .symbol_master import market_of
 
 # 환경변수 로드
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# 토큰 캐시 변수
-_cached_headers = None
+KIS_BASE_URL = "https://openapi.koreainvestment.com:9443"
+KIS_PRICE_URL = f"{KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/inquire-price"
+KIS_PRICE_TR_ID = "FHKST01010100"
+# 관심종목(멀티종목) 시세조회 - 한 번에 최대 30종목
+KIS_MULTI_PRICE_URL = f"{KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/intstock-multprice"
+KIS_MULTI_PRICE_TR_ID = "FHKST11300006"
+KIS_MULTI_PRICE_MAX_CODES = 30
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+YAHOO_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+YAHOO_CHART_PARAMS = {
+    "interval": "1d",
+    "range": "1d"
+}
+# 여러 종목을 한 번에 조회하는 spark API (요청당 최대 20종목)
+YAHOO_SPARK_URL = "https://query1.finance.yahoo.com/v7/finance/spark"
+YAHOO_SPARK_MAX_SYMBOLS = 20
 
-def clear_token_cache():
-    """토큰 캐시를 초기화합니다."""
-    global _cached_headers
-    _cached_headers = None
-    # get_token 모듈의 캐시도 초기화
-    from .get_token import clear_token_cache as clear_token_module_cache
-    clear_token_module_cache()
+# 한국투자증권 초당 거래건수 초과 오류 코드
+KIS_RATE_LIMIT_CODE = "EGW00201"
+# 한국투자증권 토큰 오류 코드 (유효하지 않은 토큰, 만료된 토큰) → 토큰 재발급 후 한 번 재시도
+KIS_TOKEN_ERROR_CODES = {"EGW00121", "EGW00123"}
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0  # 초 (재시도마다 배수로 증가)
+
+# API별 요청 제한 (프로세스 전체에서 공유)
+kis_rate_limiter = TokenBucket(settings.KIS_REQUESTS_PER_SECOND)
+yahoo_rate_limiter = TokenBucket(settings.YAHOO_REQUESTS_PER_SECOND)
+
+
+def _kis_msg_cd(response) -> Optional[str]:
+    """한국투자증권 응답의 메시지 코드 (JSON이 아니면 None)"""
+    try:
+        return response.json().get("msg_cd")
+    except ValueError:
+        return None
+
+def _renew_token_headers(headers: Dict[str, str], label: str) -> Dict[str, str]:
+    """서버가 거부한 토큰을 폐기하고 새 토큰으로 만든 헤더를 반환합니다."""
+    logger.warning(f"{label} 토큰 만료/무효 → 토큰 재발급 후 재시도")
+    token_manager.invalidate(headers.get("authorization", "").split(" ")[-1])
+    return {**headers, **token_manager.headers(headers.get("tr_id", ""))}
+
+def _kis_get(url: str, headers: Dict[str, str], params: Dict[str, str], label: str):
+    """한국투자증권 GET 요청 (초당 거래건수 초과 시 백오프 후 재시도, 토큰 오류 시 재발급 후 한 번 재시도)"""
+    token_renewed = False
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        response = http_client.request("GET", url, limiter=kis_rate_limiter, headers=headers, params=params)
+        msg_cd = _kis_msg_cd(response)
+        if msg_cd == KIS_RATE_LIMIT_CODE and attempt < RATE_LIMIT_RETRIES:
+            logger.warning(f"{label} 초당 거래건수 초과 → {attempt + 1}번째 재시도")
+            time.sleep(RATE_LIMIT_BACKOFF * (attempt + 1))
+            continue
+        if msg_cd in KIS_TOKEN_ERROR_CODES and not token_renewed and attempt < RATE_LIMIT_RETRIES:
+            headers, token_renewed = _renew_token_headers(headers, label), True
+            continue
+        response.raise_for_status()
+        return response
+
+async def _akis_get(url: str, headers: Dict[str, str], params: Dict[str, str], label: str,
+                    client: Optional[httpx.AsyncClient] = None):
+    """_kis_get의 비동기 버전"""
+    token_renewed = False
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        response = await http_client.arequest("GET", url, client=client, limiter=kis_rate_limiter,
+                                              headers=headers, params=params)
+        msg_cd = _kis_msg_cd(response)
+        if msg_cd == KIS_RATE_LIMIT_CODE and attempt < RATE_LIMIT_RETRIES:
+            logger.warning(f"{label} 초당 거래건수 초과 → {attempt + 1}번째 재시도")
+            await asyncio.sleep(RATE_LIMIT_BACKOFF * (attempt + 1))
+            continue
+        if msg_cd in KIS_TOKEN_ERROR_CODES and not token_renewed and attempt < RATE_LIMIT_RETRIES:
+            # 토큰 발급은 블로킹(파일 잠금, 동기 HTTP)이므로 스레드에서 실행
+            headers, token_renewed = await asyncio.to_thread(_renew_token_headers, headers, label), True
+            continue
+        response.raise_for_status()
+        return response
 
 def is_domestic_stock(stock_code: str) -> bool:
     """
     주식 코드가 국내 주식인지 판단합니다.
-    국내 주식: 6자리 숫자 (예: 005930, 000660)
-    해외 주식: 영문 대문자 (예: AAPL, MSFT, GOOGL)
+    종목 마스터가 로드되어 있으면 마스터 기준으로, 없으면 코드 형태로 판단합니다.
+    국내 주식: 첫 글자가 숫자인 6자리 코드 (예: 005930, 000660, 0046A0)
+    해외 주식: 그 외 티커 (예: AAPL, brk.b, BRK-B)
     """
-    # 6자리 숫자인 경우 국내 주식
-    if stock_code.isdigit() and len(stock_code) == 6:
-        return True
-    # 영문 대문자인 경우 해외 주식
-    elif stock_code.isalpha() and stock_code.isupper():
-        return False
-    # 그 외의 경우는 기본적으로 국내 주식으로 간주
-    else:
-        return True
-    
+    return market_of(stock_code) == "domestic"
+
 def get_headers(tr_id: str) -> Dict[str, str]:
-    """API 요청 헤더를 생성합니다. 토큰을 캐시하여 재사용합니다."""
-    global _cached_headers
-    
-    # 캐시된 헤더가 있으면 재사용
-    if _cached_headers:
-        # 캐시된 토큰의 만료 시간 체크
-        from .get_token import _cached_token
-        if _cached_token:
-            from datetime import datetime, timedelta
-            try:
-                expires_at = datetime.fromisoformat(_cached_token['expires_at'])
-                # 10분 여유를 두고 만료 체크
-                if datetime.now() < (expires_at - timedelta(minutes=10)):
-                    # tr_id만 업데이트하여 반환
-                    headers = _cached_headers.copy()
-                    headers["tr_id"] = tr_id
-                    return headers
-            except Exception as e:
-                print(f"캐시된 토큰 만료 시간 파싱 오류: {e}")
-        
-        # 토큰이 만료되었으면 캐시 클리어
-        _cached_headers = None
-
-    # 환경변수에서 직접 API 키 가져오기
-    app_key = os.getenv("KOR_INVESTMENT_APP_KEY")
-    app_secret = os.getenv("KOR_INVESTMENT_APP_SECRET")
-    
-    if not app_key or not app_secret:
-        raise ValueError("API 키가 설정되지 않았습니다. .env 파일에서 KOR_INVESTMENT_APP_KEY와 KOR_INVESTMENT_APP_SECRET을 설정해주세요.")
-    
-    token_info = get_access_token()
-    if not token_info:
-        raise ValueError("토큰 발급에 실패했습니다.")
-    
-    # 헤더를 캐시에 저장
-    _cached_headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "authorization": f"Bearer {token_info['access_token']}",
-        "appKey": app_key,
-        "appSecret": app_secret,
-        "tr_id": tr_id
-    }
-    
-    return _cached_headers.copy()
+    """API 요청 헤더를 반환합니다. (토큰 관리자가 tr_id별로 미리 만들어 둔 헤더의 복사본)"""
+    return token_manager.headers(tr_id)
+
+def _to_number(value: Any, cast=float) -> Optional[Any]:
+    """API 문자열 값을 숫자로 변환합니다. 빈 값이면 None"""
+    if value in (None, ""):
+        return None
+    try:
+        return cast(float(value)) if cast is int else cast(value)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_domestic_output(stock_code: str, output: Dict[str, Any]) -> Quote:
+    """한국투자증권 inquire-price 응답의 output을 Quote로 변환합니다."""
+    return Quote(
+        code=stock_code,
+        market="domestic",
+        # 현재가 및 가격 변동
+        price=_to_number(output.get("stck_prpr"), int),
+        change_rate=_to_number(output.get("prdy_ctrt")),
+        # 거래량 및 거래대금
+        volume=_to_number(output.get("acml_vol"), int),
+        trade_value=_to_number(output.get("acml_tr_pbmn"), int),
+        turnover=_to_number(output.get("vol_tnrt")),
+        # 기업 가치 지표
+        market_cap=_to_number(output.get("hts_avls"), int),
+        per=_to_number(output.get("per")),
+        pbr=_to_number(output.get("pbr")),
+        # 과거 가격 및 추세
+        high_250d=_to_number(output.get("d250_hgpr"), int),
+        low_250d=_to_number(output.get("d250_lwpr"), int),
+        high_52w=_to_number(output.get("w52_hgpr"), int),
+        low_52w=_to_number(output.get("w52_lwpr"), int),
+        # 투자자 동향
+        foreign_net_buy=_to_number(output.get("frgn_ntby_qty"), int),
+        program_net_buy=_to_number(output.get("pgtr_ntby_qty"), int),
+        # 특이사항/경고
+        caution=output.get("invt_caful_yn") or None,
+        warning_code=output.get("mrkt_warn_cls_code") or None,
+        managed=output.get("mang_issu_cls_code") or None,
+        liquidation=output.get("sltr_yn") or None,
+        # 기타 정보
+        sector=output.get("bstp_kor_isnm") or None,
+        market_name=output.get("rprs_mrkt_kor_name") or None,
+    )
 
-def get_domestic_stock_price(stock_code: str, headers: Dict[str, str]) -> Dict[str, Any]:
+def _handle_domestic_result(stock_code: str, result: Dict[str, Any]) -> Optional[Quote]:
+    """국내 주식 API 응답(JSON)을 검사하고 Quote로 변환합니다."""
+    if result["rt_cd"] == "0" and result.get("output"):
+        quote = _parse_domestic_output(stock_code, result["output"])
+        logger.info(f"{stock_code} 국내 주식 현재가 정보 조회 완료")
+        return quote
+
+    logger.error(f"국내 주식 현재가 조회 실패: {result.get('msg1', '알 수 없는 오류')}")
+    return None
+
+def get_domestic_stock_price(stock_code: str, headers: Dict[str, str]) -> Optional[Quote]:
     """
     국내 주식의 현재가 정보를 한국투자증권 API로 조회합니다.
     """
-    base_url = "https://openapi.koreainvestment.com:9443"
-    url = f"{base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
-    
     params = {
         "FID_COND_MRKT_DIV_CODE": "J",
         "FID_INPUT_ISCD": stock_code
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
+        response = _kis_get(KIS_PRICE_URL, headers, params, stock_code)
+        return _handle_domestic_result(stock_code, response.json())
 
-        result = response.json()
-
-        if result["rt_cd"] == "0" and result.get("output"):
-            output = result["output"]
-
-            # 현재가 및 가격 변동
-            current_price_info = {
-                "현재가": int(output.get("stck_prpr", 0)),
-                "등락률": float(output.get("prdy_ctrt", 0)),
-            }
-
-            # 거래량 및 거래대금
-            volume_info = {
-                "거래량": int(output.get("acml_vol", 0)),
-                "거래대금": int(output.get("acml_tr_pbmn", 0)),
-                "거래량회전율": float(output.get("vol_tnrt", 0)),
-            }
-
-            # 기업 가치 지표
-            valuation_info = {
-                "시가총액": int(output.get("hts_avls", 0)),
-                "PER": float(output.get("per", 0)),
-                "PBR": float(output.get("pbr", 0)),
-            }
-
-            # 과거 가격 및 추세
-            historical_info = {
-                "250일최고가": int(output.get("d250_hgpr", 0)),
-                "250일최저가": int(output.get("d250_lwpr", 0)),
-                "52주최고가": int(output.get("w52_hgpr", 0)),
-                "52주최저가": int(output.get("w52_lwpr", 0)),
-            }
-
-            # 투자자 동향
-            investor_info = {
-                "외국인순매수수량": int(output.get("frgn_ntby_qty", 0)),
-                "프로그램매매순매수수량": int(output.get("pgtr_ntby_qty", 0)),
-            }
-
-            # 특이사항/경고
-            warning_info = {
-                "투자유의여부": output.get("invt_caful_yn", ""),
-                "시장경고코드": output.get("mrkt_warn_cls_code", ""),
-                "관리종목여부": output.get("mang_issu_cls_code", ""),
-                "정리매매여부": output.get("sltr_yn", ""),
-            }
-
-            # 기타 정보
-            other_info = {
-                "업종명": output.get("bstp_kor_isnm", ""),
-                "시장구분": output.get("rprs_mrkt_kor_name", ""),
-            }
-
-            # 모든 정보를 하나의 딕셔너리로 통합
-            complete_info = {
-                **current_price_info,
-                **volume_info,
-                **valuation_info,
-                **historical_info,
-                **investor_info,
-                **warning_info,
-                **other_info
-            }
-
-            logger.info(f"{stock_code} 국내 주식 현재가 정보 조회 완료")
-            return complete_info
-        else:
-            logger.error(f"국내 주식 현재가 조회 실패: {result.get('msg1', '알 수 없는 오류')}")
-            return {}
+    except Exception as e:
+        logger.error(f"국내 주식 현재가 조회 중 오류 발생: {e}")
+        return None
+
+async def aget_domestic_stock_price(stock_code: str, headers: Dict[str, str], client: Optional[httpx.AsyncClient] = None) -> Optional[Quote]:
+    """
+    국내 주식의 현재가 정보를 한국투자증권 API로 비동기 조회합니다.
+    client를 넘기지 않으면 공용 클라이언트(src.service.http_client)의 커넥션을 재사용합니다.
+    """
+    params = {
+        "FID_COND_MRKT_DIV_CODE": "J",
+        "FID_INPUT_ISCD": stock_code
+    }
+
+    try:
+        response = await _akis_get(KIS_PRICE_URL, headers, params, stock_code, client)
+        return _handle_domestic_result(stock_code, response.json())
 
     except Exception as e:
         logger.error(f"국내 주식 현재가 조회 중 오류 발생: {e}")
+        return None
+
+def _parse_multi_price_item(stock_code: str, item: Dict[str, Any]) -> Quote:
+    """
+    관심종목(멀티종목) 시세 응답 항목을 Quote로 변환합니다.
+    멀티종목 응답에 없는 항목(PER, PBR, 52주 고저가 등)은 None으로 남습니다.
+    """
+    return Quote(
+        code=stock_code,
+        market="domestic",
+        price=_to_number(item.get("inter2_prpr"), int),
+        change_rate=_to_number(item.get("prdy_ctrt")),
+        volume=_to_number(item.get("acml_vol"), int),
+        trade_value=_to_number(item.get("acml_tr_pbmn"), int),
+        prev_close=_to_number(item.get("inter2_prdy_clpr"), int),
+        market_name=item.get("kospi_kosdaq_cls_name") or None,
+        partial=True,
+    )
+
+def _multi_price_params(stock_codes: List[str]) -> Dict[str, str]:
+    params = {}
+    for i, stock_code in enumerate(stock_codes, 1):
+        params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+        params[f"FID_INPUT_ISCD_{i}"] = stock_code
+    return params
+
+def _handle_multi_price_result(stock_codes: List[str], result: Dict[str, Any]) -> Dict[str, Quote]:
+    """멀티종목 시세 응답(JSON)을 {종목코드: Quote}로 변환합니다. 현재가가 없는 종목은 제외"""
+    if result.get("rt_cd") != "0":
+        logger.error(f"국내 주식 멀티종목 시세 조회 실패: {result.get('msg1', '알 수 없는 오류')}")
         return {}
 
-def get_worldwide_stock_price(stock_code: str) -> Dict[str, Any]:
+    requested = set(stock_codes)
+    quotes = {}
+    for item in result.get("output") or []:
+        stock_code = item.get("inter_shrn_iscd", "").strip()
+        if stock_code not in requested:
+            continue
+        quote = _parse_multi_price_item(stock_code, item)
+        if quote.price:
+            quotes[stock_code] = quote
+    return quotes
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def get_domestic_stock_prices(stock_codes: List[str], headers: Optional[Dict[str, str]] = None) -> Dict[str, Quote]:
+    """
+    여러 국내 주식의 현재가를 관심종목(멀티종목) 시세 API로 조회합니다. (30종목씩 나눠 요청)
+
+    Returns:
+        {종목코드: Quote} 딕셔너리 (조회되지 않은 종목은 포함되지 않음)
+    """
+    headers = headers or get_headers(KIS_MULTI_PRICE_TR_ID)
+    quotes = {}
+    for chunk in _chunks(list(dict.fromkeys(stock_codes)), KIS_MULTI_PRICE_MAX_CODES):
+        try:
+            response = _kis_get(KIS_MULTI_PRICE_URL, headers, _multi_price_params(chunk), f"{chunk[0]} 외 {len(chunk) - 1}종목")
+            quotes.update(_handle_multi_price_result(chunk, response.json()))
+        except Exception as e:
+            logger.error(f"국내 주식 멀티종목 시세 조회 중 오류 발생: {e}")
+    return quotes
+
+async def aget_domestic_stock_prices(stock_codes: List[str], headers: Optional[Dict[str, str]] = None) -> Dict[str, Quote]:
+    """
+    get_domestic_stock_prices의 비동기 버전. 나눠진 요청들은 동시에 보내고 속도는 토큰 버킷으로 제한합니다.
+    """
+    if headers is None:
+        headers = await asyncio.to_thread(get_headers, KIS_MULTI_PRICE_TR_ID)
+
+    async def fetch(chunk: List[str]) -> Dict[str, Quote]:
+        try:
+            response = await _akis_get(KIS_MULTI_PRICE_URL, headers, _multi_price_params(chunk), f"{chunk[0]} 외 {len(chunk) - 1}종목")
+            return _handle_multi_price_result(chunk, response.json())
+        except Exception as e:
+            logger.error(f"국내 주식 멀티종목 시세 조회 중 오류 발생: {e}")
+            return {}
+
+    quotes = {}
+    for result in await asyncio.gather(*(fetch(chunk) for chunk in _chunks(list(dict.fromkeys(stock_codes)), KIS_MULTI_PRICE_MAX_CODES))):
+        quotes.update(result)
+    return quotes
+
+def _parse_worldwide_meta(stock_code: str, meta: Dict[str, Any], partial: bool = False) -> Quote:
+    """
+    Yahoo Finance chart 응답의 meta를 Quote로 변환합니다.
+    spark 응답처럼 가격·전일 종가만 있는 meta는 partial=True로 넘깁니다.
+    """
+    # 현재가 정보
+    current_price = meta.get("regularMarketPrice") or 0
+    # spark 응답 등 previousClose가 없으면 차트 기준 전일 종가 사용 (둘 다 null일 수 있음)
+    previous_close = meta.get("previousClose") or meta.get("chartPreviousClose") or 0
+
+    # 등락률 계산
+    if previous_close and previous_close > 0:
+        change_rate = ((current_price - previous_close) / previous_close) * 100
+    else:
+        change_rate = 0
+
+    return Quote(
+        code=stock_code,
+        market="worldwide",
+        price=round(current_price, 2),
+        change_rate=round(change_rate, 2),
+        volume=meta.get("regularMarketVolume"),
+        # 시가총액 (Yahoo Finance에서 제공하는 경우)
+        market_cap=meta.get("marketCap"),
+        # 통화는 응답에 있을 때만 채움 (.KS, .T, .L 등 비미국 종목을 USD로 표시하지 않도록)
+        currency=meta.get("currency") or None,
+        exchange=meta.get("exchangeName") or None,
+        prev_close=round(previous_close, 2) if previous_close else None,
+        partial=partial,
+    )
+
+def _handle_worldwide_result(stock_code: str, result: Dict[str, Any]) -> Optional[Quote]:
+    """해외 주식 API 응답(JSON)을 검사하고 Quote로 변환합니다."""
+    if result.get("chart") and result["chart"].get("result"):
+        chart_data = result["chart"]["result"][0]
+        quote = _parse_worldwide_meta(stock_code, chart_data.get("meta", {}))
+        logger.info(f"{stock_code} 해외 주식 현재가 정보 조회 완료")
+        return quote
+
+    logger.error(f"해외 주식 현재가 조회 실패: 데이터 형식 오류")
+    return None
+
+def get_worldwide_stock_price(stock_code: str) -> Optional[Quote]:
     """
     해외 주식의 현재가 정보를 Yahoo Finance API로 조회합니다.
     """
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{stock_code}"
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    
-    params = {
-        "interval": "1d",
-        "range": "1d"
-    }
+    url = f"{YAHOO_CHART_URL}/{stock_code}"
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.request("GET", url, limiter=yahoo_rate_limiter, headers=YAHOO_HEADERS, params=YAHOO_CHART_PARAMS)
         response.raise_for_status()
+        return _handle_worldwide_result(stock_code, response.json())
 
-        result = response.json()
-
-        if result.get("chart") and result["chart"].get("result"):
-            chart_data = result["chart"]["result"][0]
-            meta = chart_data.get("meta", {})
-            
-            # 현재가 정보
-            current_price = meta.get("regularMarketPrice", 0)
-            previous_close = meta.get("previousClose", 0)
-            
-            # 등락률 계산
-            if previous_close and previous_close > 0:
-                change_rate = ((current_price - previous_close) / previous_close) * 100
-            else:
-                change_rate = 0
-            
-            # 거래량
-            volume = meta.get("regularMarketVolume", 0)
-            
-            # 시가총액 (Yahoo Finance에서 제공하는 경우)
-            market_cap = meta.get("marketCap", 0)
-            
-            # 기타 정보
-            currency = meta.get("currency", "USD")
-            exchange_name = meta.get("exchangeName", "")
-            
-            complete_info = {
-                "현재가": round(current_price, 2),
-                "등락률": round(change_rate, 2),
-                "거래량": volume,
-                "시가총액": market_cap,
-                "통화": currency,
-                "거래소": exchange_name,
-                "이전종가": round(previous_close, 2),
-            }
-
-            logger.info(f"{stock_code} 해외 주식 현재가 정보 조회 완료")
-            return complete_info
-        else:
-            logger.error(f"해외 주식 현재가 조회 실패: 데이터 형식 오류")
-            return {}
+    except Exception as e:
+        logger.error(f"해외 주식 현재가 조회 중 오류 발생: {e}")
+        return None
+
+async def aget_worldwide_stock_price(stock_code: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Quote]:
+    """
+    해외 주식의 현재가 정보를 Yahoo Finance API로 비동기 조회합니다.
+    client를 넘기지 않으면 공용 클라이언트(src.service.http_client)의 커넥션을 재사용합니다.
+    """
+    url = f"{YAHOO_CHART_URL}/{stock_code}"
+
+    try:
+        response = await http_client.arequest("GET", url, client=client, limiter=yahoo_rate_limiter,
+                                              headers=YAHOO_HEADERS, params=YAHOO_CHART_PARAMS)
+        response.raise_for_status()
+        return _handle_worldwide_result(stock_code, response.json())
 
     except Exception as e:
         logger.error(f"해외 주식 현재가 조회 중 오류 발생: {e}")
+        return None
+
+def _spark_meta(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """spark 응답의 종목 항목에서 chart meta와 같은 형태의 딕셔너리를 꺼냅니다."""
+    # v7 형식: {"symbol": ..., "response": [{"meta": {...}}]}
+    if entry.get("response"):
+        return entry["response"][0].get("meta") or {}
+
+    # 간소화된 형식: {"symbol": ..., "close": [...], "chartPreviousClose": ...}
+    closes = [close for close in entry.get("close") or [] if close is not None]
+    if not closes:
         return {}
+    return {
+        "regularMarketPrice": closes[-1],
+        "previousClose": entry.get("previousClose") or entry.get("chartPreviousClose", 0),
+    }
+
+def _handle_spark_result(symbols: List[str], result: Dict[str, Any]) -> Dict[str, Quote]:
+    """spark 응답(JSON)을 {종목코드: Quote}로 변환합니다. 현재가가 없는 종목은 제외"""
+    if "spark" in result:
+        entries = (result["spark"] or {}).get("result") or []
+    else:
+        entries = [entry for entry in result.values() if isinstance(entry, dict)]
 
-def get_stock_current_price(stock_info: str) -> Dict[str, Any]:
+    requested = set(symbols)
+    quotes = {}
+    for entry in entries:
+        symbol = entry.get("symbol")
+        meta = _spark_meta(entry)
+        if symbol in requested and meta.get("regularMarketPrice"):
+            # spark 응답에는 거래량·거래소·통화 등이 빠져 있을 수 있으므로 부분 조회로 표시
+            quotes[symbol] = _parse_worldwide_meta(symbol, meta, partial=True)
+    return quotes
+
+def _spark_params(symbols: List[str]) -> Dict[str, str]:
+    return {"symbols": ",".join(symbols), **YAHOO_CHART_PARAMS}
+
+def get_worldwide_stock_prices(stock_codes: List[str]) -> Dict[str, Quote]:
+    """
+    여러 해외 주식의 현재가를 Yahoo Finance spark API로 조회합니다. (20종목씩 나눠 요청)
+
+    Returns:
+        {종목코드: Quote} 딕셔너리 (조회되지 않은 종목은 포함되지 않음)
+    """
+    quotes = {}
+    for chunk in _chunks(list(dict.fromkeys(stock_codes)), YAHOO_SPARK_MAX_SYMBOLS):
+        try:
+            response = http_client.request("GET", YAHOO_SPARK_URL, limiter=yahoo_rate_limiter,
+                                           headers=YAHOO_HEADERS, params=_spark_params(chunk))
+            response.raise_for_status()
+            quotes.update(_handle_spark_result(chunk, response.json()))
+        except Exception as e:
+            logger.error(f"해외 주식 일괄 시세 조회 중 오류 발생: {e}")
+    return quotes
+
+async def aget_worldwide_stock_prices(stock_codes: List[str]) -> Dict[str, Quote]:
+    """
+    get_worldwide_stock_prices의 비동기 버전. 나눠진 요청들은 동시에 보내고 속도는 토큰 버킷으로 제한합니다.
+    """
+    async def fetch(chunk: List[str]) -> Dict[str, Quote]:
+        try:
+            response = await http_client.arequest("GET", YAHOO_SPARK_URL, limiter=yahoo_rate_limiter,
+                                                  headers=YAHOO_HEADERS, params=_spark_params(chunk))
+            response.raise_for_status()
+            return _handle_spark_result(chunk, response.json())
+        except Exception as e:
+            logger.error(f"해외 주식 일괄 시세 조회 중 오류 발생: {e}")
+            return {}
+
+    quotes = {}
+    for result in await asyncio.gather(*(fetch(chunk) for chunk in _chunks(list(dict.fromkeys(stock_codes)), YAHOO_SPARK_MAX_SYMBOLS))):
+        quotes.update(result)
+    return quotes
+
+def get_stock_current_price(stock_info: str) -> Optional[Quote]:
     """
     주식의 현재가 정보를 조회합니다. (국내/해외 자동 구분)
+    QUOTE_CACHE_ENABLED이면 시세 캐시에 유효한 값이 있을 때 네트워크 조회를 생략합니다.
 
     Args:
         stock_info: 종목코드 (예: "005930", "AAPL") 또는 종목명
 
     Returns:
-        현재가 정보 딕셔너리
+        Quote (조회 실패 시 None)
     """
+    if settings.QUOTE_CACHE_ENABLED:
+        cached = quote_cache.get(stock_info)
+        if cached is not None:
+            return cached
+
     # 주식 코드가 국내 주식인지 해외 주식인지 판단
     if is_domestic_stock(stock_info):
         logger.info(f"{stock_info}는 국내 주식으로 판단되어 한국투자증권 API를 사용합니다.")
-        headers = get_headers("FHKST01010100")
-        return get_domestic_stock_price(stock_info, headers)
+        headers = get_headers(KIS_PRICE_TR_ID)
+        result = get_domestic_stock_price(stock_info, headers)
     else:
         logger.info(f"{stock_info}는 해외 주식으로 판단되어 Yahoo Finance API를 사용합니다.")
-        return get_worldwide_stock_price(stock_info)
+        result = get_worldwide_stock_price(stock_info)
+
+    if settings.QUOTE_CACHE_ENABLED:
+        quote_cache.set(result)
+    return result
+
+async def aget_stock_current_price(stock_info: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Quote]:
+    """
+    주식의 현재가 정보를 비동기로 조회합니다. (국내/해외 자동 구분)
+
+    Args:
+        stock_info: 종목코드 (예: "005930", "AAPL") 또는 종목명
+        client: 사용할 httpx.AsyncClient (없으면 공용 클라이언트)
+
+    Returns:
+        Quote (조회 실패 시 None)
+    """
+    if settings.QUOTE_CACHE_ENABLED:
+        cached = quote_cache.get(stock_info)
+        if cached is not None:
+            return cached
+
+    if is_domestic_stock(stock_info):
+        logger.info(f"{stock_info}는 국내 주식으로 판단되어 한국투자증권 API를 사용합니다.")
+        # 토큰 발급은 최초 1회만 네트워크를 타므로 스레드로 넘겨 이벤트 루프를 막지 않음
+        headers = await asyncio.to_thread(get_headers, KIS_PRICE_TR_ID)
+        result = await aget_domestic_stock_price(stock_info, headers, client)
+    else:
+        logger.info(f"{stock_info}는 해외 주식으로 판단되어 Yahoo Finance API를 사용합니다.")
+        result = await aget_worldwide_stock_price(stock_info, client)
+
+    if settings.QUOTE_CACHE_ENABLED:
+        quote_cache.set(result)
+    return result
+
+async def fetch_quotes(stock_codes: List[str]) -> Dict[str, Optional[Quote]]:
+    """
+    여러 종목의 현재가를 한 번에 동시 조회합니다. (국내/해외 자동 구분)
+    국내 종목은 KIS_MULTI_QUOTE가 켜져 있으면 멀티종목 시세 API로 30종목씩 (상세 항목 없이 가격·등락률만),
+    해외 종목은 Yahoo Finance spark API로 20종목씩 조회하고,
+    거기서 빠진 종목만 종목별 현재가 API로 다시 조회합니다.
+    QUOTE_CACHE_ENABLED이면 시세 캐시에 유효한 값이 있는 종목은 조회하지 않습니다.
+    (멀티종목 시세로 캐시된 국내 부분 현재가는 KIS_MULTI_QUOTE가 켜져 있을 때만 사용하고,
+     해외 종목은 어차피 spark로 조회하므로 spark로 캐시된 부분 현재가도 사용)
+    요청 속도는 API별 토큰 버킷(KIS_REQUESTS_PER_SECOND, YAHOO_REQUESTS_PER_SECOND)으로 제한되고,
+    공용 클라이언트의 커넥션과 토큰(헤더)은 모든 종목이 공유합니다.
+
+    Args:
+        stock_codes: 종목코드 리스트 (예: ["005930", "AAPL"])
+
+    Returns:
+        {종목코드: Quote} 딕셔너리 (조회 실패한 종목은 None)
+    """
+    requested = list(dict.fromkeys(stock_codes))
+    cached = {}
+    if settings.QUOTE_CACHE_ENABLED:
+        cached.update(quote_cache.get_many([code for code in requested if is_domestic_stock(code)],
+                                           allow_partial=settings.KIS_MULTI_QUOTE))
+        cached.update(quote_cache.get_many([code for code in requested if not is_domestic_stock(code)],
+                                           allow_partial=True))
+    codes = [code for code in requested if code not in cached]
+    if not codes:
+        return {code: cached[code] for code in requested}
+
+    domestic_codes = [code for code in codes if is_domestic_stock(code)]
+    quotes: Dict[str, Optional[Quote]] = {}
+
+    headers = None
+    if domestic_codes:
+        try:
+            # 토큰 발급은 최초 1회만 네트워크를 타므로 스레드로 넘겨 이벤트 루프를 막지 않음
+            headers = await asyncio.to_thread(get_headers, KIS_PRICE_TR_ID)
+        except Exception as e:
+            logger.error(f"국내 주식 일괄 조회용 헤더 생성 실패: {e}")
+
+    # 멀티종목 시세·spark 응답은 상세 항목이 빠진 부분 현재가(Quote.partial) → 캐시에도 부분 조회로 표시됨
+    batches = []
+    if headers is not None and settings.KIS_MULTI_QUOTE:
+        batches.append(aget_domestic_stock_prices(domestic_codes, {**headers, "tr_id": KIS_MULTI_PRICE_TR_ID}))
+    worldwide_codes = [code for code in codes if not is_domestic_stock(code)]
+    if worldwide_codes:
+        batches.append(aget_worldwide_stock_prices(worldwide_codes))
+    for batch in await asyncio.gather(*batches):
+        quotes.update(batch)
+
+    async def fetch(code: str) -> Optional[Quote]:
+        if is_domestic_stock(code):
+            if headers is None:
+                return None
+            return await aget_domestic_stock_price(code, headers)
+        return await aget_worldwide_stock_price(code)
+
+    remaining = [code for code in codes if code not in quotes]
+    results = await asyncio.gather(*(fetch(code) for code in remaining), return_exceptions=True)
+
+    for code, result in zip(remaining, results):
+        if isinstance(result, Exception):
+            logger.error(f"{code} 현재가 일괄 조회 중 오류 발생: {result}")
+            result = None
+        quotes[code] = result
+
+    if settings.QUOTE_CACHE_ENABLED:
+        quote_cache.set_many(quotes[code] for code in codes)
+    quotes.update(cached)
+    return {code: quotes[code] for code in requested}
@@ -2,9 +2,27 @@ import os
 import json
 from dotenv import load_dotenv
 
+from .symbol_master import symbol_master, yahoo_symbol
+
 # 환경변수 로드
 load_dotenv()
 
+def _normalize_code(code: str, market: str) -> str:
+    """종목코드 표기 통일 (소문자 → 대문자, 해외 클래스 주식 BRK.B → BRK-B)"""
+    return yahoo_symbol(code) if market == "worldwide" else code.strip().upper()
+
+def _resolve_item(item: str, market: str) -> tuple[str, str]:
+    """
+    코드만 또는 종목명만 적힌 항목을 종목 마스터로 (종목코드, 종목명)으로 해석합니다.
+    마스터에 없으면 입력값을 코드와 이름으로 그대로 사용합니다.
+    """
+    if symbol_master.ensure_loaded():
+        symbol = symbol_master.resolve(item, market)
+        if symbol:
+            return symbol.code, symbol.name
+        print(f"⚠️ 종목 마스터에서 '{item}'을(를) 찾지 못했습니다. 입력값을 그대로 사용합니다.")
+    return _normalize_code(item, market), item
+
 def load_domestic_stock_list() -> dict:
     """
     환경변수에서 국내 주식 리스트를 로드
@@ -54,10 +72,11 @@ def load_domestic_stock_list() -> dict:
                 # 005930(삼성전자) 형태
                 code = item.split('(')[0].strip()
                 name = item.split('(')[1].split(')')[0].strip()
-                stock_info[code] = name
+                stock_info[_normalize_code(code, "domestic")] = name
             else:
-                # 주식코드만 또는 종목명만 (종목명을 모르므로 코드를 그대로 사용)
-                stock_info[item] = item
+                # 주식코드만 또는 종목명만 (종목 마스터로 코드와 종목명을 찾음)
+                code, name = _resolve_item(item, "domestic")
+                stock_info[code] = name
 
     print(f"로드된 국내 주식 정보: {stock_info}")
     return stock_info
@@ -111,10 +130,11 @@ def load_worldwide_stock_list() -> dict:
                 # AAPL(Apple) 형태
                 code = item.split('(')[0].strip()
                 name = item.split('(')[1].split(')')[0].strip()
-                stock_info[code] = name
+                stock_info[_normalize_code(code, "worldwide")] = name
             else:
-                # 주식코드만 또는 종목명만 (종목명을 모르므로 코드를 그대로 사용)
-                stock_info[item] = item
+                # 주식코드만 또는 종목명만 (종목 마스터로 코드와 종목명을 찾음)
+                code, name = _resolve_item(item, "worldwide")
+                stock_info[code] = name
 
     print(f"로드된 해외 주식 정보: {stock_info}")
     return stock_info
@@ -125,6 +145,9 @@ def load_stock_list() -> tuple[dict, dict]:
     Returns:
         tuple: (domestic_stocks, worldwide_stocks)
     """
+    # 국내/해외 구분(market_of)이 코드 형태 추정이 아닌 종목 마스터 기준으로 이뤄지도록 먼저 올려 둠
+    # (종목코드(종목명) 형식만 있으면 _resolve_item이 마스터를 올리지 않음)
+    symbol_master.ensure_loaded()
     domestic_stocks = load_domestic_stock_list()
     worldwide_stocks = load_worldwide_stock_list()
     
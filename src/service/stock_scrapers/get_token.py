@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-한국투자증권 API 토큰 발급 도구
-1분 제한을 우회하기 위해 별도로 토큰을 발급받아 사용
+한국투자증권 API 토큰 관리
+토큰 발급은 1분에 1회로 제한되므로, 발급받은 토큰을 캐시 파일(data/kis_token.json)에 보관해
+여러 스레드·프로세스가 하나의 토큰을 함께 사용합니다.
 """
-import os
-import sys
-import requests
+import hashlib
 import json
-from datetime import datetime, timedelta
-from dotenv import load_dotenv, set_key
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
 
 from src.core.config import settings
+from src.service import http_client
 
 # 프로젝트 루트 디렉토리 찾기
 project_root = Path(__file__).parent.parent.parent
@@ -20,146 +26,263 @@ env_file_path = project_root / '.env'
 
 load_dotenv(env_file_path)
 
-# 토큰 캐시 변수
-_cached_token = None
+KIS_BASE_URL = "https://openapi.koreainvestment.com:9443"
+KIS_TOKEN_URL = f"{KIS_BASE_URL}/oauth2/tokenP"
 
-def save_token_to_env(token_info: dict):
-    """
-    토큰 정보를 .env 파일에 저장합니다.
-    """
-    try:
-        # .env 파일에 토큰 정보 저장 (절대 경로 사용)
-        set_key(env_file_path, 'KOR_INVESTMENT_ACCESS_TOKEN', token_info['access_token'])
-        set_key(env_file_path, 'KOR_INVESTMENT_TOKEN_EXPIRES_AT', token_info['expires_at'])
-        set_key(env_file_path, 'KOR_INVESTMENT_TOKEN_TYPE', token_info['token_type'])
-        
-        print(f"✅ 토큰 정보가 {env_file_path} 파일에 저장되었습니다.")
-        return True
-    except Exception as e:
-        print(f"❌ 토큰 저장 중 오류: {e}")
-        return False
+# 만료 전에 미리 갱신을 시작하는 시간 (초)
+REFRESH_MARGIN = 10 * 60
+# 발급 실패 후 다시 시도하기까지 기다리는 시간 (초, 발급 1분 1회 제한)
+ISSUE_COOLDOWN = 60
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-def is_token_expired() -> bool:
-    """
-    저장된 토큰의 만료 시간을 확인합니다.
-    """
-    expires_at_str = os.getenv("KOR_INVESTMENT_TOKEN_EXPIRES_AT")
-    if not expires_at_str:
-        return True
-    
-    try:
-        expires_at = datetime.fromisoformat(expires_at_str)
-        # 10분 여유를 두고 만료 체크
-        return datetime.now() >= (expires_at - timedelta(minutes=10))
-    except Exception as e:
-        print(f"토큰 만료 시간 파싱 오류: {e}")
-        return True
 
-def get_saved_token() -> dict:
+@contextmanager
+def _file_lock(path: Path):
+    """프로세스 간 배타 잠금 (잠금 파일 기준, 블로킹)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 후 포기하므로 잠길 때까지 반복
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class KisTokenManager:
     """
-    저장된 토큰 정보를 반환합니다.
+    한국투자증권 접근 토큰 관리자
+    - 유효한 토큰이 있으면 tr_id별로 미리 만들어 둔 헤더를 잠금 없이 바로 반환
+    - 만료 REFRESH_MARGIN초 전부터 한 스레드만 갱신하고, 나머지는 기존 토큰을 계속 사용 (single-flight)
+    - 갱신 시에는 파일 잠금을 잡고 캐시 파일을 다시 읽어, 다른 프로세스가 방금 발급한 토큰이 있으면 그대로 사용
     """
-    access_token = os.getenv("KOR_INVESTMENT_ACCESS_TOKEN")
-    expires_at = os.getenv("KOR_INVESTMENT_TOKEN_EXPIRES_AT")
-    token_type = os.getenv("KOR_INVESTMENT_TOKEN_TYPE", "Bearer")
-    
-    if access_token and expires_at:
+
+    def __init__(self, cache_path: str):
+        self.cache_path = Path(cache_path)
+        self.lock_path = self.cache_path.with_suffix(".lock")
+        self._lock = threading.Lock()
+        self._token: Optional[dict] = None
+        self._expires_at = 0.0  # epoch 초
+        self._headers: Dict[str, Dict[str, str]] = {}  # {tr_id: 헤더}
+        self._rejected: Optional[str] = None  # 서버에서 거부된 토큰 (캐시 파일에 남아 있어도 재사용하지 않음)
+        self._last_issue_failed = 0.0
+
+    # --- 조회 ---
+
+    def headers(self, tr_id: str) -> Dict[str, str]:
+        """tr_id에 맞는 요청 헤더 (복사본)를 반환합니다. 토큰이 없거나 곧 만료되면 갱신합니다."""
+        token = self._current()
+        headers = self._headers.get(tr_id)
+        if headers is None:
+            headers = self._build_headers(token, tr_id)
+            # 그사이 토큰이 폐기·교체됐으면 이전 토큰으로 만든 헤더를 새 캐시에 넣지 않음
+            # (갱신 중인 스레드가 잠금을 잡고 있으면 캐시하지 않고 이번 헤더만 사용)
+            if self._lock.acquire(blocking=False):
+                try:
+                    if self._token is token:
+                        self._headers[tr_id] = headers
+                finally:
+                    self._lock.release()
+        return dict(headers)
+
+    def token(self) -> dict:
+        """유효한 토큰 정보 {access_token, token_type, expires_at}를 반환합니다."""
+        return dict(self._current())
+
+    def invalidate(self, access_token: Optional[str] = None):
+        """
+        토큰을 폐기합니다. (서버가 만료/무효 토큰으로 응답한 경우)
+        access_token을 넘기면 현재 토큰이 그 토큰일 때만 폐기하므로, 동시에 여러 번 호출되어도 한 번만 재발급합니다.
+        """
+        with self._lock:
+            if self._token is None or (access_token and self._token["access_token"] != access_token):
+                return
+            self._rejected = self._token["access_token"]
+            self._token = None
+            self._expires_at = 0.0
+            self._headers = {}
+
+    def clear(self):
+        """메모리에 보관한 토큰만 지웁니다. (다음 조회 시 캐시 파일에서 다시 읽음)"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            self._headers = {}
+
+    # --- 내부 ---
+
+    @staticmethod
+    def _credentials():
+        app_key = os.getenv("KOR_INVESTMENT_APP_KEY")
+        app_secret = os.getenv("KOR_INVESTMENT_APP_SECRET")
+        if not app_key or not app_secret:
+            raise ValueError("API 키가 설정되지 않았습니다. .env 파일에서 KOR_INVESTMENT_APP_KEY와 KOR_INVESTMENT_APP_SECRET을 설정해주세요.")
+        return app_key, app_secret
+
+    @staticmethod
+    def _fingerprint(app_key: str) -> str:
+        # 앱 키가 바뀌면 기존 캐시 토큰을 쓰지 않도록 키 지문을 함께 저장
+        return hashlib.sha256(app_key.encode()).hexdigest()[:16]
+
+    def _current(self) -> dict:
+        """
+        지금 사용할 토큰 (한 번 읽은 스냅샷). 없거나 곧 만료되면 갱신합니다.
+        invalidate()가 다른 스레드에서 self._token을 지워도 스냅샷은 그대로 유효합니다.
+        """
+        token = self._token
+        if token is None or time.time() >= self._expires_at - REFRESH_MARGIN:
+            self._refresh()
+            token = self._token
+            if token is None:
+                # 갱신 직후 다른 스레드가 폐기함 → 토큰이 없으므로 이번에는 잠금을 기다려 다시 발급
+                self._refresh()
+                token = self._token
+        if token is None:
+            raise ValueError("토큰 발급에 실패했습니다. 1분 후 다시 시도해주세요.")
+        return token
+
+    def _build_headers(self, token: dict, tr_id: str) -> Dict[str, str]:
+        app_key, app_secret = self._credentials()
         return {
-            "access_token": access_token,
-            "expires_at": expires_at,
-            "token_type": token_type,
-            "base_url": "https://openapi.koreainvestment.com:9443",
-            "is_production": True
+            "Content-Type": "application/json; charset=utf-8",
+            "authorization": f"{token['token_type']} {token['access_token']}",
+            "appKey": app_key,
+            "appSecret": app_secret,
+            "tr_id": tr_id,
+        }
+
+    def _use(self, token: dict):
+        # 헤더 캐시와 만료 시각을 먼저 바꾼 뒤 토큰을 공개
+        # (새 토큰을 본 스레드가 이전 토큰으로 만든 헤더를 꺼내 쓰지 않도록)
+        expires_at = datetime.fromisoformat(token["expires_at"]).timestamp()
+        self._headers = {}
+        self._expires_at = expires_at
+        self._token = token
+
+    def _usable(self, token: Optional[dict], app_key: str, now: float) -> bool:
+        if not token or token.get("access_token") == self._rejected:
+            return False
+        if token.get("app_key_id") != self._fingerprint(app_key):
+            return False
+        try:
+            return datetime.fromisoformat(token["expires_at"]).timestamp() - REFRESH_MARGIN > now
+        except (KeyError, ValueError):
+            return False
+
+    def _read_cache(self) -> Optional[dict]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, token: dict):
+        # 임시 파일에 쓴 뒤 교체 (다른 프로세스가 쓰다 만 파일을 읽지 않도록), 소유자만 읽기 가능
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(token, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def _issue(self, app_key: str, app_secret: str) -> dict:
+        print("🔄 토큰이 만료되었거나 없습니다. 새로 발급받습니다...")
+        # 발급은 1분에 1회로 제한되고, 응답을 못 받아도 서버에서는 이미 발급됐을 수 있으므로 자동 재시도하지 않음
+        # (실패하면 ISSUE_COOLDOWN 후 다음 갱신 때 다시 시도)
+        response = http_client.request(
+            "POST",
+            KIS_TOKEN_URL,
+            retries=0,
+            headers={"Content-Type": "application/json"},
+            content=json.dumps({"grant_type": "client_credentials", "appkey": app_key, "appsecret": app_secret}),
+        )
+        if response.status_code != 200:
+            raise ValueError(f"토큰 발급 실패: {response.status_code} {response.text}")
+
+        result = response.json()
+        expires_in = min(int(result.get("expires_in") or 86400), 86400)
+        token = {
+            "access_token": result["access_token"],
+            "token_type": result.get("token_type", "Bearer"),
+            "expires_at": datetime.fromtimestamp(time.time() + expires_in).astimezone().isoformat(),
+            "app_key_id": self._fingerprint(app_key),
         }
-    return None
+        print(f"✅ 토큰 발급 성공! 만료시간: {token['expires_at']}")
+        return token
+
+    def _refresh(self):
+        has_valid_token = self._token is not None and time.time() < self._expires_at
+        # 다른 스레드가 갱신 중이면, 아직 유효한 토큰이 있는 경우 기다리지 않고 기존 토큰 사용
+        if not self._lock.acquire(blocking=not has_valid_token):
+            return
+        try:
+            now = time.time()
+            if self._token is not None and now < self._expires_at - REFRESH_MARGIN:
+                return  # 기다리는 동안 다른 스레드가 갱신함
+
+            app_key, app_secret = self._credentials()
+            with _file_lock(self.lock_path):
+                cached = self._read_cache()
+                if self._usable(cached, app_key, now):
+                    self._use(cached)
+                    return
+
+                # 직전 발급이 실패했으면 1분 안에는 다시 요청하지 않음 (기존 토큰이 유효하면 계속 사용)
+                if now - self._last_issue_failed < ISSUE_COOLDOWN:
+                    if has_valid_token:
+                        return
+                    raise ValueError("토큰 발급에 실패했습니다. 1분 후 다시 시도해주세요.")
+
+                try:
+                    token = self._issue(app_key, app_secret)
+                except Exception:
+                    self._last_issue_failed = now
+                    if has_valid_token:
+                        print("⚠️ 토큰 갱신에 실패해 기존 토큰을 계속 사용합니다.")
+                        return
+                    raise
+                self._write_cache(token)
+                self._use(token)
+        finally:
+            self._lock.release()
+
+
+# 전역 토큰 관리자 인스턴스
+token_manager = KisTokenManager(settings.KIS_TOKEN_CACHE_PATH)
+
 
 def clear_token_cache():
-    """토큰 캐시를 초기화합니다."""
-    global _cached_token
-    _cached_token = None
+    """메모리의 토큰 캐시를 초기화합니다."""
+    token_manager.clear()
+
 
-def get_access_token() -> dict:
+def get_access_token() -> Optional[dict]:
     """
-    한국투자증권 API 액세스 토큰을 발급받습니다.
-    저장된 토큰이 있고 만료되지 않았다면 그것을 사용하고,
-    만료되었다면 새로 발급받아 저장합니다.
+    한국투자증권 API 액세스 토큰을 반환합니다.
+    유효한 토큰이 캐시에 있으면 재사용하고, 없거나 곧 만료되면 새로 발급받아 캐시 파일에 저장합니다.
 
     Returns:
-        토큰 정보 딕셔너리
+        토큰 정보 딕셔너리 (발급 실패 시 None)
     """
-    global _cached_token
-    
-    # 캐시된 토큰이 있고 만료되지 않았다면 재사용
-    if _cached_token and not is_token_expired():
-        print("✅ 캐시된 토큰을 사용합니다.")
-        return _cached_token
-    
-    # 저장된 토큰이 있고 만료되지 않았다면 그것을 사용
-    saved_token = get_saved_token()
-    if saved_token and not is_token_expired():
-        print("✅ 저장된 토큰을 사용합니다.")
-        _cached_token = saved_token
-        return saved_token
-    
-    print("🔄 토큰이 만료되었거나 없습니다. 새로 발급받습니다...")
-
-    # 환경변수에서 직접 API 키 가져오기
-    app_key = os.getenv("KOR_INVESTMENT_APP_KEY")
-    app_secret = os.getenv("KOR_INVESTMENT_APP_SECRET")
-
-    if not app_key or not app_secret:
-        raise ValueError("API 키가 설정되지 않았습니다. .env 파일에서 KOR_INVESTMENT_APP_KEY와 KOR_INVESTMENT_APP_SECRET을 설정해주세요.")
-
-    base_url = "https://openapi.koreainvestment.com:9443"
-    url = f"{base_url}/oauth2/tokenP"
-    headers = {
-        "Content-Type": "application/json"
-    }
-
-    data = {
-        "grant_type": "client_credentials",
-        "appkey": app_key,
-        "appsecret": app_secret
-    }
-
     try:
-        print(f"토큰 발급 요청 중...")
-
-        response = requests.post(url, headers=headers, data=json.dumps(data))
-
-        if response.status_code == 200:
-            result = response.json()
-
-            # 만료시간 계산 (23시간 후로 설정)
-            expires_at = datetime.now() + timedelta(hours=23)
-
-            token_info = {
-                "access_token": result["access_token"],
-                "expires_at": expires_at.isoformat(),
-                "token_type": result.get("token_type", "Bearer"),
-                "expires_in": result.get("expires_in", 86400),
-                "base_url": base_url,
-                "is_production": True
-            }
-
-            # 토큰을 .env 파일에 저장
-            if save_token_to_env(token_info):
-                print("✅ 토큰 발급 및 저장 성공!")
-                print(f"만료시간: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}")
-                # 캐시에 저장
-                _cached_token = token_info
-                return token_info
-            else:
-                print("⚠️ 토큰 발급은 성공했지만 저장에 실패했습니다.")
-                # 캐시에 저장
-                _cached_token = token_info
-                return token_info
-
-        else:
-            print(f"❌ 토큰 발급 실패: {response.status_code}")
-            print(f"응답: {response.text}")
-            return None
-
+        return token_manager.token()
     except Exception as e:
         print(f"❌ 토큰 발급 중 오류: {e}")
         return None
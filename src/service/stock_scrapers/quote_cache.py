@@ -0,0 +1,183 @@
+"""
+현재가 캐시 (메모리 + SQLite)
+정규장 중에는 짧게(QUOTE_CACHE_TTL_OPEN), 장이 닫혀 있으면 다음 정규장 시작까지 보관해
+같은 날 반복 실행이나 장 마감 후 실행에서는 네트워크 조회를 건너뜁니다.
+멀티종목 시세처럼 상세 항목이 빠진 현재가는 부분 조회(partial)로 표시해 두고,
+상세 항목이 필요한 조회(allow_partial=False)에서는 없는 것으로 취급합니다.
+"""
+import dataclasses
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.core.config import settings
+from src.core.market_hours import MARKET_SESSIONS
+from src.core.records import Quote
+
+# 장 마감 직후에도 종가가 확정·반영될 때까지 장중으로 취급하는 시간
+SETTLE_GRACE = timedelta(minutes=10)
+
+
+def expires_at(market: str, now: Optional[datetime] = None) -> float:
+    """시장 구분과 현재 시각에 따른 캐시 만료 시각 (epoch 초)"""
+    now = now or datetime.now().astimezone()
+    session = MARKET_SESSIONS.get(market)
+    if session is None or session.is_open(now, grace=SETTLE_GRACE):
+        return now.timestamp() + settings.QUOTE_CACHE_TTL_OPEN
+    # 장이 닫혀 있으면 다음 정규장 시작까지 가격이 바뀌지 않음
+    return session.next_open(now).timestamp()
+
+
+class QuoteCache:
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 2048):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (None이면 메모리에만 보관)
+            max_entries: 메모리에 보관할 최대 종목 수 (초과 시 가장 오래 사용하지 않은 종목부터 제거)
+        """
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self._memory: "OrderedDict[str, tuple[Quote, float, bool]]" = OrderedDict()  # {종목코드: (현재가, 만료 시각, 부분 조회 여부)}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quote_records ("
+                "code TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, partial INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute("DELETE FROM quote_records WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, code: str, quote: Quote, expiry: float, partial: bool):
+        self._memory[code] = (quote, expiry, partial)
+        self._memory.move_to_end(code)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, code: str, allow_partial: bool = False) -> Optional[Quote]:
+        """
+        유효한 캐시가 있으면 현재가(Quote 복사본)를, 없으면 None을 반환합니다.
+        allow_partial이 False이면 상세 항목이 빠진 부분 조회 현재가도 없는 것으로 봅니다.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(code)
+            if entry and entry[1] > now:
+                if entry[2] and not allow_partial:
+                    self.misses += 1
+                    return None
+                self._memory.move_to_end(code)
+                self.hits += 1
+                return dataclasses.replace(entry[0])
+            if entry:
+                del self._memory[code]
+
+            try:
+                conn = self._db()
+                row = conn.execute(
+                    "SELECT payload, expires_at, partial FROM quote_records WHERE code = ? AND expires_at > ?",
+                    (code, now),
+                ).fetchone() if conn else None
+            except sqlite3.Error as e:
+                print(f"시세 캐시 조회 실패: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            quote = Quote.from_dict(json.loads(row[0]))
+            self._remember(code, quote, row[1], bool(row[2]))
+            if row[2] and not allow_partial:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            return dataclasses.replace(quote)
+
+    def get_many(self, codes: list[str], allow_partial: bool = False) -> Dict[str, Quote]:
+        """캐시에 있는 종목만 {종목코드: Quote}로 반환합니다."""
+        cached = {}
+        for code in codes:
+            quote = self.get(code, allow_partial)
+            if quote is not None:
+                cached[code] = quote
+        return cached
+
+    def set(self, quote: Optional[Quote]):
+        """현재가를 저장합니다. None(조회 실패)은 저장하지 않습니다."""
+        self.set_many([quote])
+
+    def set_many(self, quotes: Iterable[Optional[Quote]]):
+        """
+        여러 종목의 현재가를 한 번의 트랜잭션으로 저장합니다. (만료 시각은 종목의 시장 구분 기준)
+        Quote.partial인 현재가는 부분 조회로 표시됩니다.
+        """
+        rows = [
+            (quote.code, dataclasses.replace(quote), expires_at(quote.market))
+            for quote in quotes if quote is not None
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            for code, quote, expiry in rows:
+                self._remember(code, quote, expiry, quote.partial)
+            try:
+                conn = self._db()
+                if conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO quote_records (code, payload, expires_at, partial) VALUES (?, ?, ?, ?)",
+                        [
+                            (code, json.dumps(quote.to_dict(), ensure_ascii=False), expiry, int(quote.partial))
+                            for code, quote, expiry in rows
+                        ],
+                    )
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"시세 캐시 저장 실패: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                conn = self._db()
+                if conn:
+                    conn.execute("DELETE FROM quote_records")
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"시세 캐시 초기화 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# 전역 시세 캐시 인스턴스 (SQLite 파일은 처음 사용할 때 엶)
+quote_cache = QuoteCache(
+    db_path=settings.QUOTE_CACHE_DB_PATH or None,
+    max_entries=settings.QUOTE_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,318 @@
+"""
+한국투자증권 실시간 체결가(WebSocket) 수신
+관심 종목의 체결(H0STCNT0)을 구독해 종목별 마지막 체결을 메모리에 보관하고,
+stock_scraper/watchlist_loader는 REST 조회 없이 이 값을 바로 읽습니다.
+접속 주소(KIS_WS_URL)와 접속키 발급 함수를 바꿔 로컬 대체 서버로도 동작합니다.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import websocket
+
+from src.core.config import settings
+from src.core.records import Quote
+from src.service import http_client
+
+KIS_APPROVAL_URL = "https://openapi.koreainvestment.com:9443/oauth2/Approval"
+TRADE_TR_ID = "H0STCNT0"  # 국내주식 실시간 체결가
+PINGPONG_TR_ID = "PINGPONG"
+
+# 재접속 대기 시간 (초, 실패가 이어지면 최대값까지 두 배씩 증가)
+RECONNECT_DELAY = 1.0
+RECONNECT_DELAY_MAX = 30.0
+
+
+@dataclass(slots=True)
+class Tick:
+    """종목별 마지막 체결"""
+    code: str
+    time: str  # 체결 시각 (HHMMSS)
+    price: int
+    change: int
+    change_rate: float
+    volume: int  # 누적 거래량
+    trade_value: int  # 누적 거래대금
+    received_at: float  # 수신 시각 (epoch 초)
+
+    def to_quote(self) -> Quote:
+        """마지막 체결을 현재가 레코드로 변환합니다. (체결에 없는 상세 항목은 비어 있으므로 부분 현재가)"""
+        return Quote(
+            code=self.code,
+            market="domestic",
+            price=self.price,
+            change_rate=self.change_rate,
+            volume=self.volume,
+            trade_value=self.trade_value,
+            prev_close=self.price - self.change,
+            partial=True,
+        )
+
+
+def get_approval_key() -> str:
+    """실시간(WebSocket) 접속키를 발급받습니다."""
+    app_key = os.getenv("KOR_INVESTMENT_APP_KEY")
+    app_secret = os.getenv("KOR_INVESTMENT_APP_SECRET")
+    if not app_key or not app_secret:
+        raise ValueError("API 키가 설정되지 않았습니다. .env 파일에서 KOR_INVESTMENT_APP_KEY와 KOR_INVESTMENT_APP_SECRET을 설정해주세요.")
+
+    # 접속키도 토큰처럼 호출할 때마다 서버에서 새로 발급되므로 자동 재시도하지 않음
+    response = http_client.request(
+        "POST",
+        KIS_APPROVAL_URL,
+        retries=0,
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        content=json.dumps({"grant_type": "client_credentials", "appkey": app_key, "secretkey": app_secret}),
+    )
+    response.raise_for_status()
+    return response.json()["approval_key"]
+
+
+def parse_trade_message(message: str, received_at: Optional[float] = None) -> List[Tick]:
+    """
+    실시간 체결 메시지를 Tick 리스트로 변환합니다.
+    형식: "0|H0STCNT0|건수|필드^필드^..." (여러 건이면 레코드가 이어 붙어 옴)
+    """
+    parts = message.split("|", 3)
+    if len(parts) != 4 or parts[0] != "0" or parts[1] != TRADE_TR_ID:
+        return []
+
+    received_at = received_at or time.time()
+    fields = parts[3].split("^")
+    count = max(1, int(parts[2]))
+    size = len(fields) // count
+
+    ticks = []
+    for i in range(count):
+        record = fields[i * size:(i + 1) * size]
+        try:
+            ticks.append(Tick(
+                code=record[0],
+                time=record[1],
+                price=int(record[2]),
+                change=int(record[4]),
+                change_rate=float(record[5]),
+                volume=int(record[13]),
+                trade_value=int(record[14]),
+                received_at=received_at,
+            ))
+        except (IndexError, ValueError):
+            continue
+    return ticks
+
+
+class KisRealtimeFeed:
+    def __init__(self, url: Optional[str] = None, approval_key_provider: Callable[[], str] = get_approval_key):
+        """
+        Args:
+            url: WebSocket 주소 (기본값 KIS_WS_URL)
+            approval_key_provider: 접속키 발급 함수 (로컬 대체 서버 사용 시 교체)
+        """
+        self.url = url or settings.KIS_WS_URL
+        self.approval_key_provider = approval_key_provider
+
+        self._ticks: Dict[str, Tick] = {}
+        self._codes: set[str] = set()
+        self._lock = threading.Lock()
+        self._app: Optional[websocket.WebSocketApp] = None
+        self._approval_key: Optional[str] = None
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- 구독 관리 ---
+
+    def _request(self, code: str, subscribe: bool) -> str:
+        return json.dumps({
+            "header": {
+                "approval_key": self._approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": TRADE_TR_ID, "tr_key": code}},
+        })
+
+    def _send(self, payload: str):
+        app = self._app
+        if app is not None and self._connected.is_set():
+            try:
+                app.send(payload)
+            except websocket.WebSocketException as e:
+                print(f"실시간 시세 요청 전송 실패: {e}")
+
+    def subscribe(self, codes: Iterable[str]):
+        """종목 체결 구독을 추가합니다. (접속 전이면 접속 후 자동 구독)"""
+        with self._lock:
+            new_codes = [code for code in codes if code not in self._codes]
+            room = settings.KIS_WS_MAX_SUBSCRIPTIONS - len(self._codes)
+            if len(new_codes) > room:
+                print(f"⚠️  실시간 구독 한도({settings.KIS_WS_MAX_SUBSCRIPTIONS}종목) 초과: {len(new_codes) - room}종목 제외")
+                new_codes = new_codes[:max(0, room)]
+            self._codes.update(new_codes)
+        for code in new_codes:
+            self._send(self._request(code, subscribe=True))
+
+    def unsubscribe(self, codes: Iterable[str]):
+        """종목 체결 구독을 해제하고 마지막 체결도 지웁니다."""
+        with self._lock:
+            removed = [code for code in codes if code in self._codes]
+            for code in removed:
+                self._codes.discard(code)
+                self._ticks.pop(code, None)
+        for code in removed:
+            self._send(self._request(code, subscribe=False))
+
+    # --- 마지막 체결 조회 ---
+
+    def last_tick(self, code: str, max_age: Optional[float] = None) -> Optional[Tick]:
+        """
+        종목의 마지막 체결을 반환합니다.
+        max_age(초, 기본값 KIS_WS_TICK_MAX_AGE)보다 오래된 체결은 None
+        """
+        max_age = settings.KIS_WS_TICK_MAX_AGE if max_age is None else max_age
+        with self._lock:
+            tick = self._ticks.get(code)
+        if tick is None or time.time() - tick.received_at > max_age:
+            return None
+        return tick
+
+    def last_ticks(self, codes: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Tick]:
+        """여러 종목의 마지막 체결 {종목코드: Tick} (유효한 체결이 있는 종목만)"""
+        ticks = {}
+        for code in codes:
+            tick = self.last_tick(code, max_age)
+            if tick is not None:
+                ticks[code] = tick
+        return ticks
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- WebSocket 이벤트 ---
+
+    def _on_open(self, app):
+        self._connected.set()
+        with self._lock:
+            codes = sorted(self._codes)
+        print(f"📶 실시간 시세 접속: {self.url} ({len(codes)}종목 구독)")
+        for code in codes:
+            self._send(self._request(code, subscribe=True))
+
+    def _on_message(self, app, message):
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+
+        # 실시간 데이터 (0: 평문, 1: 암호화 - 체결가는 평문으로만 옴)
+        if message[:1] in ("0", "1"):
+            ticks = parse_trade_message(message)
+            if ticks:
+                with self._lock:
+                    for tick in ticks:
+                        if tick.code in self._codes:
+                            self._ticks[tick.code] = tick
+            return
+
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+
+        header = data.get("header", {})
+        if header.get("tr_id") == PINGPONG_TR_ID:
+            # 접속 유지 확인 메시지는 그대로 돌려보냄
+            app.send(message)
+            return
+
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            print(f"실시간 시세 구독 오류 [{header.get('tr_key', '')}]: {body.get('msg1', '')}")
+
+    def _on_error(self, app, error):
+        print(f"실시간 시세 오류: {error}")
+
+    def _on_close(self, app, status_code, message):
+        self._connected.clear()
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._stopped.is_set():
+            try:
+                if self._approval_key is None:
+                    self._approval_key = self.approval_key_provider()
+                self._app = websocket.WebSocketApp(
+                    self.url,
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                    on_error=self._on_error,
+                    on_close=self._on_close,
+                )
+                started = time.monotonic()
+                self._app.run_forever()
+                # 한동안 정상 접속했다가 끊긴 경우 대기 시간을 초기화
+                if time.monotonic() - started > RECONNECT_DELAY_MAX:
+                    delay = RECONNECT_DELAY
+            except Exception as e:
+                print(f"실시간 시세 접속 실패: {e}")
+                # 접속키 문제일 수 있으므로 다음 시도에서 다시 발급
+                self._approval_key = None
+            finally:
+                self._connected.clear()
+
+            if self._stopped.wait(delay):
+                break
+            print("실시간 시세 재접속 시도 중...")
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    def start(self, codes: Iterable[str] = ()):
+        """백그라운드 스레드에서 접속을 시작합니다. (끊기면 자동 재접속)"""
+        self.subscribe(codes)
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="kis-realtime", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """접속 상태와 구독/수신 종목 수"""
+        with self._lock:
+            return {
+                "connected": self._connected.is_set(),
+                "subscriptions": len(self._codes),
+                "ticks": len(self._ticks),
+            }
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def stop(self):
+        """접속을 종료합니다."""
+        self._stopped.set()
+        if self._app is not None:
+            self._app.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+# 전역 실시간 시세 인스턴스 (start를 호출해야 접속)
+realtime_feed = KisRealtimeFeed()
+
+
+if __name__ == "__main__":
+    from src.service.stock_scrapers.get_stock import load_stock_list
+
+    stocks_domestic, _ = load_stock_list()
+    realtime_feed.start(stocks_domestic)
+    print(f"=== 실시간 체결가 수신 ({len(stocks_domestic)}종목, Ctrl+C로 종료) ===")
+    try:
+        while True:
+            time.sleep(5)
+            for code, tick in realtime_feed.last_ticks(stocks_domestic).items():
+                print(f"{code}({stocks_domestic[code]}) {tick.time} {tick.price:,}원 ({tick.change_rate:+.2f}%)")
+    except KeyboardInterrupt:
+        realtime_feed.stop()
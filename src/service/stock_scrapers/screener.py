@@ -0,0 +1,225 @@
+"""
+국내 전 종목 스크리너 (KOSPI·KOSDAQ)
+종목 마스터의 전체 종목을 대상으로 두 단계로 현재가를 조회하고, 조건식을 열 단위 배열 연산으로 적용해
+상위 N개 종목만 관심 종목으로 넘깁니다.
+
+1. 멀티종목 시세 API로 전 종목(약 2,500개)을 30종목씩 조회 (약 85회 요청)
+   → 멀티종목 응답에 있는 항목(현재가, 등락률, 거래량, 거래대금)의 조건과 최소 거래대금으로 1차 선별
+2. 1차 선별을 통과한 종목만 종목별 현재가 API로 상세 항목(PER, PBR, 거래량회전율, 외국인순매수수량 등)을 조회
+   → 나머지 조건 적용 후 정렬 기준으로 상위 N개 선택
+
+요청 속도는 시세 조회와 같은 토큰 버킷(KIS_REQUESTS_PER_SECOND)으로 제한되므로,
+전 종목이 1차 선별을 통과해도 초당 18건 기준 3분 안팎에 끝납니다.
+"""
+import asyncio
+import operator
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.quote_table import NUMERIC_COLUMNS, QuoteTable
+from src.core.records import QUOTE_LABELS, Quote
+
+# 멀티종목 시세 응답에 들어 있는 항목 (이 항목만 쓰는 조건은 1단계에서 적용)
+MULTI_QUOTE_COLUMNS = frozenset({"price", "change_rate", "volume", "trade_value", "prev_close"})
+
+# 스크리닝 대상 종목 그룹 (종목 마스터의 그룹코드, ST: 주권)
+SCREENER_KINDS = frozenset({"ST"})
+
+_OPERATORS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+_CONDITION_PATTERN = re.compile(r"^\s*(.+?)\s*(<=|>=|==|!=|<|>)\s*(-?[0-9][0-9_,]*(?:\.[0-9]+)?)\s*$")
+
+# 조건식에 쓸 수 있는 항목 이름 (속성 이름 또는 한글 라벨, 대소문자·공백 무시)
+_COLUMN_ALIASES = {name.casefold(): name for name in NUMERIC_COLUMNS}
+_COLUMN_ALIASES.update(
+    {label.replace(" ", "").casefold(): attr for attr, label in QUOTE_LABELS if attr in NUMERIC_COLUMNS}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Condition:
+    """조건식 하나 (예: per < 15)"""
+    column: str
+    op: str
+    value: float
+
+    def mask(self, table: QuoteTable) -> np.ndarray:
+        """조건을 만족하는 행의 불리언 마스크 (값이 없는 NaN 행은 항상 False)"""
+        values = table[self.column]
+        # NaN 비교는 !=에서만 True가 되므로 값이 있는 행으로 한 번 더 제한
+        return _OPERATORS[self.op](values, self.value) & ~np.isnan(values)
+
+    def __str__(self) -> str:
+        return f"{self.column}{self.op}{self.value:g}"
+
+
+def column_name(name: str) -> str:
+    """조건식·정렬 기준의 항목 이름을 Quote 속성 이름으로 바꿉니다."""
+    column = _COLUMN_ALIASES.get(name.replace(" ", "").casefold())
+    if column is None:
+        raise ValueError(f"알 수 없는 항목: {name} (사용 가능: {', '.join(NUMERIC_COLUMNS)})")
+    return column
+
+
+def parse_conditions(expression: str) -> List[Condition]:
+    """
+    조건식 문자열을 파싱합니다. 조건은 ;로 구분하고 모두 만족해야 통과합니다.
+
+    예: "per>0;per<15;pbr<1.5;등락률>0;거래량회전율>=1;외국인순매수수량>0"
+    """
+    conditions = []
+    for part in expression.split(";"):
+        if not part.strip():
+            continue
+        match = _CONDITION_PATTERN.match(part)
+        if match is None:
+            raise ValueError(f"조건식 형식이 올바르지 않습니다: {part.strip()} (예: per<15)")
+        name, op, value = match.groups()
+        conditions.append(Condition(column_name(name), op, float(value.replace(",", "").replace("_", ""))))
+    return conditions
+
+
+def apply_conditions(table: QuoteTable, conditions: List[Condition]) -> QuoteTable:
+    """모든 조건을 만족하는 행만 남긴 표 (조건마다 배열 연산 한 번)"""
+    mask = np.ones(len(table), dtype=bool)
+    for condition in conditions:
+        mask &= condition.mask(table)
+    return table.take(mask)
+
+
+def exclude_flagged(table: QuoteTable) -> QuoteTable:
+    """관리종목·정리매매·투자유의 종목과 시장경고(투자주의/경고/위험) 종목을 제외합니다."""
+    mask = (
+        (table["managed"] != "Y")
+        & (table["liquidation"] != "Y")
+        & (table["caution"] != "Y")
+        & np.isin(table["warning_code"], [None, "00"])
+    )
+    return table.take(mask)
+
+
+@dataclass(slots=True)
+class ScreenerResult:
+    """스크리닝 결과 (candidates는 정렬 기준 순서)"""
+    candidates: List[Quote]
+    names: Dict[str, str]  # {종목코드: 종목명}
+    universe: int = 0
+    quoted: int = 0
+    detailed: int = 0
+    passed: int = 0
+    elapsed: float = 0.0
+
+
+def universe_codes() -> Dict[str, str]:
+    """종목 마스터의 국내 스크리닝 대상 종목 {종목코드: 종목명} (블로킹 - 비동기 코드에서는 스레드에서 호출)"""
+    from .symbol_master import symbol_master
+
+    if not symbol_master.ensure_loaded():
+        raise RuntimeError("종목 마스터를 사용할 수 없어 전 종목 스크리닝을 할 수 없습니다.")
+    return {
+        symbol.code: symbol.name
+        for symbol in symbol_master.symbols(market="domestic")
+        if symbol.kind in SCREENER_KINDS
+    }
+
+
+async def _fetch_details(codes: List[str]) -> Dict[str, Quote]:
+    """종목별 현재가 API로 상세 항목을 조회합니다. (토큰 버킷이 속도를 맞추므로 한꺼번에 예약)"""
+    from .api_scraper import KIS_PRICE_TR_ID, aget_domestic_stock_price, get_headers
+
+    headers = await asyncio.to_thread(get_headers, KIS_PRICE_TR_ID)
+    done = 0
+
+    async def fetch(code: str) -> Optional[Quote]:
+        nonlocal done
+        try:
+            return await aget_domestic_stock_price(code, headers)
+        finally:
+            done += 1
+            if done % 200 == 0:
+                print(f"  상세 시세 조회 중: {done}/{len(codes)}개")
+
+    results = await asyncio.gather(*(fetch(code) for code in codes), return_exceptions=True)
+    return {code: result for code, result in zip(codes, results) if isinstance(result, Quote)}
+
+
+async def run_screener(
+    expression: Optional[str] = None,
+    top_n: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    ascending: Optional[bool] = None,
+) -> ScreenerResult:
+    """
+    국내 전 종목을 스크리닝해 상위 top_n개 종목을 반환합니다. (인자를 생략하면 SCREENER_* 설정값 사용)
+
+    Args:
+        expression: 조건식 (parse_conditions 참고)
+        top_n: 남길 종목 수
+        sort_by: 정렬 기준 항목 (속성 이름 또는 한글 라벨)
+        ascending: True이면 오름차순 (PER 낮은 순 등)
+    """
+    from .api_scraper import aget_domestic_stock_prices
+    from .quote_cache import quote_cache
+
+    conditions = parse_conditions(settings.SCREENER_FILTERS if expression is None else expression)
+    top_n = settings.SCREENER_TOP_N if top_n is None else top_n
+    sort_column = column_name(settings.SCREENER_SORT_BY if sort_by is None else sort_by)
+    ascending = settings.SCREENER_SORT_ASCENDING if ascending is None else ascending
+
+    started = time.perf_counter()
+    names = await asyncio.to_thread(universe_codes)
+    print(f"🔎 전 종목 스크리닝: {len(names):,}개 종목, 조건 {[str(c) for c in conditions] or '없음'}")
+
+    # 1단계: 멀티종목 시세로 전 종목 현재가 → 멀티종목 항목 조건과 최소 거래대금으로 1차 선별
+    table = QuoteTable.from_quotes((await aget_domestic_stock_prices(list(names))).values())
+    quoted = len(table)
+    prefilter = [c for c in conditions if c.column in MULTI_QUOTE_COLUMNS]
+    if settings.SCREENER_MIN_TRADE_VALUE > 0:
+        prefilter.append(Condition("trade_value", ">=", settings.SCREENER_MIN_TRADE_VALUE))
+    table = apply_conditions(table, prefilter)
+    print(f"  1차 선별: {len(table):,}/{quoted:,}개 ({time.perf_counter() - started:.1f}초)")
+
+    # 2단계: 남은 종목만 상세 조회 → 나머지 조건 적용
+    details = await _fetch_details(list(table.codes))
+    if settings.QUOTE_CACHE_ENABLED:
+        quote_cache.set_many(details.values())
+    table = QuoteTable.from_quotes(details.values())
+    detailed = len(table)
+    table = apply_conditions(table, [c for c in conditions if c.column not in MULTI_QUOTE_COLUMNS])
+    if settings.SCREENER_EXCLUDE_FLAGGED:
+        table = exclude_flagged(table)
+    passed = len(table)
+
+    candidates = table.top(sort_column, top_n, descending=not ascending).to_quotes()
+    elapsed = time.perf_counter() - started
+    print(f"  조건 통과: {passed:,}/{detailed:,}개 → 상위 {len(candidates)}개 선택 "
+          f"({sort_column} {'오름차순' if ascending else '내림차순'}, {elapsed:.1f}초)")
+
+    return ScreenerResult(
+        candidates=candidates,
+        names={quote.code: names.get(quote.code, quote.code) for quote in candidates},
+        universe=len(names),
+        quoted=quoted,
+        detailed=detailed,
+        passed=passed,
+        elapsed=elapsed,
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = asyncio.run(run_screener(sys.argv[1] if len(sys.argv) > 1 else None))
+    for quote in result.candidates:
+        print(f"{quote.code}({result.names[quote.code]}): {quote.to_fields()}")
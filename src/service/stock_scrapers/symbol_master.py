@@ -0,0 +1,315 @@
+"""
+종목 마스터 (종목코드·종목명·시장 인덱스)
+한국투자증권이 공개하는 종목 마스터 파일(KOSPI/KOSDAQ .mst, 미국 거래소 .cod)을 내려받아
+data/symbol_master.tsv 한 파일로 정리해 두고, 하루에 한 번 갱신합니다.
+종목명 → 종목코드 해석, 국내/해외 시장 판별, 접두어 검색에 사용합니다.
+"""
+import bisect
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core.config import settings
+from src.service import http_client
+
+KIS_MASTER_URL = "https://new.real.download.dws.co.kr/common/master"
+
+# 국내 마스터 파일 (파일명, 뒷부분 고정폭 영역 길이 - 줄바꿈 포함)
+DOMESTIC_MASTERS = {
+    "KOSPI": ("kospi_code.mst", 228),
+    "KOSDAQ": ("kosdaq_code.mst", 222),
+}
+# 해외 마스터 파일 (거래소 → 파일 접두어)
+OVERSEAS_MASTERS = {
+    "NASDAQ": "nas",
+    "NYSE": "nys",
+    "AMEX": "ams",
+}
+# 해외 마스터의 증권 종류 중 사용할 것 (2: 주식, 3: ETF 등 ETP)
+OVERSEAS_SECURITY_TYPES = {"2", "3"}
+
+TSV_COLUMNS = ("code", "name", "english_name", "market", "exchange", "kind", "sector")
+
+# 국내 종목코드 형태 (6자리, 첫 글자는 숫자 - 영문이 섞인 ETF/ETN 코드 포함, Q로 시작하는 ETN 코드)
+DOMESTIC_CODE_PATTERN = re.compile(r"[0-9][0-9A-Z]{5}|Q[0-9]{6}")
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolInfo:
+    """종목 1개의 마스터 정보"""
+    code: str  # 국내: 단축코드, 해외: Yahoo Finance 심볼 (예: BRK-B)
+    name: str  # 한글 종목명 (해외 종목에 한글명이 없으면 영문명)
+    english_name: str
+    market: str  # "domestic" 또는 "worldwide"
+    exchange: str  # KOSPI, KOSDAQ, NASDAQ, NYSE, AMEX
+    kind: str  # 국내: 그룹코드(ST 주식, EF ETF, EN ETN 등), 해외: 증권 종류(2 주식, 3 ETP)
+    sector: str  # 업종 분류 코드 (국내: 지수업종대분류, 해외: 업종분류코드)
+
+
+def normalize_code(code: str) -> str:
+    """대소문자와 클래스 주식 구분자(., /, -) 차이를 없앤 조회용 코드"""
+    return re.sub(r"[./\-\s]", "", code.upper())
+
+
+def normalize_name(name: str) -> str:
+    """대소문자와 공백 차이를 없앤 조회용 종목명"""
+    return re.sub(r"\s+", "", name).casefold()
+
+
+def looks_domestic(code: str) -> bool:
+    """마스터 없이 코드 형태만으로 국내 종목인지 추정합니다."""
+    return bool(DOMESTIC_CODE_PATTERN.fullmatch(code.strip().upper()))
+
+
+def yahoo_symbol(symbol: str) -> str:
+    """클래스 주식 구분자를 Yahoo Finance 형식으로 바꿉니다. (BRK.B, BRK/B → BRK-B)"""
+    return re.sub(r"[./]", "-", symbol.strip().upper())
+
+
+def _unzip(content: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        return archive.read(archive.namelist()[0]).decode("cp949", errors="replace")
+
+
+def parse_domestic_master(text: str, exchange: str, tail_length: int) -> List[SymbolInfo]:
+    """
+    국내 마스터(.mst) 파싱
+    각 줄은 앞부분(단축코드 9자리, 표준코드 12자리, 한글명)과 뒷부분 고정폭 영역(그룹코드 2자리, 시가총액규모 1자리,
+    지수업종대분류 4자리, ...)으로 나뉩니다.
+    """
+    symbols = []
+    for row in io.StringIO(text):
+        if not row.endswith("\n"):
+            row += "\n"
+        if len(row) <= tail_length + 21:
+            continue
+        head, tail = row[:len(row) - tail_length], row[-tail_length:]
+        code = head[0:9].rstrip()
+        name = head[21:].strip()
+        if not code or not name:
+            continue
+        symbols.append(SymbolInfo(
+            code=code,
+            name=name,
+            english_name="",
+            market="domestic",
+            exchange=exchange,
+            kind=tail[0:2].strip(),
+            sector=tail[3:7].strip(),
+        ))
+    return symbols
+
+
+def parse_overseas_master(text: str, exchange: str) -> List[SymbolInfo]:
+    """
+    해외 마스터(.cod, 탭 구분) 파싱
+    열 순서: 국가코드, 거래소ID, 거래소코드, 거래소명, 심볼, 실시간심볼, 한글명, 영문명, 증권종류, 통화, ..., 업종분류코드(20번째)
+    """
+    symbols = []
+    for line in text.splitlines():
+        columns = line.split("\t")
+        if len(columns) < 9 or columns[8].strip() not in OVERSEAS_SECURITY_TYPES:
+            continue
+        symbol = columns[4].strip()
+        if not symbol:
+            continue
+        korean_name, english_name = columns[6].strip(), columns[7].strip()
+        symbols.append(SymbolInfo(
+            code=yahoo_symbol(symbol),
+            name=korean_name or english_name,
+            english_name=english_name,
+            market="worldwide",
+            exchange=exchange,
+            kind=columns[8].strip(),
+            sector=columns[19].strip() if len(columns) > 19 else "",
+        ))
+    return symbols
+
+
+def download_master() -> List[SymbolInfo]:
+    """한국투자증권 종목 마스터 파일을 모두 내려받아 파싱합니다. (하나라도 실패하면 예외)"""
+    symbols = []
+    for exchange, (file_name, tail_length) in DOMESTIC_MASTERS.items():
+        response = http_client.request("GET", f"{KIS_MASTER_URL}/{file_name}.zip")
+        response.raise_for_status()
+        symbols.extend(parse_domestic_master(_unzip(response.content), exchange, tail_length))
+    for exchange, prefix in OVERSEAS_MASTERS.items():
+        response = http_client.request("GET", f"{KIS_MASTER_URL}/{prefix}mst.cod.zip")
+        response.raise_for_status()
+        symbols.extend(parse_overseas_master(_unzip(response.content), exchange))
+    return symbols
+
+
+class SymbolMaster:
+    def __init__(self, path: str, max_age: float = 86400):
+        """
+        Args:
+            path: 인덱스 파일(TSV) 경로
+            max_age: 인덱스 파일을 다시 내려받기까지의 시간 (초)
+        """
+        self.path = Path(path)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded_mtime: Optional[float] = None
+        self._by_code: Dict[str, SymbolInfo] = {}
+        self._by_name: Dict[str, SymbolInfo] = {}
+        # 접두어 검색용 (정렬된 조회 키, 같은 순서의 종목)
+        self._keys: List[str] = []
+        self._key_symbols: List[SymbolInfo] = []
+
+    # --- 파일 ---
+
+    def _is_stale(self) -> bool:
+        try:
+            return time.time() - self.path.stat().st_mtime > self.max_age
+        except FileNotFoundError:
+            return True
+
+    def _write(self, symbols: List[SymbolInfo]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\t".join(TSV_COLUMNS) + "\n")
+            for symbol in symbols:
+                f.write("\t".join(getattr(symbol, column).replace("\t", " ") for column in TSV_COLUMNS) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> List[SymbolInfo]:
+        with open(self.path, encoding="utf-8") as f:
+            next(f, None)  # 헤더
+            return [SymbolInfo(*line.rstrip("\n").split("\t")) for line in f if line.strip()]
+
+    def refresh(self) -> int:
+        """종목 마스터를 내려받아 인덱스 파일을 새로 만듭니다. 저장한 종목 수를 반환합니다."""
+        symbols = download_master()
+        if not symbols:
+            raise ValueError("종목 마스터가 비어 있습니다.")
+        self._write(symbols)
+        print(f"📇 종목 마스터 갱신: {len(symbols):,}개 종목")
+        return len(symbols)
+
+    def _index(self, symbols: List[SymbolInfo]):
+        by_code, by_name = {}, {}
+        # 국내 종목을 먼저 등록해 종목명이 겹치면 국내 종목이 우선
+        for symbol in sorted(symbols, key=lambda s: s.market != "domestic"):
+            by_code.setdefault(normalize_code(symbol.code), symbol)
+            for name in (symbol.name, symbol.english_name):
+                if name:
+                    by_name.setdefault(normalize_name(name), symbol)
+
+        entries = sorted(
+            [(key, symbol) for key, symbol in by_name.items()]
+            + [(key.casefold(), symbol) for key, symbol in by_code.items()],
+            key=lambda entry: entry[0],
+        )
+        self._by_code, self._by_name = by_code, by_name
+        self._keys = [key for key, _ in entries]
+        self._key_symbols = [symbol for _, symbol in entries]
+
+    def ensure_loaded(self) -> bool:
+        """
+        인덱스를 메모리에 올립니다. 파일이 없거나 max_age보다 오래됐으면 먼저 내려받습니다.
+        내려받기에 실패해도 기존 파일이 있으면 그것을 사용합니다. (블로킹 - 비동기 코드에서는 스레드에서 호출)
+
+        Returns:
+            인덱스 사용 가능 여부
+        """
+        if not settings.SYMBOL_MASTER_ENABLED:
+            return False
+        with self._lock:
+            if self._is_stale():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"종목 마스터 다운로드 실패: {e}")
+
+            try:
+                mtime = self.path.stat().st_mtime
+            except FileNotFoundError:
+                return False
+            if mtime != self._loaded_mtime:
+                try:
+                    self._index(self._read())
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"종목 마스터 읽기 실패: {e}")
+                    return bool(self._by_code)
+                self._loaded_mtime = mtime
+            return True
+
+    # --- 조회 (인덱스가 메모리에 없으면 None/빈 결과) ---
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._by_code)
+
+    def get(self, code: str) -> Optional[SymbolInfo]:
+        """종목코드로 조회 (BRK.B, brk-b처럼 표기가 달라도 같은 종목)"""
+        return self._by_code.get(normalize_code(code))
+
+    def find_by_name(self, name: str) -> Optional[SymbolInfo]:
+        """종목명(한글명 또는 영문명)으로 조회 (대소문자·공백 무시)"""
+        return self._by_name.get(normalize_name(name))
+
+    def resolve(self, item: str, market: Optional[str] = None) -> Optional[SymbolInfo]:
+        """
+        종목코드 또는 종목명을 종목으로 해석합니다.
+        market("domestic"/"worldwide")을 지정하면 해당 시장의 종목만 반환합니다.
+        """
+        for symbol in (self.get(item), self.find_by_name(item)):
+            if symbol and (market is None or symbol.market == market):
+                return symbol
+        return None
+
+    def symbols(self, market: Optional[str] = None) -> List[SymbolInfo]:
+        """전체 종목 목록 (market을 지정하면 해당 시장 종목만)"""
+        return [symbol for symbol in self._by_code.values() if market is None or symbol.market == market]
+
+    def search(self, prefix: str, limit: int = 10, market: Optional[str] = None) -> List[SymbolInfo]:
+        """종목명 또는 종목코드 접두어로 검색합니다. (정렬된 키에서 이진 탐색)"""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        results, seen = [], set()
+        for i in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            if not self._keys[i].startswith(key) or len(results) >= limit:
+                break
+            symbol = self._key_symbols[i]
+            if (market is None or symbol.market == market) and symbol.code not in seen:
+                seen.add(symbol.code)
+                results.append(symbol)
+        return results
+
+
+# 전역 종목 마스터 인스턴스 (ensure_loaded를 호출해야 메모리에 올라감)
+symbol_master = SymbolMaster(settings.SYMBOL_MASTER_PATH, settings.SYMBOL_MASTER_MAX_AGE)
+
+
+def market_of(stock_code: str) -> str:
+    """
+    종목코드의 시장("domestic"/"worldwide")을 판별합니다.
+    종목 마스터가 메모리에 있으면 마스터 기준, 없으면 코드 형태로 추정합니다.
+    (관심 종목을 읽는 load_stock_list에서 마스터를 올려 두므로 그래프 실행 중에는 마스터 기준으로 판별)
+    """
+    symbol = symbol_master.get(stock_code) if symbol_master.loaded else None
+    if symbol is not None:
+        return symbol.market
+    return "domestic" if looks_domestic(stock_code) else "worldwide"
+
+
+if __name__ == "__main__":
+    import sys
+
+    symbol_master.ensure_loaded()
+    for query in sys.argv[1:] or ["삼성", "AAPL", "BRK.B"]:
+        print(f"\n=== {query} ===")
+        resolved = symbol_master.resolve(query)
+        if resolved:
+            print(f"→ {resolved.code}({resolved.name}) [{resolved.exchange}]")
+        for symbol in symbol_master.search(query, limit=5):
+            print(f"  {symbol.code}\t{symbol.name}\t{symbol.exchange}")